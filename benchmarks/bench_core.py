@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the scheduling hot paths
+
+Run:    python -m pytest benchmarks --benchmark-json=benchmarks/current.json
+Gate:   python benchmarks/compare.py benchmarks/baseline.json benchmarks/current.json
+"""
+
+import io
+import contextlib
+import tempfile
+
+import numpy as np
+
+from models.task import Task
+from models.device import Device
+from models.server import Server, ServerTier
+from scheduling.list_scheduler import ListScheduler
+from experiments.scenario_runner import ScenarioRunner
+
+
+def make_system():
+    device = Device(battery_capacity=1000)
+    servers = [
+        Server("EdgeServer1", compute_speed=3.0, network_delay=1, tier=ServerTier.EDGE),
+        Server("EdgeServer2", compute_speed=4.0, network_delay=1, tier=ServerTier.EDGE),
+        Server("CloudServer", compute_speed=10.0, network_delay=5, tier=ServerTier.CLOUD)
+    ]
+    return device, servers
+
+
+RUNNER = ScenarioRunner(tempfile.gettempdir())
+
+
+def make_tasks(num_tasks, seed=0):
+    return RUNNER.create_workload("mixed", num_tasks, rng=np.random.RandomState(seed))
+
+
+def rounds_for(num_tasks):
+    """Fewer rounds for big inputs so the suite finishes in reasonable time"""
+    return max(1, min(20, 10 ** 5 // num_tasks))
+
+
+def test_schedule_tasks(benchmark, num_tasks):
+    benchmark.extra_info['tasks'] = num_tasks
+    tasks = make_tasks(num_tasks)
+
+    def setup():
+        device, servers = make_system()
+        return (ListScheduler(device, servers), tasks), {}
+
+    benchmark.pedantic(lambda scheduler, work: scheduler.schedule_tasks(work),
+                       setup=setup, rounds=rounds_for(num_tasks))
+
+
+def test_estimate_finish_time(benchmark, num_tasks):
+    # Throughput per call should not depend on how much is already queued
+    benchmark.extra_info['tasks'] = 1
+    server = Server("EdgeServer1", compute_speed=3.0, network_delay=1)
+    for task in make_tasks(num_tasks):
+        server.add_to_queue(task)
+    probe = Task(-1, size=40, data_size=10)
+
+    benchmark(server.estimate_finish_time, probe)
+
+
+def test_process_tasks(benchmark, num_tasks):
+    benchmark.extra_info['tasks'] = num_tasks
+    tasks = make_tasks(num_tasks)
+
+    def setup():
+        server = Server("EdgeServer1", compute_speed=3.0, network_delay=1)
+        for task in tasks:
+            server.add_to_queue(task)
+        return (server,), {}
+
+    benchmark.pedantic(lambda server: server.process_tasks(), setup=setup, rounds=rounds_for(num_tasks))
+
+
+def test_event_engine(benchmark, num_tasks):
+    benchmark.extra_info['tasks'] = num_tasks
+    tasks = make_tasks(num_tasks)
+
+    def setup():
+        device, servers = make_system()
+        scheduler = ListScheduler(device, servers)
+        scheduler.schedule_tasks(tasks)
+        return (scheduler,), {}
+
+    benchmark.pedantic(lambda scheduler: scheduler.process_all_queues(),
+                       setup=setup, rounds=rounds_for(num_tasks))
+
+
+def test_create_workload(benchmark, num_tasks):
+    benchmark.extra_info['tasks'] = num_tasks
+    benchmark.pedantic(RUNNER.create_workload, args=("mixed", num_tasks),
+                       kwargs={'rng': np.random.RandomState(0)}, rounds=rounds_for(num_tasks))
+
+
+def test_run_all_scenarios(benchmark, num_tasks):
+    benchmark.extra_info['tasks'] = num_tasks * 6
+
+    def run():
+        with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+            ScenarioRunner(output_dir).run_all_scenarios(base_seed=0, num_tasks=num_tasks)
+
+    benchmark.pedantic(run, rounds=max(1, rounds_for(num_tasks * 6) // 4))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Compare two pytest-benchmark JSON files and fail on throughput regressions
+
+Usage: python benchmarks/compare.py BASELINE.json CURRENT.json [--threshold PERCENT]
+Exits with status 1 if any benchmark's throughput (tasks per second) dropped
+by more than the threshold relative to the baseline.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_throughput(path):
+    """Map benchmark name -> tasks per second"""
+    with open(path) as f:
+        data = json.load(f)
+
+    throughput = {}
+    for bench in data['benchmarks']:
+        tasks = bench.get('extra_info', {}).get('tasks', 1)
+        # Median is far less sensitive to scheduler noise than the mean
+        throughput[bench['fullname']] = tasks / bench['stats']['median']
+    return throughput
+
+
+def compare(baseline, current, threshold):
+    """Return (report lines, regressed benchmark names)"""
+    lines = []
+    regressions = []
+    for name in sorted(baseline):
+        if name not in current:
+            lines.append(f"  MISSING   {name}")
+            continue
+
+        change = (current[name] - baseline[name]) / baseline[name] * 100
+        status = "OK"
+        if change < -threshold:
+            status = "REGRESSED"
+            regressions.append(name)
+        lines.append(f"  {status:<9} {name}: {baseline[name]:,.0f} -> {current[name]:,.0f} tasks/s ({change:+.1f}%)")
+
+    for name in sorted(set(current) - set(baseline)):
+        lines.append(f"  NEW       {name}: {current[name]:,.0f} tasks/s")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when benchmark throughput regresses")
+    parser.add_argument("baseline", help="Baseline pytest-benchmark JSON")
+    parser.add_argument("current", help="Current pytest-benchmark JSON")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Allowed throughput drop in percent (default: 10)")
+    args = parser.parse_args(argv)
+
+    lines, regressions = compare(load_throughput(args.baseline), load_throughput(args.current), args.threshold)
+    print("\n".join(lines))
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold}%")
+        return 1
+    print("\nNo throughput regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
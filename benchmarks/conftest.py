@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# Add the src directory to Python path
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+pytest.importorskip("pytest_benchmark")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-large", action="store_true",
+                     help="Also run the 10^6-task sizes (slow)")
+
+
+def pytest_generate_tests(metafunc):
+    if "num_tasks" in metafunc.fixturenames:
+        sizes = [10 ** 2, 10 ** 4]
+        if metafunc.config.getoption("--bench-large"):
+            sizes.append(10 ** 6)
+        metafunc.parametrize("num_tasks", sizes)
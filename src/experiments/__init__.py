@@ -5,8 +5,10 @@ Contains scenario runner and visualization tools
 
 from .scenario_runner import ScenarioRunner
 from .results_plotter import ResultsPlotter
+from .parameter_sweep import ParameterSweep
+from .threshold_tuner import ThresholdTuner
 
-__all__ = ['ScenarioRunner', 'ResultsPlotter']
+__all__ = ['ScenarioRunner', 'ResultsPlotter', 'ParameterSweep', 'ThresholdTuner']
 
 def __init__(self, output_dir="data/output", input_dir="data/input"):
     self.output_dir = output_dir
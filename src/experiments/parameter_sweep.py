@@ -0,0 +1,213 @@
+import itertools
+import json
+import math
+import os
+import zlib
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any
+from experiments.scenario_runner import ScenarioRunner
+from experiments.result_cache import code_version
+
+# Default levels for every sweepable scenario parameter
+PARAMETER_SPACE = {
+    'battery': ['high', 'low'],
+    'wireless_speed': ['fast', 'slow'],
+    'workload': ['mixed', 'many_small', 'many_large'],
+    'num_tasks': [20],
+    'num_servers': [3],
+    'strategy': ['intelligent', 'static']
+}
+
+# Metrics summarized across replications
+SWEEP_METRICS = ['makespan', 'total_energy_consumed', 'percentage_offloaded', 'battery_remaining']
+
+# Two-sided 95% Student t critical values by degrees of freedom (normal beyond 30)
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 21: 2.080, 22: 2.074,
+    23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042
+}
+
+
+def point_key(point: Dict[str, Any]) -> str:
+    """Stable string identifying a design point"""
+    return json.dumps(point, sort_keys=True)
+
+
+def point_seed(base_seed: int, point: Dict[str, Any], replication: int) -> int:
+    """Deterministic workload seed for one replication of a design point"""
+    key_hash = zlib.crc32(point_key(point).encode())
+    return int(np.random.SeedSequence([base_seed, key_hash, replication]).generate_state(1)[0])
+
+
+def record_key(record: Dict[str, Any]) -> tuple:
+    """
+    Identity of a finished run: design point, replication, workload seed and code version
+    A run logged under another base seed or older code no longer counts as done
+    """
+    return point_key(record['point']), record['replication'], record['seed'], record.get('code')
+
+
+def confidence_interval(values) -> tuple:
+    """Return (mean, 95% CI half-width) of a sample"""
+    values = np.asarray(values, dtype=float)
+    mean = float(values.mean())
+    if len(values) < 2:
+        return mean, 0.0
+    t_value = T_CRITICAL_95.get(len(values) - 1, 1.96)
+    return mean, float(t_value * values.std(ddof=1) / math.sqrt(len(values)))
+
+
+def _run_sweep_job(job):
+    """Worker entry point: run one replication of one design point"""
+    output_dir, point, seed, replication, code = job
+    config = dict(point)
+    config['name'] = ", ".join(f"{k}={v}" for k, v in sorted(point.items()))
+
+    runner = ScenarioRunner(output_dir)
+    result = runner.run_scenario(0, config, seed=seed, replication=replication, save_files=False)
+
+    record = {
+        'point': point,
+        'replication': replication,
+        'seed': seed,
+        'code': code,
+        'makespan': result['makespan'],
+        'total_energy_consumed': result['total_energy_consumed'],
+        'percentage_offloaded': result['offload_stats']['percentage_offloaded'],
+        'battery_remaining': result['battery_remaining']
+    }
+    return record
+
+
+class ParameterSweep:
+    """
+    Design-of-experiments engine over scenario parameters
+    Runs K seeded replications per design point, fans them out across worker
+    processes and keeps a JSONL log of finished runs so reruns skip them
+    """
+
+    def __init__(self, space: Dict[str, list] = None, replications: int = 5, base_seed: int = 0,
+                 output_dir: str = "data/output/sweep", jobs: int = 1):
+        self.space = dict(PARAMETER_SPACE)
+        if space:
+            self.space.update(space)
+        self.replications = replications
+        self.base_seed = base_seed
+        self.output_dir = output_dir
+        self.jobs = jobs
+        self.runs_file = os.path.join(output_dir, "sweep_runs.jsonl")
+        self.summary_file = os.path.join(output_dir, "sweep_summary.json")
+        os.makedirs(output_dir, exist_ok=True)
+
+    def grid_points(self) -> List[Dict[str, Any]]:
+        """Full cartesian product of all parameter levels"""
+        names = list(self.space)
+        return [dict(zip(names, levels)) for levels in itertools.product(*self.space.values())]
+
+    def latin_hypercube_points(self, samples: int, seed: int = None) -> List[Dict[str, Any]]:
+        """
+        Latin-hypercube sample of the (discrete) parameter space
+        Each parameter's levels are covered in proportion across the samples;
+        duplicate points are dropped
+        """
+        rng = np.random.default_rng(self.base_seed if seed is None else seed)
+        columns = {}
+        for name, levels in self.space.items():
+            strata = (rng.permutation(samples) + rng.random(samples)) / samples
+            columns[name] = (strata * len(levels)).astype(int)
+
+        points = {}
+        for i in range(samples):
+            point = {name: self.space[name][columns[name][i]] for name in self.space}
+            points.setdefault(point_key(point), point)
+        return list(points.values())
+
+    def load_completed(self) -> Dict[tuple, Dict[str, Any]]:
+        """Load already finished runs keyed by record_key"""
+        completed = {}
+        if os.path.exists(self.runs_file):
+            with open(self.runs_file) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        completed[record_key(record)] = record
+        return completed
+
+    def run_key(self, point: Dict[str, Any], replication: int) -> tuple:
+        """record_key of the run this sweep would do for one replication of a point"""
+        return point_key(point), replication, point_seed(self.base_seed, point, replication), code_version()
+
+    def run(self, points: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Run every replication not already on disk and summarize each point
+        Defaults to the full grid
+        """
+        points = self.grid_points() if points is None else points
+        completed = self.load_completed()
+
+        pending = []
+        for point in points:
+            for replication in range(self.replications):
+                key = self.run_key(point, replication)
+                if key not in completed:
+                    seed, code = key[2:]
+                    pending.append((self.output_dir, point, seed, replication, code))
+        print(f"Sweep: {len(points)} points x {self.replications} replications, "
+              f"{len(pending)} runs pending")
+
+        with open(self.runs_file, 'a') as log:
+            if self.jobs > 1:
+                with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                    chunksize = max(1, len(pending) // (self.jobs * 4))
+                    for record in executor.map(_run_sweep_job, pending, chunksize=chunksize):
+                        self._record(log, completed, record)
+            else:
+                for job in pending:
+                    self._record(log, completed, _run_sweep_job(job))
+
+        summary = self.summarize(points, completed)
+        with open(self.summary_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Sweep summary saved to: {self.summary_file}")
+        return summary
+
+    def _record(self, log, completed, record):
+        """Append a finished run to the log as soon as it arrives"""
+        log.write(json.dumps(record) + "\n")
+        log.flush()
+        completed[record_key(record)] = record
+
+    def summarize(self, points, completed) -> List[Dict[str, Any]]:
+        """Mean and 95% confidence interval of every metric at every point"""
+        summary = []
+        for point in points:
+            keys = [self.run_key(point, r) for r in range(self.replications)]
+            records = [completed[key] for key in keys if key in completed]
+            entry = {'point': point, 'replications': len(records)}
+            for metric in SWEEP_METRICS:
+                mean, half_width = confidence_interval([r[metric] for r in records])
+                entry[metric] = {'mean': mean, 'ci95': half_width}
+            summary.append(entry)
+        return summary
+
+
+# For standalone execution
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep scenario parameters with seeded replications")
+    parser.add_argument("--replications", type=int, default=5, help="Seeded replications per point")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed")
+    parser.add_argument("--lhs", type=int, default=None, help="Latin-hypercube sample size (default: full grid)")
+    parser.add_argument("--output-dir", default="data/output/sweep", help="Where runs and summary are written")
+    args = parser.parse_args()
+
+    sweep = ParameterSweep(replications=args.replications, base_seed=args.seed,
+                           output_dir=args.output_dir, jobs=args.jobs)
+    points = sweep.latin_hypercube_points(args.lhs) if args.lhs else sweep.grid_points()
+    sweep.run(points)
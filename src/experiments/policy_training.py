@@ -0,0 +1,285 @@
+import os
+
+import numpy as np
+
+from models.server import ServerTier
+from experiments.workload_generator import WORKLOAD_CLASSES
+from experiments.threshold_tuner import work_conserving_makespan
+from scheduling.learned_strategy import PolicyNetwork, offload_features, DEFAULT_POLICY
+
+
+class OffloadEnv:
+    """
+    Vectorized gym-style environment: num_envs copies of a scenario stepped in lockstep
+
+    An episode places one workload task by task, every task released at time 0
+    as in the scenarios. The state is the queue loads, planned uploads and
+    battery the scheduler sees while planning; the only reward is the terminal
+    one, minus the makespan the event engine measures for the final placement
+    (plus energy_weight times the device energy). That makespan is exact for
+    single-core resources, both with a shared access link and with ideal uploads.
+    """
+
+    def __init__(self, device, servers, wireless_speed, workload="mixed", num_tasks=20, num_envs=256,
+                 shared_network=True, energy_weight=0.0, wired_speed=1000, rng=None):
+        resources = [device] + list(servers)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.classes = WORKLOAD_CLASSES.get(workload, WORKLOAD_CLASSES['mixed'])
+        self.num_tasks = num_tasks
+        self.num_envs = num_envs
+        self.shared_network = shared_network
+        self.energy_weight = energy_weight
+        self.wireless_speed = wireless_speed
+        self.wired_speed = wired_speed
+
+        self.speed = np.array([r.compute_speed for r in resources], dtype=float)
+        self.drain = self.speed * np.array([r.num_cores for r in resources])
+        self.delay = np.array([r.network_delay for r in resources], dtype=float)
+        self.remote = np.array([r.tier is not ServerTier.LOCAL for r in resources])
+        self.remote[0] = False
+        self.cloud = np.array([r.tier is ServerTier.CLOUD for r in resources])
+        self.cloud[0] = False
+        # Contention-free upload time per MB for each resource
+        self.link_time = self.remote / wireless_speed + self.cloud / wired_speed
+
+        self.battery_start = float(device.remaining_battery)
+        self.battery_capacity = float(device.battery_capacity)
+        self.base_energy = device.BASE_ENERGY_COST
+        self.unit_energy = device.COMPUTE_ENERGY_COST
+
+    def sample_workloads(self, count):
+        """(size, data size) arrays of shape (count, num_tasks), drawn like ScenarioRunner.create_workload"""
+        size = np.empty((count, self.num_tasks))
+        data_size = np.empty((count, self.num_tasks))
+        for index, ((size_low, size_high), (data_low, data_high)) in enumerate(self.classes):
+            columns = slice(index, None, len(self.classes))
+            shape = size[:, columns].shape
+            size[:, columns] = self.rng.integers(size_low, size_high, shape)
+            data_size[:, columns] = self.rng.integers(data_low, data_high, shape)
+        return size, data_size
+
+    def reset(self, size=None, data_size=None):
+        """Start num_envs episodes (on the given workloads, or fresh ones) and return the first observation"""
+        if size is None:
+            size, data_size = self.sample_workloads(self.num_envs)
+        self.size, self.data_size = size, data_size
+        envs = (len(size), len(self.speed))
+        self.load = np.zeros(envs)  # Queue delay of every resource
+        self.battery = np.full(len(size), self.battery_start)
+        self.energy = np.zeros(len(size))
+        self.access_reserved = np.zeros(size.shape)  # Data of planned uploads per task (0 if local)
+        self.backhaul_reserved = np.zeros(size.shape)
+        self.assignment = np.zeros(size.shape, dtype=np.int64)
+        self.step_index = 0
+        self.remaining = self.size[:, ::-1].cumsum(axis=1)[:, ::-1] / self.drain.sum()
+        return self.observe()
+
+    def observe(self):
+        """(features, feasible, finish) for the task about to be placed in every environment"""
+        j = self.step_index
+        size, data_size = self.size[:, j], self.data_size[:, j]
+        exec_time = size[:, None] / self.speed
+
+        if self.shared_network:
+            # Same estimate as NetworkModel.expected_transfer_time with every planned upload reserved
+            access = (data_size + np.minimum(self.access_reserved, data_size[:, None]).sum(axis=1)) / self.wireless_speed
+            backhaul = (data_size + np.minimum(self.backhaul_reserved, data_size[:, None]).sum(axis=1)) / self.wired_speed
+            upload = np.where(self.cloud, np.maximum(access, backhaul)[:, None], access[:, None]) * self.remote
+        else:
+            upload = data_size[:, None] * self.link_time
+
+        finish = self.load + self.delay + upload + exec_time
+        energy = self.base_energy + size * self.unit_energy
+        feasible = np.ones(finish.shape, dtype=bool)
+        feasible[:, 0] = self.battery >= energy
+        energy_share = np.zeros(finish.shape)
+        energy_share[:, 0] = energy / np.maximum(self.battery, 1e-9)
+        remaining = self.remaining[:, j + 1] if j + 1 < self.num_tasks else np.zeros(len(size))
+
+        features = offload_features(finish, exec_time, self.load.max(axis=1), energy_share,
+                                    self.battery / self.battery_capacity, remaining, feasible)
+        return features, feasible, finish
+
+    def step(self, actions):
+        """Place the current task of every environment; returns (observation, reward, done)"""
+        j = self.step_index
+        rows = np.arange(len(actions))
+        size, data_size = self.size[:, j], self.data_size[:, j]
+
+        self.load[rows, actions] += size / self.drain[actions]
+        local = actions == 0
+        energy = (self.base_energy + size * self.unit_energy) * local
+        self.battery -= energy
+        self.energy += energy
+        self.access_reserved[:, j] = data_size * self.remote[actions]
+        self.backhaul_reserved[:, j] = data_size * self.cloud[actions]
+        self.assignment[:, j] = actions
+        self.step_index += 1
+
+        if self.step_index < self.num_tasks:
+            return self.observe(), np.zeros(len(actions)), False
+        return None, -(self.makespan() + self.energy_weight * self.energy), True
+
+    def makespan(self):
+        """Makespan of the finished placements, as the event engine would run them"""
+        assignment = self.assignment
+        if self.shared_network:
+            # All uploads start at time 0 and share each link equally (per-link processor sharing)
+            access = self.access_reserved
+            backhaul = self.backhaul_reserved
+            access_done = np.minimum(access[:, None, :], access[:, :, None]).sum(axis=2) / self.wireless_speed
+            backhaul_done = np.minimum(backhaul[:, None, :], backhaul[:, :, None]).sum(axis=2) / self.wired_speed
+            transfer = np.where(self.cloud[assignment], np.maximum(access_done, backhaul_done), access_done)
+        else:
+            transfer = self.data_size * self.link_time[assignment]
+        ready = np.where(self.remote[assignment], transfer + self.delay[assignment], 0.0)
+
+        order = np.argsort(ready, axis=1, kind='stable')
+        ready = np.take_along_axis(ready, order, axis=1)
+        assignment = np.take_along_axis(assignment, order, axis=1)
+        size = np.take_along_axis(self.size, order, axis=1)
+
+        makespan = np.zeros(len(ready))
+        for r, drain in enumerate(self.drain):
+            makespan = np.maximum(makespan, work_conserving_makespan(ready, size / drain, assignment == r))
+        return makespan
+
+    def rollout(self, choose, size=None, data_size=None):
+        """Run whole episodes with choose(features, feasible, finish) -> actions; returns the rewards"""
+        observation = self.reset(size, data_size)
+        done = False
+        while not done:
+            observation, reward, done = self.step(choose(*observation))
+        return reward
+
+
+def earliest_finish(features, feasible, finish):
+    """IntelligentOffloadStrategy's rule on environment observations"""
+    return np.where(feasible, finish, np.inf).argmin(axis=1)
+
+
+class PolicyTrainer:
+    """
+    REINFORCE for PolicyNetwork over several vectorized environments
+
+    Every iteration draws a batch of workloads per environment and rolls each
+    one out `samples` times with actions sampled from the softmax of the
+    scores. The advantage of a rollout is its return minus the mean return of
+    the other rollouts of the same workload, so the gradient only rewards
+    decisions that beat the policy's own average on that workload.
+    """
+
+    def __init__(self, envs, policy=None, samples=8, learning_rate=0.01, rng=None):
+        self.envs = envs
+        self.policy = policy if policy is not None else PolicyNetwork()
+        self.samples = samples
+        self.learning_rate = learning_rate
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._moments = {name: (np.zeros_like(v), np.zeros_like(v)) for name, v in self.policy.params.items()}
+        self._updates = 0
+
+    def train(self, iterations=200, log_every=25):
+        for iteration in range(1, iterations + 1):
+            gradients = None
+            for env in self.envs:
+                env_gradients = self._episode_gradients(env)
+                gradients = env_gradients if gradients is None else {
+                    name: gradients[name] + env_gradients[name] for name in gradients}
+            self._adam_step(gradients)
+
+            if log_every and iteration % log_every == 0:
+                print(f"  iteration {iteration}: gain over earliest finish time " + ", ".join(
+                    f"{gain:+.2%}" for gain in self.evaluate(workloads=256)))
+        return self.policy
+
+    def _episode_gradients(self, env):
+        """Policy gradient of the mean advantage over one batch of sampled rollouts"""
+        size, data_size = env.sample_workloads(env.num_envs // self.samples)
+        size, data_size = np.repeat(size, self.samples, axis=0), np.repeat(data_size, self.samples, axis=0)
+
+        trajectory = []
+
+        def sample(features, feasible, finish):
+            scores = np.where(feasible, self.policy.scores(features), -np.inf)
+            probs = np.exp(scores - scores.max(axis=1, keepdims=True))
+            probs /= probs.sum(axis=1, keepdims=True)
+            draws = self.rng.random(len(probs))[:, None]
+            actions = np.minimum((probs.cumsum(axis=1) < draws).sum(axis=1), probs.shape[1] - 1)
+            trajectory.append((features, probs, actions))
+            return actions
+
+        returns = env.rollout(sample, size, data_size)
+        grouped = returns.reshape(-1, self.samples)
+        advantage = (grouped - grouped.mean(axis=1, keepdims=True)).ravel()
+        advantage /= np.abs(grouped.mean()) + 1e-9  # Relative to the makespan so scenarios weigh alike
+
+        rows = np.arange(len(advantage))
+        gradients = {name: np.zeros_like(v) for name, v in self.policy.params.items()}
+        for features, probs, actions in trajectory:
+            score_grad = -probs
+            score_grad[rows, actions] += 1
+            score_grad *= advantage[:, None] / len(advantage)
+            for name, value in self.policy.gradients(features, score_grad).items():
+                gradients[name] += value
+        return gradients
+
+    def _adam_step(self, gradients, beta1=0.9, beta2=0.999):
+        """Gradient ascent on the expected return"""
+        self._updates += 1
+        for name, gradient in gradients.items():
+            first, second = self._moments[name]
+            first[:] = beta1 * first + (1 - beta1) * gradient
+            second[:] = beta2 * second + (1 - beta2) * gradient ** 2
+            step = first / (1 - beta1 ** self._updates) / (np.sqrt(second / (1 - beta2 ** self._updates)) + 1e-8)
+            self.policy.params[name] += self.learning_rate * step
+
+    def evaluate(self, workloads=1024):
+        """Mean relative return gain of the greedy policy over earliest finish time, per environment"""
+        gains = []
+        for env in self.envs:
+            size, data_size = env.sample_workloads(workloads)
+            learned = env.rollout(lambda features, feasible, finish: self.policy.choose(features, feasible),
+                                  size, data_size)
+            baseline = env.rollout(earliest_finish, size, data_size)
+            gains.append(float((learned - baseline).mean() / -baseline.mean()))
+        return gains
+
+
+# For standalone execution
+if __name__ == "__main__":
+    import argparse
+    import time
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+
+    parser = argparse.ArgumentParser(description="Train the learned offloading policy")
+    parser.add_argument("--scenarios", type=int, nargs="+", default=sorted(SCENARIOS), help="Scenarios to train on")
+    parser.add_argument("--num-tasks", type=int, nargs="+", default=[20, 100], help="Workload sizes to train on")
+    parser.add_argument("--envs", type=int, default=512,
+                        help="Parallel environments per scenario at the smallest size (larger sizes get fewer)")
+    parser.add_argument("--iterations", type=int, default=1500, help="Policy gradient updates")
+    parser.add_argument("--seed", type=int, default=0, help="Training seed")
+    parser.add_argument("--resume", help="Weights file to continue training from")
+    parser.add_argument("--output", default=DEFAULT_POLICY, help="Where the trained weights are written")
+    args = parser.parse_args()
+
+    runner = ScenarioRunner(os.path.dirname(args.output) or ".")
+    rng = np.random.default_rng(args.seed)
+    samples = 8
+    envs = []
+    for scenario_id in args.scenarios:
+        config = SCENARIOS[scenario_id]
+        for num_tasks in args.num_tasks:
+            device, servers, wireless_speed = runner.setup_servers(config['wireless_speed'])
+            device.remaining_battery = 100 if config['battery'] == "low" else 1000
+            # About the same number of decisions per iteration whatever the workload size
+            num_envs = max(args.envs * min(args.num_tasks) // num_tasks // samples, 1) * samples
+            envs.append(OffloadEnv(device, servers, wireless_speed, config['workload'], num_tasks,
+                                   num_envs, rng=rng))
+
+    started = time.perf_counter()
+    policy = PolicyNetwork.load(args.resume) if args.resume else None
+    trainer = PolicyTrainer(envs, policy, samples=samples, rng=rng)
+    trainer.train(args.iterations)
+    print(f"Trained on scenarios {args.scenarios} in {time.perf_counter() - started:.1f}s")
+    trainer.policy.save(args.output)
+    print(f"Policy saved to: {args.output}")
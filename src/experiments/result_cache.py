@@ -0,0 +1,217 @@
+import functools
+import hashlib
+import json
+import os
+
+from typing import Dict, Any, Optional
+
+from experiments.result_store import write_task_results, read_task_results
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sources whose changes can alter a scenario's result (including the learned strategy's default weights)
+CODE_PATHS = ['models', 'scheduling', 'simulation', os.path.join('experiments', 'scenario_runner.py'),
+              os.path.join('experiments', 'workload_generator.py'), os.path.join('experiments', 'trace_loader.py'),
+              os.path.join('experiments', 'result_store.py'), os.path.join('data', 'input', 'offload_policy.json')]
+
+TASKS_SUFFIX = ".tasks.npz"  # Per-task columns stored next to each entry's JSON
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Hash of the scheduling/model sources so cached results expire when the code changes"""
+    digest = hashlib.sha256()
+    for path in CODE_PATHS:
+        full_path = os.path.join(SRC_DIR, path)
+        if os.path.isdir(full_path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, dirs, names in os.walk(full_path)
+                for name in names if name.endswith('.py')
+            )
+        else:
+            files = [full_path]
+
+        for file_path in files:
+            digest.update(os.path.relpath(file_path, SRC_DIR).encode())
+            with open(file_path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    Size and modification time of an input file, so a rewritten one is not served stale results
+    A column directory (npy results) counts by every file in it
+    """
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, name) for name in os.listdir(path))
+    else:
+        files = [path]
+    stats = []
+    for file_path in files:
+        stat = os.stat(file_path)
+        stats.append([os.path.basename(file_path), stat.st_size, stat.st_mtime_ns])
+    return {'path': os.path.abspath(path), 'files': stats}
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of scenario results
+    Entries are keyed by scenario config, workload seed, server setup, code
+    version and the size and mtime of the input files the config names (a
+    replayed trace, a policy weights file). Each entry is the result JSON
+    plus, optionally, the run's per-task columns. Reads refresh an entry's
+    mtime, and the least recently used entries are evicted once the cache
+    exceeds its entry or byte budget.
+    """
+
+    def __init__(self, cache_dir="data/cache", max_entries=10000, max_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._usage = None  # (entries, bytes), scanned lazily and then tracked per put
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, scenario_config: Dict[str, Any], seed: int, server_setup: Any) -> str:
+        """
+        Content hash identifying one scenario run
+        A replayed trace or policy file counts by its size and mtime as well as its path
+        """
+        trace = scenario_config.get('trace')
+        policy = scenario_config.get('policy')
+        payload = json.dumps({
+            'config': scenario_config,
+            'seed': seed,
+            'servers': server_setup,
+            'code': code_version(),
+            'trace': file_fingerprint(trace) if trace is not None else None,
+            'policy': file_fingerprint(policy) if policy is not None else None
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    @staticmethod
+    def _tasks_path(path: str) -> str:
+        """Per-task columns of the entry whose JSON is at path"""
+        return path[:-len(".json")] + TASKS_SUFFIX
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result or None"""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        os.utime(path)  # Mark as recently used
+        self.hits += 1
+        return result
+
+    def get_tasks(self, key: str):
+        """Per-task columns stored with an entry as a TaskTable, or None if it has none"""
+        try:
+            return read_task_results(self._tasks_path(self._path(key)), 'npz')
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, result: Dict[str, Any], tasks=None):
+        """
+        Store a result (and optionally its tasks' columns), then evict old entries if over budget
+        tasks is a TaskTable or Task objects, as for result_store.write_task_results
+        """
+        path = self._path(key)
+        tasks_path = self._tasks_path(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self._usage is None:
+            self._usage = self._scan_usage()
+        old_size = self._entry_size(path)
+
+        # Write then rename so concurrent workers never read a partial entry. The
+        # columns go first: an entry's JSON only appears once its columns are in place
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        if tasks is not None:
+            temp_tasks = f"{tasks_path}.{os.getpid()}.tmp.npz"
+            write_task_results(tasks, temp_tasks, 'npz')
+            os.replace(temp_tasks, tasks_path)
+        elif os.path.exists(tasks_path):
+            os.remove(tasks_path)  # Columns of an older run under the same key
+        with open(temp_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(temp_path, path)
+
+        # Overwriting an entry replaces its bytes rather than adding to them
+        count, total_bytes = self._usage
+        self._usage = (count + (old_size is None), total_bytes - (old_size or 0) + self._entry_size(path))
+        if self._over_budget(*self._usage):
+            self.evict()
+
+    def _entry_size(self, path):
+        """Bytes of the entry whose JSON is at path, its task columns included; None if there is none"""
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+        try:
+            return size + os.path.getsize(self._tasks_path(path))
+        except FileNotFoundError:
+            return size
+
+    def _over_budget(self, count, total_bytes):
+        return (self.max_entries is not None and count > self.max_entries) or \
+            (self.max_bytes is not None and total_bytes > self.max_bytes)
+
+    def _scan_usage(self):
+        entries = self._entries()
+        return len(entries), sum(size for mtime, size, path in entries)
+
+    def _entries(self):
+        """All cache entries as (mtime, size with task columns, JSON path)"""
+        entries = []
+        for root, dirs, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        mtime = os.stat(path).st_mtime
+                    except FileNotFoundError:
+                        continue  # Evicted by another worker
+                    size = self._entry_size(path)
+                    if size is not None:
+                        entries.append((mtime, size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until within max_entries and max_bytes"""
+        entries = self._entries()
+        count = len(entries)
+        total_bytes = sum(size for mtime, size, path in entries)
+
+        for mtime, size, path in sorted(entries):
+            if not self._over_budget(count, total_bytes):
+                break
+            self._remove(path)
+            count -= 1
+            total_bytes -= size
+
+        self._usage = (count, total_bytes)
+
+    def clear(self):
+        """Remove every cached entry"""
+        for mtime, size, path in self._entries():
+            self._remove(path)
+        self._usage = (0, 0)
+
+    def _remove(self, path):
+        """Delete an entry's JSON and task columns (another worker may have beaten us to it)"""
+        for entry_path in (path, self._tasks_path(path)):
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,118 @@
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+import pandas as pd
+from models.task_table import TaskTable
+
+# Layouts for per-task results: one .npz file, a directory of raw .npy columns, or Parquet
+RESULT_FORMATS = ('npz', 'npy', 'parquet')
+
+SERVERS_FILE = "servers.json"  # Server index -> name, next to the columns of an npy directory
+
+
+def result_format(path):
+    """Layout from the path: .npz and .parquet files, anything else is an npy column directory"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npz':
+        return 'npz'
+    if extension == '.parquet':
+        return 'parquet'
+    return 'npy'
+
+
+def _npz_columns(path, names):
+    """
+    Memory-map the named arrays of an npz file in place
+    np.savez stores members uncompressed, so each array's bytes sit at a fixed
+    offset in the zip and map like a .npy file; compressed members are read.
+    """
+    header_readers = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+    columns = {}
+    with open(path, 'rb') as f, zipfile.ZipFile(f) as archive:
+        for name in names:
+            info = archive.getinfo(f"{name}.npy")
+            read_header = None
+            if info.compress_type == zipfile.ZIP_STORED:
+                # Local file header: 30 fixed bytes, then the file name and extra field
+                f.seek(info.header_offset + 26)
+                name_length, extra_length = struct.unpack('<HH', f.read(4))
+                f.seek(info.header_offset + 30 + name_length + extra_length)
+                read_header = header_readers.get(np.lib.format.read_magic(f))
+            if read_header is None:
+                with archive.open(info) as member:
+                    columns[name] = np.lib.format.read_array(member)
+                continue
+
+            shape, fortran_order, dtype = read_header(f)
+            if not np.prod(shape):
+                columns[name] = np.empty(shape, dtype=dtype)  # Nothing to map
+                continue
+            columns[name] = np.memmap(path, dtype=dtype, mode='r', shape=shape, offset=f.tell(),
+                                      order='F' if fortran_order else 'C')
+    return columns
+
+
+def write_task_results(tasks, path, layout=None):
+    """
+    Write every task's lifecycle column by column
+    tasks is a TaskTable or Task objects; the columns are TaskTable.COLUMNS
+    (definition, start and completion time, server index) plus the server
+    names. Returns the path written.
+    """
+    table = tasks if isinstance(tasks, TaskTable) else TaskTable.from_tasks(tasks)
+    columns = {name: table.column(name) for name in TaskTable.COLUMNS}
+    layout = layout or result_format(path)
+
+    if layout == 'npz':
+        # Uncompressed so loading a column is a plain read
+        np.savez(path, server_names=np.array(table.server_names, dtype=str), **columns)
+    elif layout == 'npy':
+        os.makedirs(path, exist_ok=True)
+        for name, column in columns.items():
+            np.save(os.path.join(path, f"{name}.npy"), column)
+        with open(os.path.join(path, SERVERS_FILE), 'w') as f:
+            json.dump(table.server_names, f)
+    elif layout == 'parquet':
+        frame = pd.DataFrame(columns)
+        frame['server'] = pd.Categorical.from_codes(columns['server'], categories=table.server_names)
+        try:
+            frame.to_parquet(path, index=False)
+        except ImportError:
+            raise ImportError("Writing Parquet results needs pyarrow (pip install pyarrow)") from None
+    else:
+        raise ValueError(f"Unknown result layout '{layout}'. Available: {RESULT_FORMATS}")
+    return path
+
+
+def read_task_results(path, layout=None) -> TaskTable:
+    """
+    Load per-task results as a TaskTable
+    npy directories and npz files are memory-mapped, so column slices are
+    zero-copy and only the pages they touch are read
+    """
+    layout = layout or result_format(path)
+
+    if layout == 'npz':
+        columns = _npz_columns(path, TaskTable.COLUMNS)
+        with np.load(path) as data:
+            server_names = data['server_names'].tolist()
+    elif layout == 'npy':
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in TaskTable.COLUMNS}
+        with open(os.path.join(path, SERVERS_FILE)) as f:
+            server_names = json.load(f)
+    elif layout == 'parquet':
+        try:
+            frame = pd.read_parquet(path)
+        except ImportError:
+            raise ImportError("Reading Parquet results needs pyarrow (pip install pyarrow)") from None
+        server_names = frame['server'].cat.categories.tolist()
+        columns = {name: frame[name].to_numpy(dtype=dtype) for name, dtype in TaskTable.COLUMNS.items()
+                   if name != 'server'}
+        columns['server'] = frame['server'].cat.codes.to_numpy(dtype=np.int32)
+    else:
+        raise ValueError(f"Unknown result layout '{layout}'. Available: {RESULT_FORMATS}")
+
+    return TaskTable.from_columns(columns, server_names)
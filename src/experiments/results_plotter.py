@@ -1,18 +1,115 @@
-import matplotlib.pyplot as plt
-import pandas as pd
+import hashlib
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 from typing import List, Dict, Any
+from experiments.result_store import read_task_results, RESULT_FORMATS
+from experiments.result_cache import file_fingerprint
+
+FULL_DPI = 300
+PREVIEW_DPI = 72  # Quick look: roughly 17x fewer pixels than a full render
+
+RENDER_STATE_FILE = ".render_state.json"  # chart -> hash of the inputs it was last rendered from
+
+# Beyond these, charts switch to aggregate shapes so drawing cost does not grow with the run count
+MAX_BARS = 30  # Scenarios drawn as bars; more are drawn as percentile bands
+MAX_CDF_LINES = 12  # Scenarios drawn as CDF lines; more are drawn as one band
+BAND_POINTS = 200  # Band charts bin consecutive scenarios down to this many points
+MAX_ANNOTATED_CELLS = 100  # Heatmap cells that get a value label
+CDF_POINTS = 200  # Quantile levels each CDF is drawn from, whatever the task count
+
+PERCENTILES = (5, 25, 50, 75, 95)
+TIERS = ('local', 'edge', 'cloud')
+
+# Scalar run metrics and sweep parameters pulled into results_frame
+RESULT_COLUMNS = ('scenario_id', 'replication', 'makespan', 'total_energy_consumed',
+                  'battery_level', 'wireless_speed', 'workload_type')
+
+
+def results_frame(results: List[Dict[str, Any]]) -> pd.DataFrame:
+    """One row per run with its scalar metrics and sweep parameters (n/a where a result lacks one)"""
+    defaults = {'replication': 0}
+    return pd.DataFrame({column: [result.get(column, defaults.get(column, 'n/a')) for result in results]
+                         for column in RESULT_COLUMNS})
+
+
+def scenario_groups(frame: pd.DataFrame, max_groups=BAND_POINTS) -> pd.Series:
+    """
+    Group key of each run: its scenario_id, or once there are more than max_groups
+    scenarios, the first scenario_id of its bin of consecutive scenarios
+    """
+    ids = frame['scenario_id'].to_numpy()
+    unique = np.unique(ids)
+    if len(unique) <= max_groups:
+        return frame['scenario_id']
+    bins = np.arange(len(unique)) * max_groups // len(unique)
+    first_of_bin = unique[np.searchsorted(bins, bins)]
+    return pd.Series(first_of_bin[np.searchsorted(unique, ids)], index=frame.index, name='scenario_id')
+
+
+def percentile_table(frame: pd.DataFrame, metric: str, by='scenario_id') -> pd.DataFrame:
+    """PERCENTILES of a metric over the runs of each group (columns p5..p95), plus the run count"""
+    grouped = frame.groupby(by)[metric]
+    table = grouped.quantile([p / 100 for p in PERCENTILES]).unstack()
+    table.columns = [f"p{p}" for p in PERCENTILES]
+    table['runs'] = grouped.size()
+    return table
+
+
+def tier_table(results: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Mean tasks processed per tier (TIERS columns) over the runs of each scenario_groups key"""
+    rows = []
+    for run, result in enumerate(results):
+        for server, stats in result['queue_stats'].items():
+            # Older result files have no tier, so fall back to the server name
+            tier = stats.get('tier') or ('cloud' if 'cloud' in server.lower() else
+                                         'edge' if 'edge' in server.lower() else 'local')
+            rows.append((run, result['scenario_id'], tier, stats.get('tasks_processed', 0)))
+    frame = pd.DataFrame(rows, columns=['run', 'scenario_id', 'tier', 'tasks'])
+
+    per_run = frame.groupby(['run', 'scenario_id', 'tier'])['tasks'].sum().reset_index()
+    return (per_run.groupby([scenario_groups(per_run), 'tier'])['tasks'].mean()
+            .unstack(fill_value=0).reindex(columns=list(TIERS), fill_value=0))
+
+
+def _render_chart_job(job):
+    """Worker entry point: render one chart in a fresh plotter"""
+    results_dir, plots_dir, dpi, method, results = job
+    plotter = ResultsPlotter(results_dir, plots_dir, dpi=dpi)
+    return getattr(plotter, method)(results)
 
 
 class ResultsPlotter:
     """
     Generates the required visualizations from scenario results
+    Rendering is headless (Agg) unless show=True. A chart is only redrawn when
+    its inputs changed since the last render: the results, the DPI, or this
+    module's code. Runs are aggregated with pandas before drawing (percentiles
+    over replications, medians over the parameter grid, fixed-size CDFs), so
+    render time stays flat as the number of runs grows.
     """
 
-    def __init__(self, results_dir="data/output", plots_dir="data/visualizations"):
+    # Output file -> method that draws it
+    CHARTS = {
+        "makespan_comparison.png": "create_makespan_comparison",
+        "energy_impact_chart.png": "create_energy_impact_chart",
+        "queue_occupancy_chart.png": "create_queue_occupancy_chart",
+        "parameter_heatmap.png": "create_parameter_heatmap",
+        "response_time_cdf.png": "create_latency_cdf"
+    }
+
+    def __init__(self, results_dir="data/output", plots_dir="data/visualizations", dpi=FULL_DPI,
+                 preview=False, show=False):
         self.results_dir = results_dir
         self.plots_dir = plots_dir
+        self.dpi = PREVIEW_DPI if preview else dpi
+        self.show = show  # Open each chart in a window after saving it
+        if not show:
+            plt.switch_backend("Agg")
         os.makedirs(plots_dir, exist_ok=True)
 
     def load_results(self) -> List[Dict[str, Any]]:
@@ -25,136 +122,307 @@ class ResultsPlotter:
         with open(results_file, 'r') as f:
             return json.load(f)
 
+    def load_task_results(self, file_id):
+        """
+        Per-task results of one scenario run (file_id as in save_individual_scenario_files)
+        Returns a TaskTable; the npy layout is memory-mapped, so column slices are zero-copy
+        """
+        path = self.task_results_path(file_id)
+        if path is None:
+            raise FileNotFoundError(f"No task results for scenario {file_id} in {self.results_dir} "
+                                    f"(looked for {RESULT_FORMATS} layouts)")
+        return read_task_results(path)
+
+    def task_results_path(self, file_id):
+        """Path of one scenario run's per-task results in whichever layout exists, or None"""
+        for path in (os.path.join(self.results_dir, f"scenario_{file_id}_tasks{extension}")
+                     for extension in ('.npz', '', '.parquet')):
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def _file_id(result: Dict[str, Any]) -> str:
+        """file_id of a result's per-task files, as in save_individual_scenario_files"""
+        replication = result.get('replication', 0)
+        return f"{result['scenario_id']}_rep{replication}" if replication else f"{result['scenario_id']}"
+
     def create_makespan_comparison(self, results: List[Dict[str, Any]]):
-        """Create makespan comparison chart"""
+        """Create makespan comparison chart (median per scenario, p5-p95 over replications)"""
         plt.figure(figsize=(12, 6))
 
-        scenario_names = [f"Scenario {r['scenario_id']}" for r in results]
-        makespans = [r['makespan'] for r in results]
-
-        bars = plt.bar(scenario_names, makespans, color='skyblue', edgecolor='navy')
-
-        # Add value labels on bars
-        for bar, makespan in zip(bars, makespans):
-            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                     f'{makespan:.1f}', ha='center', va='bottom')
+        frame = results_frame(results)
+        stats = percentile_table(frame, 'makespan', by=scenario_groups(frame))
+        self._draw_distribution(stats, color='skyblue', edgecolor='navy')
 
         plt.title('Makespan Comparison Across Scenarios', fontsize=14, fontweight='bold')
         plt.xlabel('Scenarios', fontweight='bold')
         plt.ylabel('Makespan (time units)', fontweight='bold')
-        plt.xticks(rotation=45, ha='right')
         plt.grid(axis='y', alpha=0.3)
         plt.tight_layout()
 
         # Save plot
-        output_file = os.path.join(self.plots_dir, "makespan_comparison.png")
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.show()
+        output_file = self._save_figure("makespan_comparison.png")
 
         print(f"Makespan chart saved to: {output_file}")
+        return output_file
 
     def create_energy_impact_chart(self, results: List[Dict[str, Any]]):
-        """Create energy impact comparison chart"""
+        """Create energy impact comparison chart (median per scenario, p5-p95 over replications)"""
         plt.figure(figsize=(12, 6))
 
-        scenario_names = [f"Scenario {r['scenario_id']}" for r in results]
-        energy_consumed = [r['total_energy_consumed'] for r in results]
-        battery_levels = [r['battery_level'] for r in results]
+        frame = results_frame(results)
+        stats = percentile_table(frame, 'total_energy_consumed', by=scenario_groups(frame))
 
         # Color based on battery level
-        colors = ['red' if level == 'low' else 'green' for level in battery_levels]
-
-        bars = plt.bar(scenario_names, energy_consumed, color=colors,
-                       edgecolor='darkred', alpha=0.7)
-
-        # Add value labels
-        for bar, energy in zip(bars, energy_consumed):
-            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                     f'{energy:.1f}', ha='center', va='bottom')
-
-        # Add legend for battery levels
-        from matplotlib.patches import Patch
-        legend_elements = [
-            Patch(facecolor='green', label='High Battery'),
-            Patch(facecolor='red', label='Low Battery')
-        ]
-        plt.legend(handles=legend_elements)
+        battery_levels = frame.groupby('scenario_id')['battery_level'].first().reindex(stats.index)
+        colors = np.where(battery_levels == 'low', 'red', 'green')
+
+        if self._draw_distribution(stats, color=colors, edgecolor='darkred', alpha=0.7):
+            # Add legend for battery levels
+            from matplotlib.patches import Patch
+            legend_elements = [
+                Patch(facecolor='green', label='High Battery'),
+                Patch(facecolor='red', label='Low Battery')
+            ]
+            plt.legend(handles=legend_elements)
 
         plt.title('Energy Consumption Across Scenarios', fontsize=14, fontweight='bold')
         plt.xlabel('Scenarios', fontweight='bold')
         plt.ylabel('Energy Consumed', fontweight='bold')
-        plt.xticks(rotation=45, ha='right')
         plt.grid(axis='y', alpha=0.3)
         plt.tight_layout()
 
         # Save plot
-        output_file = os.path.join(self.plots_dir, "energy_impact_chart.png")
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.show()
+        output_file = self._save_figure("energy_impact_chart.png")
 
         print(f"Energy chart saved to: {output_file}")
+        return output_file
 
     def create_queue_occupancy_chart(self, results: List[Dict[str, Any]]):
-        """Create queue occupancy comparison chart"""
+        """Create queue occupancy comparison chart (mean tasks per tier over replications)"""
         plt.figure(figsize=(14, 8))
 
-        scenario_ids = [r['scenario_id'] for r in results]
+        tiers = tier_table(results)
+        local, edge, cloud = (tiers[tier].to_numpy() for tier in TIERS)
+        labels = ['Local Device', 'Edge Servers', 'Cloud Server']
+        colors = ['lightcoral', 'lightblue', 'lightgreen']
 
-        # Extract queue statistics
-        device_tasks = []
-        edge_tasks = []
-        cloud_tasks = []
+        if len(tiers) <= MAX_BARS:
+            # Create stacked bar chart
+            bar_width = 0.6
+            x_pos = np.arange(len(tiers))
 
-        for result in results:
-            queue_stats = result['queue_stats']
-            device_tasks.append(queue_stats.get('device', {}).get('tasks_processed', 0))
-
-            # Sum all edge servers
-            edge_total = 0
-            cloud_total = 0
-            for server, stats in queue_stats.items():
-                if 'edge' in server.lower():
-                    edge_total += stats.get('tasks_processed', 0)
-                elif 'cloud' in server.lower():
-                    cloud_total += stats.get('tasks_processed', 0)
-
-            edge_tasks.append(edge_total)
-            cloud_tasks.append(cloud_total)
-
-        # Create stacked bar chart
-        bar_width = 0.6
-        x_pos = range(len(scenario_ids))
-
-        plt.bar(x_pos, device_tasks, bar_width, label='Local Device', color='lightcoral')
-        plt.bar(x_pos, edge_tasks, bar_width, bottom=device_tasks, label='Edge Servers', color='lightblue')
-        plt.bar(x_pos, cloud_tasks, bar_width,
-                bottom=[d + e for d, e in zip(device_tasks, edge_tasks)],
-                label='Cloud Server', color='lightgreen')
+            plt.bar(x_pos, local, bar_width, label=labels[0], color=colors[0])
+            plt.bar(x_pos, edge, bar_width, bottom=local, label=labels[1], color=colors[1])
+            plt.bar(x_pos, cloud, bar_width, bottom=local + edge, label=labels[2], color=colors[2])
+            plt.xticks(x_pos, [f'Scenario {sid}' for sid in tiers.index], rotation=45)
+        else:
+            # Too many scenarios for bars: one stacked area per tier
+            plt.stackplot(tiers.index.to_numpy(), local, edge, cloud, labels=labels, colors=colors)
 
         plt.xlabel('Scenarios', fontweight='bold')
         plt.ylabel('Number of Tasks Processed', fontweight='bold')
         plt.title('Task Distribution Across Compute Resources', fontsize=14, fontweight='bold')
-        plt.xticks(x_pos, [f'Scenario {sid}' for sid in scenario_ids], rotation=45)
-        plt.legend()
+        plt.legend(loc='upper right')
         plt.grid(axis='y', alpha=0.3)
         plt.tight_layout()
 
         # Save plot
-        output_file = os.path.join(self.plots_dir, "queue_occupancy_chart.png")
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.show()
+        output_file = self._save_figure("queue_occupancy_chart.png")
 
         print(f"Queue occupancy chart saved to: {output_file}")
+        return output_file
+
+    def create_parameter_heatmap(self, results: List[Dict[str, Any]]):
+        """Create heatmaps of median makespan and energy over the scenario parameter grid"""
+        frame = results_frame(results)
+        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+
+        for ax, (metric, title) in zip(axes, [('makespan', 'Median Makespan'),
+                                              ('total_energy_consumed', 'Median Energy Consumed')]):
+            grid = frame.pivot_table(index=['battery_level', 'wireless_speed'], columns='workload_type',
+                                     values=metric, aggfunc='median')
+            image = ax.imshow(grid.to_numpy(), cmap='viridis', aspect='auto')
+            fig.colorbar(image, ax=ax)
+
+            ax.set_xticks(np.arange(grid.shape[1]), grid.columns, rotation=45, ha='right')
+            ax.set_yticks(np.arange(grid.shape[0]), [f"{battery} battery, {speed} wireless"
+                                                     for battery, speed in grid.index])
+            ax.set_xlabel('Workload', fontweight='bold')
+            ax.set_title(title, fontsize=14, fontweight='bold')
+
+            # Value labels only while the cells are big enough to read them
+            if grid.size <= MAX_ANNOTATED_CELLS:
+                for (row, col), value in np.ndenumerate(grid.to_numpy()):
+                    if not np.isnan(value):
+                        ax.text(col, row, f'{value:.1f}', ha='center', va='center', color='white')
+
+        plt.tight_layout()
+
+        # Save plot
+        output_file = self._save_figure("parameter_heatmap.png")
+
+        print(f"Parameter heatmap saved to: {output_file}")
+        return output_file
 
-    def generate_all_plots(self):
-        """Generate all three required charts"""
+    def create_latency_cdf(self, results: List[Dict[str, Any]]):
+        """Create CDF of per-task response time (completion - arrival) for each scenario"""
+        plt.figure(figsize=(12, 6))
+
+        levels = np.linspace(0, 1, CDF_POINTS)
+        curves = self.response_time_quantiles(results, levels)
+
+        if not curves:
+            plt.text(0.5, 0.5, f"No per-task results in {self.results_dir}", ha='center', va='center',
+                     transform=plt.gca().transAxes)
+        elif len(curves) <= MAX_CDF_LINES:
+            for scenario_id, quantiles in curves.items():
+                plt.step(quantiles, levels, where='post', label=f'Scenario {scenario_id}')
+            plt.legend()
+        else:
+            # One band over all scenarios instead of a line each
+            low, median, high = np.percentile(np.vstack(list(curves.values())), [5, 50, 95], axis=0)
+            plt.fill_betweenx(levels, low, high, alpha=0.3, label=f'p5-p95 of {len(curves)} scenarios')
+            plt.plot(median, levels, label='Median scenario')
+            plt.legend(loc='lower right')
+
+        plt.title('Per-Task Response Time Distribution', fontsize=14, fontweight='bold')
+        plt.xlabel('Response Time (time units)', fontweight='bold')
+        plt.ylabel('Fraction of Tasks', fontweight='bold')
+        plt.grid(alpha=0.3)
+        plt.tight_layout()
+
+        # Save plot
+        output_file = self._save_figure("response_time_cdf.png")
+
+        print(f"Response time CDF saved to: {output_file}")
+        return output_file
+
+    def response_time_quantiles(self, results: List[Dict[str, Any]], levels) -> Dict[Any, np.ndarray]:
+        """
+        Response time quantiles at the given levels per scenario, pooling the tasks
+        of all its replications; runs without per-task result files are skipped
+        """
+        response_times = {}
+        for result in results:
+            try:
+                table = self.load_task_results(self._file_id(result))
+            except FileNotFoundError:
+                continue
+            response = table.column('completion_time') - table.column('arrival_time')
+            response_times.setdefault(result['scenario_id'], []).append(response[~np.isnan(response)])
+
+        curves = {}
+        for scenario_id, parts in response_times.items():
+            pooled = np.concatenate(parts)
+            if len(pooled):
+                curves[scenario_id] = np.quantile(pooled, levels)
+        return curves
+
+    def _draw_distribution(self, stats: pd.DataFrame, color, **bar_style) -> bool:
+        """
+        Draw per-scenario percentiles: bars at the median with p5-p95 whiskers, or
+        percentile bands once there are too many scenarios (or scenario bins) for bars.
+        Returns True if bars were drawn.
+        """
+        median = stats['p50'].to_numpy()
+        if len(stats) > MAX_BARS:
+            x = stats.index.to_numpy()
+            plt.fill_between(x, stats['p5'], stats['p95'], alpha=0.2, color='navy', label='p5-p95')
+            plt.fill_between(x, stats['p25'], stats['p75'], alpha=0.4, color='navy', label='p25-p75')
+            plt.plot(x, median, color='navy', label='Median')
+            plt.legend(loc='upper right')  # 'best' would scan every point
+            return False
+
+        x_pos = np.arange(len(stats))
+        bars = plt.bar(x_pos, median, color=color, **bar_style)
+        tops = median
+        if (stats['runs'] > 1).any():
+            plt.errorbar(x_pos, median, yerr=[median - stats['p5'], stats['p95'] - median],
+                         fmt='none', ecolor='black', capsize=4)
+            tops = np.maximum(median, stats['p95'].to_numpy())
+
+        # Add value labels above the bars and their whiskers
+        for bar, value, top in zip(bars, median, tops):
+            plt.text(bar.get_x() + bar.get_width() / 2, top + 0.1,
+                     f'{value:.1f}', ha='center', va='bottom')
+        plt.xticks(x_pos, [f"Scenario {sid}" for sid in stats.index], rotation=45, ha='right')
+        return True
+
+    def _save_figure(self, file_name):
+        """Write the current figure, show it if asked, and free it"""
+        output_file = os.path.join(self.plots_dir, file_name)
+        plt.savefig(output_file, dpi=self.dpi, bbox_inches='tight')
+        if self.show:
+            plt.show()
+        plt.close()
+        return output_file
+
+    def input_hash(self, results: List[Dict[str, Any]]) -> str:
+        """
+        Hash of everything a render depends on: the results, the per-task files
+        the distribution charts read (by size and mtime), the DPI and the plotting code
+        """
+        digest = hashlib.sha256(json.dumps(results, sort_keys=True, default=str).encode())
+        task_files = [self.task_results_path(self._file_id(result)) for result in results]
+        digest.update(json.dumps([file_fingerprint(path) if path is not None else None
+                                  for path in task_files]).encode())
+        digest.update(str(self.dpi).encode())
+        with open(__file__, 'rb') as f:
+            digest.update(f.read())
+        return digest.hexdigest()
+
+    def _load_render_state(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.plots_dir, RENDER_STATE_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_render_state(self, state: Dict[str, str]):
+        with open(os.path.join(self.plots_dir, RENDER_STATE_FILE), 'w') as f:
+            json.dump(state, f, indent=2)
+
+    def stale_charts(self, results: List[Dict[str, Any]]) -> List[str]:
+        """Charts whose file is missing or was rendered from different inputs"""
+        input_hash = self.input_hash(results)
+        state = self._load_render_state()
+        return [name for name in self.CHARTS
+                if state.get(name) != input_hash or not os.path.exists(os.path.join(self.plots_dir, name))]
+
+    def render(self, results: List[Dict[str, Any]], jobs=1, force=False) -> List[str]:
+        """
+        Render the charts that are out of date (all of them with force=True)
+        With jobs > 1 the charts are drawn in parallel worker processes.
+        Returns the files written.
+        """
+        charts = list(self.CHARTS) if force else self.stale_charts(results)
+        if not charts:
+            print("Charts are up to date, nothing to render")
+            return []
+
+        methods = [self.CHARTS[name] for name in charts]
+        if jobs > 1 and len(charts) > 1 and not self.show:
+            run_jobs = [(self.results_dir, self.plots_dir, self.dpi, method, results) for method in methods]
+            with ProcessPoolExecutor(max_workers=min(jobs, len(charts))) as executor:
+                written = list(executor.map(_render_chart_job, run_jobs))
+        else:
+            written = [getattr(self, method)(results) for method in methods]
+
+        state = self._load_render_state()
+        input_hash = self.input_hash(results)
+        state.update({name: input_hash for name in charts})
+        self._save_render_state(state)
+        return written
+
+    def generate_all_plots(self, jobs=1, force=False):
+        """Generate all charts, skipping those already rendered from these results"""
         try:
             results = self.load_results()
             print(f"Loaded results for {len(results)} scenarios")
 
-            self.create_makespan_comparison(results)
-            self.create_energy_impact_chart(results)
-            self.create_queue_occupancy_chart(results)
+            self.render(results, jobs=jobs, force=force)
 
             print("\n✓ All charts generated successfully!")
 
@@ -166,5 +434,16 @@ class ResultsPlotter:
 
 # For standalone execution
 if __name__ == "__main__":
-    plotter = ResultsPlotter()
-    plotter.generate_all_plots()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render charts from scenario results")
+    parser.add_argument("--results-dir", default="data/output", help="Directory holding scenario_results.json")
+    parser.add_argument("--plots-dir", default="data/visualizations", help="Where charts are written")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes to render charts in parallel")
+    parser.add_argument("--preview", action="store_true", help=f"Fast low-resolution render ({PREVIEW_DPI} dpi)")
+    parser.add_argument("--force", action="store_true", help="Redraw charts even if their inputs are unchanged")
+    parser.add_argument("--show", action="store_true", help="Open each chart in a window (needs a display)")
+    args = parser.parse_args()
+
+    plotter = ResultsPlotter(args.results_dir, args.plots_dir, preview=args.preview, show=args.show)
+    plotter.generate_all_plots(jobs=args.jobs, force=args.force)
@@ -1,12 +1,82 @@
+import itertools
 import json
 import os
 
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any
 from models.task import Task
 from models.device import Device
-from models.server import Server
+from models.server import Server, ServerTier
+from models.fleet import load_fleet
+from models.device_fleet import DeviceFleet
 from scheduling.list_scheduler import ListScheduler
+from scheduling.offload_strategy import IntelligentOffloadStrategy
+from scheduling.learned_strategy import DEFAULT_POLICY
+from simulation.multi_device import MultiDeviceSimulation
+from simulation.network import NetworkModel
+from simulation.disciplines import make_discipline
+from experiments.workload_generator import multi_device_workload
+from experiments.trace_loader import stream_trace
+from experiments.result_store import write_task_results, RESULT_FORMATS
+
+# Devices sharing one wireless access link in multi-device runs
+DEVICES_PER_ACCESS_LINK = 50
+
+# Most tasks an offline trace replay reads: offline planning holds the whole trace in memory
+MAX_OFFLINE_TRACE_TASKS = 1_000_000
+
+# The 6 required test scenarios
+SCENARIOS = {
+    1: { #Scenario 1: Baseline - optimal conditions
+        'name': 'High Battery, Fast Wireless, Mixed Workload',
+        'battery': 'high',
+        'wireless_speed': 'fast',
+        'workload': 'mixed'
+    },
+    2: { #Scenario 2: Tests handling of compute-heavy workloads
+        'name': 'High Battery, Fast Wireless, Many Large Tasks',
+        'battery': 'high',
+        'wireless_speed': 'fast',
+        'workload': 'many_large'
+    },
+    3: { #Scenario 3: Tests impact of network delays on mixed workload
+        'name': 'High Battery, Slow Wireless, Mixed Workload',
+        'battery': 'high',
+        'wireless_speed': 'slow',
+        'workload': 'mixed'
+    },
+    4: { #Scenario 4: Tests energy-constrained decisions with good network
+        'name': 'Low Battery, Fast Wireless, Mixed Workload',
+        'battery': 'low',
+        'wireless_speed': 'fast',
+        'workload': 'mixed'
+    },
+    5: { #Scenario 5: Worst-case - both energy and network constrained
+        'name': 'Low Battery, Slow Wireless, Mixed Workload',
+        'battery': 'low',
+        'wireless_speed': 'slow',
+        'workload': 'mixed'
+    },
+    6: { #Scenario 6: Tests many quick tasks with network limitations
+        'name': 'High Battery, Slow Wireless, Many Small Tasks',
+        'battery': 'high',
+        'wireless_speed': 'slow',
+        'workload': 'many_small'
+    }
+}
+
+
+def scenario_seed(base_seed: int, scenario_id: int, replication: int = 0) -> int:
+    """Derive a deterministic, independent workload seed for one scenario run"""
+    return int(np.random.SeedSequence([base_seed, scenario_id, replication]).generate_state(1)[0])
+
+
+def _run_scenario_job(job):
+    """Worker entry point: run one (scenario, replication) in a fresh runner"""
+    output_dir, cache, result_format, scenario_id, config, seed, replication = job
+    runner = ScenarioRunner(output_dir, cache=cache, result_format=result_format)
+    return runner.run_scenario(scenario_id, config, seed=seed, replication=replication)
 
 
 class ScenarioRunner:
@@ -14,49 +84,62 @@ class ScenarioRunner:
     Runs the 6 test scenarios and collects results
     """
 
-    def __init__(self, output_dir="data/output"):
+    def __init__(self, output_dir="data/output", cache=None, result_format="npz"):
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format '{result_format}'. Available: {RESULT_FORMATS}")
         self.output_dir = output_dir
+        self.cache = cache  # Optional ResultCache for seeded runs
+        self.result_format = result_format  # Layout of per-task result files (see result_store)
         os.makedirs(output_dir, exist_ok=True)
 
-    def create_workload(self, scenario_type: str, num_tasks: int = 20) -> List[Task]:
+    def create_workload(self, scenario_type: str, num_tasks: int = 20, rng=None) -> List[Task]:
         """
         Create different types of workloads based on scenario
+        rng is a np.random.RandomState for reproducible workloads (global state if None)
         """
+        rng = rng if rng is not None else np.random
         tasks = []
 
         if scenario_type == "many_small":
             # Many small tasks (low compute, low data)
             for i in range(num_tasks):
-                size = np.random.randint(10, 50)  # Small compute
-                data_size = np.random.randint(1, 20)  # Small data
-                priority = np.random.randint(1, 4)
+                size = rng.randint(10, 50)  # Small compute
+                data_size = rng.randint(1, 20)  # Small data
+                priority = rng.randint(1, 4)
                 tasks.append(Task(i, size, priority, data_size))
 
         elif scenario_type == "many_large":
             # Many large tasks (high compute, high data)
             for i in range(num_tasks):
-                size = np.random.randint(100, 300)  # Large compute
-                data_size = np.random.randint(50, 200)  # Large data
-                priority = np.random.randint(1, 4)
+                size = rng.randint(100, 300)  # Large compute
+                data_size = rng.randint(50, 200)  # Large data
+                priority = rng.randint(1, 4)
                 tasks.append(Task(i, size, priority, data_size))
 
         else:  # mixed workload
             for i in range(num_tasks):
                 if i % 2 == 0:
-                    size = np.random.randint(10, 50)
-                    data_size = np.random.randint(1, 20)
+                    size = rng.randint(10, 50)
+                    data_size = rng.randint(1, 20)
                 else:
-                    size = np.random.randint(80, 150)
-                    data_size = np.random.randint(30, 100)
-                priority = np.random.randint(1, 4)
+                    size = rng.randint(80, 150)
+                    data_size = rng.randint(30, 100)
+                priority = rng.randint(1, 4)
                 tasks.append(Task(i, size, priority, data_size))
 
         return tasks
 
-    def setup_servers(self, wireless_speed: str) -> tuple:
+    def setup_servers(self, wireless_speed: str, num_servers: int = 3, fleet_file: str = None,
+                      num_cores: int = 1) -> tuple:
         """
         Setup device and servers with different configurations
+        num_servers counts remote servers: one cloud plus (num_servers - 1) edge servers,
+        each with num_cores cores. A fleet_file (see models.fleet.load_fleet)
+        replaces the generated servers.
         """
+        if fleet_file is None and num_servers < 1:
+            raise ValueError(f"num_servers must be at least 1, got {num_servers}")
+
         # Network speeds (MB/s)
         wireless_speeds = {
             "fast": 100,  # 100 MB/s
@@ -70,42 +153,56 @@ class ScenarioRunner:
             battery_capacity=1000
         )
 
-        # Create edge servers (faster than local)
+        if fleet_file is not None:
+            return device, load_fleet(fleet_file), wireless_speeds[wireless_speed]
+
+        # Create edge servers (faster than local), alternating between two hardware generations
+        edge_speeds = [3.0, 4.0]
         edge_servers = [
-            Server("EdgeServer1", compute_speed=3.0, network_delay=1),
-            Server("EdgeServer2", compute_speed=4.0, network_delay=1)
+            Server(f"EdgeServer{i + 1}", compute_speed=edge_speeds[i % 2], network_delay=1,
+                   tier=ServerTier.EDGE, num_cores=num_cores)
+            for i in range(num_servers - 1)
         ]
 
         # Create cloud server (fastest)
         cloud_server = Server(
             "CloudServer",
             compute_speed=10.0,
-            network_delay=5  # Higher fixed delay for cloud
+            network_delay=5,  # Higher fixed delay for cloud
+            tier=ServerTier.CLOUD,
+            num_cores=num_cores
         )
 
         all_servers = edge_servers + [cloud_server]
 
         return device, all_servers, wireless_speeds[wireless_speed]
 
+    def setup_network(self, scenario_config: Dict[str, Any], wireless_speed: float, access_links: int = 1):
+        """Shared-bandwidth network for a scenario that opts in with network='shared', else None"""
+        if scenario_config.get('network', 'ideal') != 'shared':
+            return None
+        return NetworkModel(wireless_speed, access_links=access_links)
+
+    def apply_discipline(self, resources, scenario_config: Dict[str, Any]):
+        """Give every resource its own instance of the configured queue discipline"""
+        name = scenario_config.get('discipline')
+        if name is not None:
+            for resource in resources:
+                resource.discipline = make_discipline(name, scenario_config.get('quantum', 5.0))
+
     def save_individual_scenario_files(self, scenario_id: int, tasks: List[Task], results: Dict[str, Any]):
         """Save individual scenario task files and results"""
-        # Save task definitions for this scenario
-        tasks_file = os.path.join(self.output_dir, f"scenario_{scenario_id}_tasks.json")
-        tasks_data = []
-        for task in tasks:
-            tasks_data.append({
-                'task_id': task.id,
-                'size': task.size,
-                'priority': task.priority,
-                'data_size': task.data_size,
-                'arrival_time': task.arrival_time
-            })
-
-        with open(tasks_file, 'w') as f:
-            json.dump(tasks_data, f, indent=2)
+        # Replications after the first get their own files instead of overwriting
+        replication = results.get('replication', 0)
+        file_id = f"{scenario_id}_rep{replication}" if replication else f"{scenario_id}"
+
+        # Save every task's definition and lifecycle (start, completion, server) column by column
+        extension = {'npz': '.npz', 'parquet': '.parquet', 'npy': ''}[self.result_format]
+        tasks_path = os.path.join(self.output_dir, f"scenario_{file_id}_tasks{extension}")
+        write_task_results(tasks, tasks_path, self.result_format)
 
         # Save individual CSV results for this scenario
-        csv_file = os.path.join(self.output_dir, f"results_scenario_{scenario_id}.csv")
+        csv_file = os.path.join(self.output_dir, f"results_scenario_{file_id}.csv")
         import csv
         with open(csv_file, 'w', newline='') as f:
             writer = csv.writer(f)
@@ -121,17 +218,40 @@ class ScenarioRunner:
             writer.writerow(['Wireless_Speed', results['wireless_speed']])
             writer.writerow(['Battery_Level', results['battery_level']])
             writer.writerow(['Workload_Type', results['workload_type']])
+            for metric, stats in results['latency_percentiles'].items():
+                for name in ('p50', 'p95', 'p99', 'p999'):
+                    writer.writerow([f"{name.upper()}_{metric.title()}", f"{stats[name]:.2f}"])
 
-    def run_scenario(self, scenario_id: int, scenario_config: Dict[str, Any]) -> Dict[str, Any]:
+    def run_scenario(self, scenario_id: int, scenario_config: Dict[str, Any],
+                     seed: int = None, replication: int = 0, save_files: bool = True) -> Dict[str, Any]:
         """
         Run a single scenario and collect metrics
+        A seed makes the generated workload reproducible; optional config keys
+        num_tasks, num_servers, num_cores, fleet, strategy, window (for the
+        lookahead strategy) and policy (weights file of the learned strategy)
+        override the defaults, and
+        network='shared' makes concurrent uploads share link bandwidth (the
+        default 'ideal' gives every upload its full link speed). discipline (with quantum for
+        round_robin) sets the queue discipline of every resource,
+        mode='online' decides tasks as they arrive (latency_budget_ns optional),
+        and batch=True places an offline workload with the vectorized batch
+        scheduler (same placement as the per-task path; used by the
+        intelligent strategy without a shared network, otherwise ignored).
+        trace replays a task trace file instead of a generated workload
+        (trace_columns maps Task fields to its columns, see trace_loader);
+        offline replays hold the trace in memory and refuse one longer than
+        max_offline_tasks (default MAX_OFFLINE_TRACE_TASKS)
         """
         print(f"Running Scenario {scenario_id}: {scenario_config['name']}")
 
         # Setup system based on scenario
         device, servers, wireless_speed = self.setup_servers(
-            scenario_config['wireless_speed']
+            scenario_config['wireless_speed'],
+            scenario_config.get('num_servers', 3),
+            scenario_config.get('fleet'),
+            scenario_config.get('num_cores', 1)
         )
+        self.apply_discipline([device] + servers, scenario_config)
 
         # Set battery level
         if scenario_config['battery'] == "low":
@@ -139,21 +259,67 @@ class ScenarioRunner:
         else:
             device.remaining_battery = 1000  # High battery
 
-        # Create workload
-        tasks = self.create_workload(scenario_config['workload'])
+        # Seeded runs are reproducible, so an unchanged one can come from the cache
+        cache_key = None
+        if self.cache is not None and seed is not None:
+            cache_key = self.cache.key(scenario_config, seed,
+                                       self._server_setup(device, servers, wireless_speed))
+            cached = self.cache.get(cache_key)
+            # The per-task files come from the columns cached with the entry; without them, rerun
+            cached_tasks = self.cache.get_tasks(cache_key) if cached is not None and save_files else None
+            if cached is not None and (cached_tasks is not None or not save_files):
+                cached['scenario_id'] = scenario_id
+                cached['replication'] = replication
+                if save_files:
+                    self.save_individual_scenario_files(scenario_id, cached_tasks, cached)
+                print(f"  Makespan: {cached['makespan']:.2f}, Energy: {cached['total_energy_consumed']:.2f}, "
+                      f"Offloaded: {cached['offload_stats']['percentage_offloaded']:.1f}% (cached)")
+                return cached
+
+        online = scenario_config.get('mode') == 'online'
+
+        # Create workload, or replay a trace (streamed straight into online runs)
+        if 'trace' in scenario_config:
+            tasks = stream_trace(scenario_config['trace'], scenario_config.get('trace_columns'))
+            if not online:
+                # Offline plans see every task before the run starts; rather than read a trace too
+                # big for memory, stop one task past the limit and point at online mode, which streams
+                limit = scenario_config.get('max_offline_tasks', MAX_OFFLINE_TRACE_TASKS)
+                tasks = list(itertools.islice(tasks, limit + 1))
+                if len(tasks) > limit:
+                    raise ValueError(f"Trace {scenario_config['trace']} has more than {limit} tasks, too many "
+                                     f"to replay offline; use mode='online' to stream it, or raise "
+                                     f"max_offline_tasks")
+        else:
+            rng = np.random.RandomState(seed) if seed is not None else None
+            tasks = self.create_workload(scenario_config['workload'],
+                                         scenario_config.get('num_tasks', 20), rng=rng)
 
         # Create and run scheduler
         scheduler = ListScheduler(
             device,
             servers,
-            offload_strategy=scenario_config.get('strategy', 'intelligent')
+            offload_strategy=scenario_config.get('strategy', 'intelligent'),
+            wireless_speed=wireless_speed,
+            network=self.setup_network(scenario_config, wireless_speed),
+            lookahead_window=scenario_config.get('window', 16),
+            policy_file=scenario_config.get('policy', DEFAULT_POLICY),
+            collect_metrics=True
         )
 
-        # Schedule all tasks
-        scheduler.schedule_tasks(tasks)
+        if online:
+            # Decide each task as it arrives against live server state
+            scheduler.run_online(tasks, scenario_config.get('latency_budget_ns'))
+            tasks = [task for task, server in scheduler.assigned_tasks]
+        else:
+            # Schedule all tasks
+            if scenario_config.get('batch'):
+                scheduler.schedule_batch(tasks)
+            else:
+                scheduler.schedule_tasks(tasks)
 
-        # Process all queues to get completion times
-        scheduler.process_all_queues()
+            # Process all queues to get completion times
+            scheduler.process_all_queues()
 
         # Collect results
         makespan = scheduler.get_makespan()
@@ -163,7 +329,7 @@ class ScenarioRunner:
         total_energy_consumed = device.energy_consumed
 
         # Calculate queue statistics
-        queue_stats = self._calculate_queue_stats(device, servers)
+        queue_stats = self._calculate_queue_stats(scheduler)
 
         results = {
             'scenario_id': scenario_id,
@@ -176,99 +342,153 @@ class ScenarioRunner:
             'tasks_processed': len(tasks),
             'wireless_speed': scenario_config['wireless_speed'],
             'battery_level': scenario_config['battery'],
-            'workload_type': scenario_config['workload']
+            'workload_type': scenario_config.get('workload', 'trace'),
+            'seed': seed,
+            'replication': replication,
+            'latency_percentiles': scheduler.metrics.overall_summary(),
+            'priority_stats': scheduler.metrics.priority_summary()
         }
+        if online:
+            results['decision_latency'] = scheduler.decision_latency_stats()
+
+        if cache_key is not None:
+            self.cache.put(cache_key, results, tasks)
 
         # Save individual files for this scenario
-        self.save_individual_scenario_files(scenario_id, tasks, results)
+        if save_files:
+            self.save_individual_scenario_files(scenario_id, tasks, results)
 
+        response = results['latency_percentiles']['response']
         print(f"  Makespan: {makespan:.2f}, Energy: {total_energy_consumed:.2f}, "
               f"Offloaded: {offload_stats['percentage_offloaded']:.1f}%")
+        print(f"  Response time: p50 {response['p50']:.2f}, p99 {response['p99']:.2f}, "
+              f"p99.9 {response['p999']:.2f}")
+        if online:
+            latency = results['decision_latency']
+            print(f"  Decision latency: p50 {latency['p50_ns'] / 1000:.1f} us, "
+                  f"p99 {latency['p99_ns'] / 1000:.1f} us, {latency['over_budget']} over budget")
+
+        return results
+
+    def run_multi_device_scenario(self, scenario_config: Dict[str, Any], num_devices: int = 1000,
+                                  tasks_per_device: int = 20, seed: int = None,
+                                  arrival_rate: float = 0.01) -> Dict[str, Any]:
+        """
+        Run a scenario with many devices sharing the scenario's server pool
+        Each device gets its own battery and Poisson task stream; the servers
+        come from num_servers or fleet as in run_scenario
+        """
+        print(f"Running multi-device scenario: {scenario_config['name']} ({num_devices} devices)")
+
+        device, servers, wireless_speed = self.setup_servers(
+            scenario_config['wireless_speed'],
+            scenario_config.get('num_servers', 3),
+            scenario_config.get('fleet'),
+            scenario_config.get('num_cores', 1)
+        )
+        self.apply_discipline(servers, scenario_config)
+        battery = 100 if scenario_config['battery'] == "low" else 1000
+        fleet = DeviceFleet(num_devices, compute_speed=device.compute_speed, battery_capacity=battery)
+
+        rng = np.random.default_rng(seed)
+        tasks, owners = multi_device_workload(num_devices, tasks_per_device, scenario_config['workload'],
+                                              rate=arrival_rate, rng=rng)
+
+        strategy = IntelligentOffloadStrategy(wireless_speed)
+        network = self.setup_network(scenario_config, wireless_speed,
+                                     access_links=max(1, num_devices // DEVICES_PER_ACCESS_LINK))
+        simulation = MultiDeviceSimulation(fleet, servers, upload_time=strategy.calculate_upload_time,
+                                           network=network)
+        simulation.run(tasks, owners)
+
+        results = simulation.summary()
+        results.update({
+            'scenario_name': scenario_config['name'],
+            'wireless_speed': scenario_config['wireless_speed'],
+            'battery_level': scenario_config['battery'],
+            'workload_type': scenario_config['workload'],
+            'seed': seed
+        })
+
+        print(f"  Makespan: {results['makespan']:.2f}, Energy: {results['total_energy_consumed']:.2f}, "
+              f"Offloaded: {results['percentage_offloaded']:.1f}%, "
+              f"p95 response: {results['p95_response_time']:.2f}")
 
         return results
 
-    def _calculate_queue_stats(self, device, servers):
-        """Calculate queue waiting times and occupancy"""
+    def _server_setup(self, device, servers, wireless_speed):
+        """Describe the simulated hardware for cache keys"""
+        return {
+            'device': [device.compute_speed, device.remaining_battery],
+            'servers': [[s.name, s.tier.value, s.compute_speed, s.network_delay, s.num_cores] for s in servers],
+            'wireless_speed': wireless_speed
+        }
+
+    def _calculate_queue_stats(self, scheduler):
+        """
+        Calculate queue waiting times and occupancy
+        Wait, response and slowdown percentiles and the time-weighted queue
+        length come from the run's streaming RunMetrics, so they cost the same
+        memory whatever the task count
+        """
+        metrics = scheduler.metrics
         queue_stats = {}
 
-        # Device queue
-        if device.completed_tasks:
-            device_wait_times = [task.start_time - task.arrival_time
-                                 for task in device.completed_tasks
-                                 if task.start_time is not None]
-            queue_stats['device'] = {
-                'avg_wait_time': sum(device_wait_times) / len(device_wait_times) if device_wait_times else 0,
-                'max_queue_length': device.get_queue_length(),
-                'tasks_processed': len(device.completed_tasks)
+        for index, resource in enumerate(scheduler.resources):
+            if not resource.completed_tasks:
+                continue
+            summary = metrics.resource_summary(index)
+            name = 'device' if resource is scheduler.device else resource.name
+            queue_stats[name] = {
+                'avg_wait_time': summary['wait']['mean'],
+                'max_queue_length': summary['queue_length']['max'],
+                'avg_queue_length': summary['queue_length']['mean'],  # Time-weighted over the run
+                'p95_queue_length': summary['queue_length']['p95'],
+                'tasks_processed': len(resource.completed_tasks),
+                'tier': resource.tier.value,
+                'wait': summary['wait'],
+                'response': summary['response'],
+                'slowdown': summary['slowdown']
             }
 
-        # Server queues
-        for server in servers:
-            if server.completed_tasks:
-                server_wait_times = [task.start_time - task.arrival_time
-                                     for task in server.completed_tasks
-                                     if task.start_time is not None]
-                queue_stats[server.name] = {
-                    'avg_wait_time': sum(server_wait_times) / len(server_wait_times) if server_wait_times else 0,
-                    'max_queue_length': server.get_queue_length(),
-                    'tasks_processed': len(server.completed_tasks)
-                }
-
         return queue_stats
 
-    def run_all_scenarios(self) -> list[Dict[str, Any]]:
+    def run_all_scenarios(self, jobs: int = 1, repetitions: int = 1,
+                          base_seed: int = None, num_tasks: int = None) -> list[Dict[str, Any]]:
         """
         Run all 6 required test scenarios
+        jobs > 1 runs scenarios and replications in parallel worker processes.
+        Every run gets a seed derived from base_seed (random if None), so any
+        result can be reproduced; results come back in scenario order.
+        num_tasks overrides the per-scenario workload size.
         """
-        scenarios = {
-            1: { #Scenario 1: Baseline - optimal conditions
-                'name': 'High Battery, Fast Wireless, Mixed Workload',
-                'battery': 'high',
-                'wireless_speed': 'fast',
-                'workload': 'mixed'
-            },
-            2: { #Scenario 2: Tests handling of compute-heavy workloads
-                'name': 'High Battery, Fast Wireless, Many Large Tasks',
-                'battery': 'high',
-                'wireless_speed': 'fast',
-                'workload': 'many_large'
-            },
-            3: { #Scenario 3: Tests impact of network delays on mixed workload
-                'name': 'High Battery, Slow Wireless, Mixed Workload',
-                'battery': 'high',
-                'wireless_speed': 'slow',
-                'workload': 'mixed'
-            },
-            4: { #Scenario 4: Tests energy-constrained decisions with good network
-                'name': 'Low Battery, Fast Wireless, Mixed Workload',
-                'battery': 'low',
-                'wireless_speed': 'fast',
-                'workload': 'mixed'
-            },
-            5: { #Scenario 5: Worst-case - both energy and network constrained
-                'name': 'Low Battery, Slow Wireless, Mixed Workload',
-                'battery': 'low',
-                'wireless_speed': 'slow',
-                'workload': 'mixed'
-            },
-            6: { #Scenario 6: Tests many quick tasks with network limitations
-                'name': 'High Battery, Slow Wireless, Many Small Tasks',
-                'battery': 'high',
-                'wireless_speed': 'slow',
-                'workload': 'many_small'
-            }
-        }
-
-        all_results = []
+        if base_seed is None:
+            base_seed = int(np.random.SeedSequence().generate_state(1)[0])
+
+        scenarios = SCENARIOS
+        if num_tasks is not None:
+            scenarios = {sid: dict(config, num_tasks=num_tasks) for sid, config in SCENARIOS.items()}
+
+        run_jobs = [
+            (self.output_dir, self.cache, self.result_format, scenario_id, config,
+             scenario_seed(base_seed, scenario_id, replication), replication)
+            for scenario_id, config in scenarios.items()
+            for replication in range(repetitions)
+        ]
 
         print("=" * 60)
         print("STARTING SCENARIO EXECUTION")
         print("=" * 60)
 
-        for scenario_id, config in scenarios.items():
-            results = self.run_scenario(scenario_id, config)
-            all_results.append(results)
-            print("-" * 40)
+        if jobs > 1:
+            # map() yields in submission order, so results merge in scenario order
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                all_results = list(executor.map(_run_scenario_job, run_jobs))
+        else:
+            all_results = []
+            for job in run_jobs:
+                all_results.append(_run_scenario_job(job))
+                print("-" * 40)
 
         # Save results to file
         self.save_results(all_results)
@@ -288,8 +508,10 @@ class ScenarioRunner:
                 serializable_result['offload_stats'] = dict(serializable_result['offload_stats'])
             serializable_results.append(serializable_result)
 
+        # One compact line per result: the C encoder only runs without indent, and the
+        # nested latency summaries made the indented dump cost more than a small scenario
         with open(output_file, 'w') as f:
-            json.dump(serializable_results, f, indent=2)
+            f.write('[\n' + ',\n'.join(json.dumps(result) for result in serializable_results) + '\n]\n')
 
         print(f"Results saved to: {output_file}")
 
@@ -297,14 +519,27 @@ class ScenarioRunner:
 # For standalone execution
 if __name__ == "__main__":
     # To handle imports differently for standalone execution
+    import argparse
     import sys
     import os
 
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+    parser = argparse.ArgumentParser(description="Run the OS scheduling scenarios")
+    parser.add_argument("--scenario", type=int, choices=sorted(SCENARIOS), help="Run a single scenario")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes to run scenarios in parallel")
+    parser.add_argument("--repetitions", type=int, default=1, help="Seeded replications per scenario")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed for reproducible workloads")
+    args = parser.parse_args()
+
     try:
         runner = ScenarioRunner()
-        results = runner.run_all_scenarios()
+        if args.scenario is not None:
+            seed = scenario_seed(args.seed, args.scenario) if args.seed is not None else None
+            results = [runner.run_scenario(args.scenario, SCENARIOS[args.scenario], seed=seed)]
+        else:
+            results = runner.run_all_scenarios(jobs=args.jobs, repetitions=args.repetitions,
+                                               base_seed=args.seed)
         print(f"\nCompleted {len(results)} scenarios successfully!")
     except Exception as e:
         print(f"Error running scenarios: {e}")
@@ -0,0 +1,156 @@
+import json
+import os
+
+import numpy as np
+from typing import Dict, Any, List
+from scheduling.offload_strategy import OffloadStrategy
+
+# Largest (pairs x tasks) block held in memory at once
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+def work_conserving_makespan(release, work, mask):
+    """
+    Makespan of a single work-conserving server for every row of mask at once
+    release and work are per-task arrays sorted by release time; mask[p, j]
+    says task j runs on the server under grid pair p. The server finishes at
+    max over its tasks of (release + all the work released at or after it).
+    """
+    suffix = np.cumsum((work * mask)[:, ::-1], axis=1)[:, ::-1]
+    finish = np.where(mask, release + suffix, 0.0)
+    return finish.max(axis=1) if finish.shape[1] else np.zeros(len(mask))
+
+
+class ThresholdTuner:
+    """
+    Evaluates StaticOffloadStrategy thresholds over a whole grid in one vectorized pass
+
+    The static rule is a pure function of task fields, so one broadcast
+    comparison gives every (size_threshold, data_threshold) pair's choice
+    between the device and the first edge server. Only the battery couples
+    tasks, and it is threaded through the workload once for all pairs. Both
+    resources are work conserving, so makespan follows in closed form from
+    release times and suffix work. This matches the event engine for
+    single-core resources and contention-free uploads.
+    """
+
+    def __init__(self, device, servers, wireless_speed=100, wired_speed=1000):
+        if not servers:
+            raise ValueError("ThresholdTuner needs at least one server to offload to")
+        self.device = device
+        self.edge_server = OffloadStrategy.first_edge_server(servers)
+        self.links = OffloadStrategy(wireless_speed, wired_speed)
+
+    def energy_cost(self, size):
+        """Local energy cost of every task, as Device.energy_cost computes it"""
+        return self.device.BASE_ENERGY_COST + size * self.device.COMPUTE_ENERGY_COST
+
+    def evaluate(self, tasks, size_thresholds, data_thresholds) -> Dict[str, np.ndarray]:
+        """
+        Makespan, energy and offload share for every pair in the threshold grid
+        Returns flat arrays with one entry per (size_threshold, data_threshold) pair
+        """
+        size_grid, data_grid = np.meshgrid(np.asarray(size_thresholds, dtype=float),
+                                           np.asarray(data_thresholds, dtype=float), indexing='ij')
+        size_grid, data_grid = size_grid.ravel(), data_grid.ravel()
+
+        tasks = list(tasks)
+        size = np.array([t.size for t in tasks], dtype=float)
+        data_size = np.array([t.data_size for t in tasks], dtype=float)
+        arrival = np.array([t.arrival_time for t in tasks], dtype=float)
+
+        makespan = np.empty(len(size_grid))
+        energy = np.empty(len(size_grid))
+        offloaded = np.empty(len(size_grid))
+        block = max(1, MAX_BLOCK_ELEMENTS // max(len(tasks), 1))
+        for start in range(0, len(size_grid), block):
+            stop = start + block
+            local = self._local_mask(size, data_size, size_grid[start:stop], data_grid[start:stop])
+            energy[start:stop] = (local * self.energy_cost(size)).sum(axis=1)
+            offloaded[start:stop] = (~local).sum(axis=1)
+            makespan[start:stop] = self._makespan(size, data_size, arrival, local)
+
+        return {
+            'size_threshold': size_grid,
+            'data_threshold': data_grid,
+            'makespan': makespan,
+            'energy': energy,
+            'percentage_offloaded': offloaded / max(len(tasks), 1) * 100
+        }
+
+    def _local_mask(self, size, data_size, size_thresholds, data_thresholds):
+        """(pairs, tasks) mask of tasks the static rule keeps on the device"""
+        wants_local = ~((size > size_thresholds[:, None]) | (data_size > data_thresholds[:, None]))
+
+        # Battery is the only state shared between tasks: thread it through once for every pair
+        cost = self.energy_cost(size)
+        battery = np.full(len(size_thresholds), float(self.device.remaining_battery))
+        local = np.zeros_like(wants_local)
+        for j in range(len(size)):
+            runs_here = wants_local[:, j] & (battery >= cost[j])
+            battery -= cost[j] * runs_here
+            local[:, j] = runs_here
+        return local
+
+    def _makespan(self, size, data_size, arrival, local):
+        device, edge = self.device, self.edge_server
+        order = np.argsort(arrival, kind='stable')
+        makespan = work_conserving_makespan(arrival[order], size[order] / device.compute_speed,
+                                            local[:, order])
+
+        upload = np.zeros_like(data_size)
+        for speed in self.links.link_speeds(edge):
+            upload += data_size / speed
+        release = arrival + edge.network_delay + upload
+        order = np.argsort(release, kind='stable')
+        return np.maximum(makespan, work_conserving_makespan(
+            release[order], size[order] / edge.compute_speed, ~local[:, order]))
+
+    @staticmethod
+    def pareto_front(results: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Pairs not beaten on both makespan and energy, in increasing makespan"""
+        order = np.lexsort((results['energy'], results['makespan']))
+        front = []
+        best_energy = np.inf
+        for index in order.tolist():
+            if results['energy'][index] < best_energy:
+                best_energy = results['energy'][index]
+                front.append({name: float(values[index]) for name, values in results.items()})
+        return front
+
+
+# For standalone execution
+if __name__ == "__main__":
+    import argparse
+    import time
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+
+    parser = argparse.ArgumentParser(description="Tune StaticOffloadStrategy thresholds on a scenario workload")
+    parser.add_argument("--scenario", type=int, default=1, choices=sorted(SCENARIOS), help="Scenario to tune on")
+    parser.add_argument("--num-tasks", type=int, default=1000, help="Workload size")
+    parser.add_argument("--seed", type=int, default=0, help="Workload seed")
+    parser.add_argument("--max-size", type=int, default=300, help="Largest size threshold in the grid")
+    parser.add_argument("--max-data", type=int, default=200, help="Largest data threshold in the grid")
+    parser.add_argument("--output", default="data/output/threshold_front.json", help="Where the Pareto front is written")
+    args = parser.parse_args()
+
+    config = SCENARIOS[args.scenario]
+    runner = ScenarioRunner(os.path.dirname(args.output) or ".")
+    device, servers, wireless_speed = runner.setup_servers(config['wireless_speed'])
+    device.remaining_battery = 100 if config['battery'] == "low" else 1000
+    tasks = runner.create_workload(config['workload'], args.num_tasks, rng=np.random.RandomState(args.seed))
+
+    started = time.perf_counter()
+    tuner = ThresholdTuner(device, servers, wireless_speed)
+    results = tuner.evaluate(tasks, np.arange(0, args.max_size + 1), np.arange(0, args.max_data + 1))
+    front = tuner.pareto_front(results)
+    print(f"Evaluated {len(results['makespan'])} threshold pairs on {len(tasks)} tasks "
+          f"in {time.perf_counter() - started:.2f}s")
+
+    for point in front:
+        print(f"  size>{point['size_threshold']:.0f} or data>{point['data_threshold']:.0f}: "
+              f"makespan {point['makespan']:.2f}, energy {point['energy']:.2f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(front, f, indent=2)
+    print(f"Pareto front saved to: {args.output}")
@@ -0,0 +1,171 @@
+import json
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator
+from models.task import Task
+from models.task_table import TaskTable
+from experiments.result_store import read_task_results
+
+# Task field -> trace column, matching the task JSON files in data/input
+DEFAULT_COLUMNS = {
+    'id': 'task_id',
+    'size': 'size',
+    'priority': 'priority',
+    'data_size': 'data_size',
+    'arrival_time': 'arrival_time'
+}
+
+# Task defaults for optional fields a trace leaves out of some rows
+FIELD_DEFAULTS = {'priority': 1, 'data_size': 0, 'arrival_time': 0}
+
+# Bytes of a JSONL trace parsed per step; rows are then handed out chunk_size at a time
+JSONL_BLOCK_BYTES = 16 * 1024 * 1024
+
+
+def trace_format(path):
+    """Trace format from the file extension: jsonl, json, csv, parquet, or npz/npy results"""
+    if os.path.isdir(path):
+        return 'npy'  # A column directory written by result_store
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    formats = {'jsonl': 'jsonl', 'ndjson': 'jsonl', 'json': 'json', 'csv': 'csv', 'parquet': 'parquet',
+               'npz': 'npz'}
+    if extension not in formats:
+        raise ValueError(f"Unknown trace format '{extension}'. Available: {sorted(set(formats.values()))}")
+    return formats[extension]
+
+
+def stream_trace_chunks(path, columns: Dict[str, str] = None, chunk_size=65536,
+                        trace_type=None) -> Iterator[TaskTable]:
+    """
+    Lazily read a task trace as TaskTable chunks of at most chunk_size rows
+
+    columns maps Task fields (id, size, priority, data_size, arrival_time) to
+    trace column names; only size is required. Missing fields default as in
+    Task (ids count rows from 0), also in rows that leave an optional field
+    out; a row without a size, or without an id in a trace that has ids, is
+    an error. JSONL is read through a memory map, CSV with
+    pandas in chunks and Parquet in record batches (needs pyarrow), so memory
+    stays at one chunk whatever the trace size. A .json file (a list of task
+    objects) is loaded whole, and per-task result files from result_store
+    (.npz or an npy directory) replay the workload of an earlier run.
+    """
+    columns = dict(DEFAULT_COLUMNS, **(columns or {}))
+    trace_type = trace_type or trace_format(path)
+    readers = {'jsonl': _jsonl_frames, 'json': _json_frames, 'csv': _csv_frames, 'parquet': _parquet_frames,
+               'npz': _result_frames, 'npy': _result_frames}
+    if trace_type not in readers:
+        raise ValueError(f"Unknown trace format '{trace_type}'. Available: {sorted(readers)}")
+
+    next_id = 0
+    for frame in readers[trace_type](path, list(columns.values()), chunk_size):
+        if columns['size'] not in frame:
+            raise ValueError(f"Trace {path} has no '{columns['size']}' column for task sizes")
+        count = len(frame)
+        fields = {}
+        for field, column in columns.items():
+            if column not in frame:
+                fields[field] = None
+                continue
+            values = frame[column]
+            if values.isna().any():
+                if field not in FIELD_DEFAULTS:
+                    raise ValueError(f"Trace {path} has {int(values.isna().sum())} rows without "
+                                     f"'{column}' (rows {next_id} to {next_id + count - 1})")
+                values = values.fillna(FIELD_DEFAULTS[field])
+            fields[field] = values.to_numpy()
+        yield TaskTable.from_arrays(
+            fields['size'], data_size=fields['data_size'], priority=fields['priority'],
+            arrival_time=fields['arrival_time'],
+            ids=fields['id'] if fields['id'] is not None else np.arange(next_id, next_id + count)
+        )
+        next_id += count
+
+
+def stream_trace(path, columns: Dict[str, str] = None, chunk_size=65536, trace_type=None) -> Iterator[Task]:
+    """
+    Lazily yield Task objects from a trace, one chunk in memory at a time
+    Feed it to ListScheduler.run_online to replay a trace without materializing it
+    """
+    for chunk in stream_trace_chunks(path, columns, chunk_size, trace_type):
+        rows = zip(
+            chunk.column('id').tolist(), chunk.column('size').tolist(),
+            chunk.column('priority').tolist(), chunk.column('data_size').tolist(),
+            chunk.column('arrival_time').tolist()
+        )
+        for task_id, size, priority, data_size, arrival_time in rows:
+            yield Task(task_id, size, priority, data_size, arrival_time)
+
+
+def _jsonl_frames(path, names, chunk_size):
+    """DataFrames of up to chunk_size records from a memory-mapped JSON Lines file"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start, end = 0, len(mapped)
+            while start < end:
+                stop = min(start + JSONL_BLOCK_BYTES, end)
+                if stop < end:
+                    # Cut after the last complete line of the block; a longer line extends it
+                    newline = mapped.rfind(b'\n', start, stop)
+                    if newline < 0:
+                        newline = mapped.find(b'\n', stop)
+                    stop = end if newline < 0 else newline + 1
+
+                lines = [line for line in mapped[start:stop].split(b'\n') if line.strip()]
+                for first in range(0, len(lines), chunk_size):
+                    # One json.loads per chunk instead of one per line
+                    records = json.loads(b'[' + b','.join(lines[first:first + chunk_size]) + b']')
+                    yield _records_frame(records, names)
+                start = stop
+
+
+def _json_frames(path, names, chunk_size):
+    with open(path) as f:
+        records = json.load(f)
+    for first in range(0, len(records), chunk_size):
+        yield _records_frame(records[first:first + chunk_size], names)
+
+
+def _records_frame(records, names):
+    """
+    Columns of a list of dicts: every trace column any record has
+    Records without one of them get NaN there (filled or rejected by stream_trace_chunks)
+    """
+    keys = set().union(*records)
+    present = [name for name in names if name in keys]
+    return pd.DataFrame({name: [record.get(name) for record in records] for name in present})
+
+
+def _csv_frames(path, names, chunk_size):
+    wanted = set(names)
+    yield from pd.read_csv(path, chunksize=chunk_size, usecols=lambda column: column in wanted,
+                           memory_map=True)
+
+
+def _result_frames(path, names, chunk_size):
+    """
+    Per-task result files, their stored columns named like trace columns (task_id for id)
+    Only the columns the mapping names are read, so it can pick any stored one,
+    e.g. completion_time as the arrival time of a follow-up run
+    """
+    table = read_task_results(path)
+    stored = {DEFAULT_COLUMNS.get(field, field): field for field in TaskTable.COLUMNS}  # trace name -> field
+    present = [name for name in dict.fromkeys(names) if name in stored]
+    for first in range(0, len(table), chunk_size):
+        yield pd.DataFrame({name: table.column(stored[name])[first:first + chunk_size] for name in present})
+
+
+def _parquet_frames(path, names, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet traces needs pyarrow (pip install pyarrow)") from None
+
+    trace = pq.ParquetFile(path, memory_map=True)
+    present = [name for name in names if name in trace.schema_arrow.names]
+    for batch in trace.iter_batches(batch_size=chunk_size, columns=present):
+        yield batch.to_pandas()
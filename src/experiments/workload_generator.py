@@ -0,0 +1,180 @@
+import math
+
+import numpy as np
+from typing import Iterator
+from models.task import Task
+from models.task_table import TaskTable
+
+# (size range, data size range) per workload type, matching ScenarioRunner.create_workload.
+# Mixed workloads alternate between the listed classes by task index.
+WORKLOAD_CLASSES = {
+    'many_small': [((10, 50), (1, 20))],
+    'many_large': [((100, 300), (50, 200))],
+    'mixed': [((10, 50), (1, 20)), ((80, 150), (30, 100))]
+}
+
+
+class PoissonArrivals:
+    """
+    Homogeneous Poisson arrival process
+    """
+
+    def __init__(self, rate=1.0):
+        self.rate = rate  # Mean arrivals per time unit
+        self.time = 0.0
+
+    def next_arrivals(self, rng, count):
+        """Return the next count absolute arrival times"""
+        times = self.time + np.cumsum(rng.exponential(1.0 / self.rate, count))
+        self.time = float(times[-1])
+        return times
+
+
+class MMPPArrivals:
+    """
+    Two-state Markov-modulated Poisson process for bursty traffic
+    Alternates between a calm and a burst state with exponential sojourn times
+    """
+
+    def __init__(self, calm_rate=0.5, burst_rate=5.0, mean_calm=100.0, mean_burst=10.0):
+        self.rates = (calm_rate, burst_rate)
+        self.mean_sojourn = (mean_calm, mean_burst)
+        self.state = 0
+        self.time = 0.0
+        self.state_end = None
+
+    def next_arrivals(self, rng, count):
+        """Return the next count absolute arrival times"""
+        times = []
+        needed = count
+        while needed > 0:
+            if self.state_end is None:
+                self.state_end = self.time + rng.exponential(self.mean_sojourn[self.state])
+
+            # Arrivals in the rest of this sojourn are uniform given their Poisson count
+            remaining = self.state_end - self.time
+            arrivals = rng.poisson(self.rates[self.state] * remaining)
+            if arrivals >= needed:
+                # Only part of the sojourn is needed; order statistics of the uniforms
+                # give the first `needed` arrival times exactly
+                batch = np.sort(rng.uniform(self.time, self.state_end, arrivals))[:needed]
+                self.time = float(batch[-1])
+                times.append(batch)
+                # The rest of the sojourn is redrawn on the next call (memoryless)
+                break
+
+            batch = np.sort(rng.uniform(self.time, self.state_end, arrivals))
+            times.append(batch)
+            needed -= arrivals
+            self.time = self.state_end
+            self.state = 1 - self.state
+            self.state_end = None
+
+        return np.concatenate(times) if times else np.empty(0)
+
+
+class DiurnalArrivals:
+    """
+    Non-homogeneous Poisson process with a sinusoidal daily rate
+    rate(t) = base_rate * (1 + amplitude * sin(2 * pi * t / period)), sampled by thinning
+    """
+
+    def __init__(self, base_rate=1.0, amplitude=0.8, period=1440.0):
+        if not 0 <= amplitude <= 1:
+            raise ValueError(f"amplitude must be in [0, 1], got {amplitude}")
+        self.base_rate = base_rate
+        self.amplitude = amplitude
+        self.period = period
+        self.time = 0.0
+
+    def rate(self, t):
+        return self.base_rate * (1 + self.amplitude * np.sin(2 * math.pi * t / self.period))
+
+    def next_arrivals(self, rng, count):
+        """Return the next count absolute arrival times"""
+        peak_rate = self.base_rate * (1 + self.amplitude)
+        times = []
+        needed = count
+        while needed > 0:
+            # Oversample candidates at the peak rate, keep each with probability rate/peak
+            candidates = self.time + np.cumsum(rng.exponential(1.0 / peak_rate, needed * 2))
+            keep = rng.random(len(candidates)) * peak_rate < self.rate(candidates)
+            accepted = candidates[keep][:needed]
+            times.append(accepted)
+            needed -= len(accepted)
+            self.time = float(accepted[-1]) if needed == 0 else float(candidates[-1])
+        return np.concatenate(times)
+
+
+def stream_task_chunks(scenario_type="mixed", arrivals=None, chunk_size=4096,
+                       rng=None, limit=None) -> Iterator[TaskTable]:
+    """
+    Lazily generate a workload as TaskTable chunks
+    Random fields are drawn in vectorized chunks; the stream is unbounded
+    unless limit is given, and memory stays at one chunk
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    arrivals = arrivals if arrivals is not None else PoissonArrivals()
+    classes = WORKLOAD_CLASSES.get(scenario_type, WORKLOAD_CLASSES['mixed'])
+
+    next_id = 0
+    while limit is None or next_id < limit:
+        count = chunk_size if limit is None else min(chunk_size, limit - next_id)
+        ids = np.arange(next_id, next_id + count)
+
+        size = np.empty(count, dtype=np.int64)
+        data_size = np.empty(count, dtype=np.int64)
+        task_class = ids % len(classes)
+        for index, ((size_low, size_high), (data_low, data_high)) in enumerate(classes):
+            members = task_class == index
+            members_count = int(members.sum())
+            size[members] = rng.integers(size_low, size_high, members_count)
+            data_size[members] = rng.integers(data_low, data_high, members_count)
+        priority = rng.integers(1, 4, count)
+
+        yield TaskTable.from_arrays(size, data_size=data_size, priority=priority,
+                                    arrival_time=arrivals.next_arrivals(rng, count), ids=ids)
+        next_id += count
+
+
+def stream_workload(scenario_type="mixed", arrivals=None, chunk_size=4096,
+                    rng=None, limit=None) -> Iterator[Task]:
+    """
+    Lazily yield Task objects for code that consumes tasks one at a time
+    """
+    for chunk in stream_task_chunks(scenario_type, arrivals, chunk_size, rng, limit):
+        columns = zip(
+            chunk.column('id').tolist(), chunk.column('size').tolist(),
+            chunk.column('priority').tolist(), chunk.column('data_size').tolist(),
+            chunk.column('arrival_time').tolist()
+        )
+        for task_id, size, priority, data_size, arrival_time in columns:
+            yield Task(task_id, int(size), priority, int(data_size), arrival_time)
+
+
+def multi_device_workload(num_devices, tasks_per_device, scenario_type="mixed", rate=0.01, rng=None):
+    """
+    Independent Poisson task streams for many devices, merged in arrival order
+    Returns (TaskTable, owners) where owners[row] is the device issuing that task
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    classes = WORKLOAD_CLASSES.get(scenario_type, WORKLOAD_CLASSES['mixed'])
+    count = num_devices * tasks_per_device
+
+    arrivals = np.cumsum(rng.exponential(1.0 / rate, (num_devices, tasks_per_device)), axis=1)
+    owners = np.repeat(np.arange(num_devices), tasks_per_device)
+    task_class = np.tile(np.arange(tasks_per_device) % len(classes), num_devices)
+
+    size = np.empty(count, dtype=np.int64)
+    data_size = np.empty(count, dtype=np.int64)
+    for index, ((size_low, size_high), (data_low, data_high)) in enumerate(classes):
+        members = task_class == index
+        members_count = int(members.sum())
+        size[members] = rng.integers(size_low, size_high, members_count)
+        data_size[members] = rng.integers(data_low, data_high, members_count)
+    priority = rng.integers(1, 4, count)
+
+    order = np.argsort(arrivals.ravel(), kind='stable')
+    table = TaskTable.from_arrays(size[order], data_size=data_size[order], priority=priority[order],
+                                  arrival_time=arrivals.ravel()[order], ids=np.arange(count))
+    return table, owners[order]
@@ -3,6 +3,7 @@
 Main entry point for OS Scheduling Simulator
 """
 
+import argparse
 import os
 import sys
 
@@ -10,11 +11,41 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from experiments.scenario_runner import ScenarioRunner
+from experiments.result_cache import ResultCache
+from tracing.event_log import configure_logging, event_log
 from experiments.results_plotter import ResultsPlotter
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="OS Scheduling Simulator")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes to run scenarios and render charts in parallel (default: 1)")
+    parser.add_argument("--repetitions", type=int, default=1,
+                        help="Seeded replications per scenario (default: 1)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Base seed for reproducible workloads (default: 0)")
+    parser.add_argument("--cache-dir", default="data/cache",
+                        help="Where unchanged scenario results are cached (default: data/cache)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompute every scenario instead of reusing cached results")
+    parser.add_argument("--preview", action="store_true",
+                        help="Render charts at low resolution for a quick look")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Simulator log level, e.g. DEBUG for per-task energy output (default: WARNING)")
+    parser.add_argument("--trace", default=None,
+                        help="Record every scheduling decision and energy debit to this file "
+                             "(.jsonl for text, otherwise packed binary; in-process runs only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function to run the complete simulation"""
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+    if args.trace:
+        event_log.open(args.trace)
+
     print("=" * 60)
     print("OS SCHEDULING SIMULATOR - COMP3320 FINAL PROJECT")
     print("=" * 60)
@@ -22,13 +53,15 @@ def main():
     try:
         # Step 1: Run all scenarios
         print("\n1. RUNNING SCENARIOS...")
-        runner = ScenarioRunner()
-        results = runner.run_all_scenarios()
+        cache = None if args.no_cache else ResultCache(args.cache_dir)
+        runner = ScenarioRunner(cache=cache)
+        results = runner.run_all_scenarios(jobs=args.jobs, repetitions=args.repetitions,
+                                           base_seed=args.seed)
 
         # Step 2: Generate visualizations
         print("\n2. GENERATING VISUALIZATIONS...")
-        plotter = ResultsPlotter()
-        plotter.generate_all_plots()
+        plotter = ResultsPlotter(preview=args.preview)
+        plotter.generate_all_plots(jobs=args.jobs)
 
         # Step 3: Display summary
         print("\n3. SIMULATION COMPLETE!")
@@ -50,6 +83,8 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        event_log.close()
 
     return 0
 
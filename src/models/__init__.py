@@ -4,7 +4,10 @@ Contains core data structures: Task, Server, Device
 """
 
 from .task import Task
-from .server import Server
+from .server import Server, ServerTier
 from .device import Device
+from .device_fleet import DeviceFleet
+from .task_table import TaskTable, TaskView
+from .fleet import load_fleet
 
-__all__ = ['Task', 'Server', 'Device']
+__all__ = ['Task', 'Server', 'ServerTier', 'Device', 'DeviceFleet', 'TaskTable', 'TaskView', 'load_fleet']
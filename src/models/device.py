@@ -1,39 +1,49 @@
-from models.server import Server  # This should work now with the package structure
+import logging
+
+from models.server import Server, ServerTier  # This should work now with the package structure
+from tracing.event_log import get_logger, event_log
+
+logger = get_logger(__name__)
 
 class Device(Server):
     """
     Local device with battery constraints
     """
+
+    BASE_ENERGY_COST = 5  # Base energy cost for any computation
+    COMPUTE_ENERGY_COST = 0.3  # Energy per compute unit
     
     def __init__(self, name="LocalDevice", compute_speed=1.0, battery_capacity=1000):
-        super().__init__(name, compute_speed, network_delay=0)
+        super().__init__(name, compute_speed, network_delay=0, tier=ServerTier.LOCAL)
         self.battery_capacity = battery_capacity
         self.remaining_battery = battery_capacity
         self.energy_consumed = 0
 
     def consume_energy(self, task):
         """Calculate and consume energy for executing a task locally"""
-        # More realistic energy model: base cost + compute cost
-        base_energy_cost = 5  # Base energy cost for any computation
-        compute_energy_cost = task.size * 0.3  # Energy per compute unit
-
-        energy_cost = base_energy_cost + compute_energy_cost
-
-        print(f"Debug: Task {task.id} energy cost: {energy_cost}, battery: {self.remaining_battery}")
+        energy_cost = self.energy_cost(task)
 
         if energy_cost > self.remaining_battery:
-            print(f"Debug: Not enough energy for task {task.id}")
+            logger.debug("Not enough energy for task %s: cost %s, battery %s",
+                         task.id, energy_cost, self.remaining_battery)
             return False  # Not enough energy
 
         self.remaining_battery -= energy_cost
         self.energy_consumed += energy_cost
-        print(f"Debug: Energy consumed: {energy_cost}, remaining: {self.remaining_battery}")
+        if event_log.enabled:
+            event_log.record('energy', task.id, self.name, energy_cost, self.remaining_battery)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Task %s energy consumed: %s, remaining: %s",
+                         task.id, energy_cost, self.remaining_battery)
         return True
 
+    def energy_cost(self, task):
+        """Energy needed to run a task locally: base cost + compute cost"""
+        return self.BASE_ENERGY_COST + task.size * self.COMPUTE_ENERGY_COST
+
     def can_accept_task(self, task):
         """Check if device has enough battery to execute the task"""
-        energy_required = 5 + (task.size * 0.3)  # Match the consume_energy calculation
-        return self.remaining_battery >= energy_required
+        return self.remaining_battery >= self.energy_cost(task)
     
     def estimate_finish_time(self, task, current_time=0):
         """Override to include energy check"""
@@ -0,0 +1,61 @@
+import numpy as np
+
+from models.device import Device
+
+
+class DeviceFleet:
+    """
+    Structure-of-arrays state for many mobile devices
+    One NumPy column per Device attribute instead of one Device object per
+    device. Each device runs its local tasks first-come first-served, so its
+    local queue is summarized by the time it next becomes free.
+    """
+
+    BASE_ENERGY_COST = Device.BASE_ENERGY_COST
+    COMPUTE_ENERGY_COST = Device.COMPUTE_ENERGY_COST
+
+    def __init__(self, count, compute_speed=1.0, battery_capacity=1000):
+        self.count = count
+        self.compute_speed = np.broadcast_to(np.asarray(compute_speed, dtype=np.float64), (count,)).copy()
+        self.battery_capacity = np.broadcast_to(np.asarray(battery_capacity, dtype=np.float64), (count,)).copy()
+        self.remaining_battery = self.battery_capacity.copy()
+        self.energy_consumed = np.zeros(count)
+        self.busy_until = np.zeros(count)  # When each device finishes its local backlog
+
+    def energy_cost(self, size):
+        """Energy needed to run tasks of the given size locally (scalar or array)"""
+        return self.BASE_ENERGY_COST + size * self.COMPUTE_ENERGY_COST
+
+    def can_accept(self, device, size):
+        """Check if a device has enough battery to run a task locally"""
+        return self.remaining_battery[device] >= self.energy_cost(size)
+
+    def estimate_finish_time(self, device, size, current_time=0):
+        """Local finish time for a task arriving now, or inf if the battery cannot cover it"""
+        if not self.can_accept(device, size):
+            return float('inf')
+        return max(current_time, self.busy_until[device]) + size / self.compute_speed[device]
+
+    def run_local(self, device, size, current_time):
+        """
+        Charge the battery and append a task to the device's local backlog
+        Returns (start time, completion time)
+        """
+        cost = self.energy_cost(size)
+        self.remaining_battery[device] -= cost
+        self.energy_consumed[device] += cost
+
+        start = max(current_time, self.busy_until[device])
+        finish = start + size / self.compute_speed[device]
+        self.busy_until[device] = finish
+        return start, finish
+
+    def get_battery_status(self):
+        """Remaining battery of every device as a percentage"""
+        return self.remaining_battery / self.battery_capacity * 100
+
+    def __len__(self):
+        return self.count
+
+    def __str__(self):
+        return f"DeviceFleet(devices={self.count}, battery={self.remaining_battery.sum():.0f}/{self.battery_capacity.sum():.0f})"
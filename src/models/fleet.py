@@ -0,0 +1,30 @@
+import json
+
+from models.server import Server
+
+
+def load_fleet(path):
+    """
+    Build a list of servers from a JSON fleet description
+
+    The file holds a list of server specs (or {"servers": [...]}). Each spec has
+    name, tier, compute_speed, network_delay and num_cores; an optional count
+    expands one spec into that many identical servers named "<name>-<i>".
+    """
+    with open(path) as f:
+        data = json.load(f)
+    specs = data['servers'] if isinstance(data, dict) else data
+
+    servers = []
+    for spec in specs:
+        count = spec.get('count', 1)
+        for i in range(count):
+            name = spec['name'] if count == 1 else f"{spec['name']}-{i + 1}"
+            servers.append(Server(
+                name,
+                compute_speed=spec['compute_speed'],
+                network_delay=spec.get('network_delay', 0),
+                tier=spec.get('tier'),
+                num_cores=spec.get('num_cores', 1)
+            ))
+    return servers
@@ -1,25 +1,101 @@
 import heapq
+from enum import Enum
 from typing import List
 
+
+class ServerTier(Enum):
+    """
+    Where a resource sits in the network, which decides the links its data crosses
+    """
+    LOCAL = "local"
+    EDGE = "edge"
+    CLOUD = "cloud"
+
+    @classmethod
+    def from_name(cls, name):
+        """Infer a tier from a legacy server name (anything not local/cloud is edge)"""
+        name = name.lower()
+        if "cloud" in name:
+            return cls.CLOUD
+        if "local" in name:
+            return cls.LOCAL
+        return cls.EDGE
+
+
 class Server:
     """
     Base class for all computational resources (Local, Edge, Cloud)
     """
     
-    def __init__(self, name, compute_speed, network_delay=0):
+    def __init__(self, name, compute_speed, network_delay=0, tier=None, server_id=None, num_cores=1):
+        if num_cores < 1:
+            raise ValueError(f"num_cores must be at least 1, got {num_cores}")
         self.name = name
-        self.compute_speed = compute_speed  # Units per time unit
+        self.compute_speed = compute_speed  # Units per time unit, per core
+        self.num_cores = num_cores  # Parallel execution units, each running one task at compute_speed
         self.network_delay = network_delay  # Fixed delay for this server
+        self.tier = ServerTier(tier) if tier is not None else ServerTier.from_name(name)
+        self.server_id = server_id  # Integer id, assigned by the scheduler if not given
         self.queue = []  # Priority queue (min-heap)
         self.current_time = 0  # Simulated time for this server
         self.completed_tasks = []
+
+        # Running aggregates over the queue so load queries are O(1)
+        self.queued_size = 0  # Total computational size of queued tasks
+        self.priority_load = {}  # priority -> total queued size at that priority
+        self.load_listeners = []  # Callables notified with this server whenever its load changes
+        self.backlog_size = 0  # Work committed here but outside the queue (uploading or running)
+
+        # Queue discipline used by the event engine (see simulation.disciplines);
+        # None is non-preemptive priority
+        self.discipline = None
+        self.remaining_work = {}  # task -> unfinished work of tasks preempted part way
     
     def add_to_queue(self, task):
         """Add a task to the priority queue"""
-        # Using priority as the primary key, task id as secondary for tie-breaking
-        heapq.heappush(self.queue, (task.priority, task.id, task))
+        # The discipline's key (priority by default) orders the heap, task id breaks ties
+        remaining = self.remaining_work.get(task, task.size) if self.remaining_work else task.size
+        key = task.priority if self.discipline is None else self.discipline.queue_key(task, remaining)
+        heapq.heappush(self.queue, (key, task.id, task))
         task.assigned_server = self.name
+
+        self.queued_size += remaining
+        self.priority_load[task.priority] = self.priority_load.get(task.priority, 0) + remaining
+        for listener in self.load_listeners:
+            listener(self)
     
+    def add_tasks(self, tasks):
+        """
+        Add many tasks to the queue at once
+        Same queue and load aggregates as add_to_queue for each task, but the
+        heap is rebuilt once and load listeners hear about the change once
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return
+        if self.remaining_work:
+            works = [self.remaining_work.get(task, task.size) for task in tasks]
+        else:
+            works = [task.size for task in tasks]
+        discipline = self.discipline
+        if discipline is None:
+            entries = [(task.priority, task.id, task) for task in tasks]
+        else:
+            entries = [(discipline.queue_key(task, work), task.id, task) for task, work in zip(tasks, works)]
+
+        name = self.name
+        priority_load = self.priority_load
+        for task, work in zip(tasks, works):
+            task.assigned_server = name
+            priority_load[task.priority] = priority_load.get(task.priority, 0) + work
+        # Summed in queue order, so the total matches adding the tasks one by one
+        self.queued_size = sum(works, self.queued_size)
+
+        self.queue.extend(entries)
+        heapq.heapify(self.queue)
+        for listener in self.load_listeners:
+            listener(self)
+
     def get_next_task(self):
         """Get the next task from the queue without removing it"""
         if self.queue:
@@ -29,9 +105,37 @@ class Server:
     def pop_next_task(self):
         """Remove and return the next task from the queue"""
         if self.queue:
-            priority, task_id, task = heapq.heappop(self.queue)
+            key, task_id, task = heapq.heappop(self.queue)
+            self._remove_from_load(task)
+            for listener in self.load_listeners:
+                listener(self)
             return task
         return None
+
+    def drain_queue(self):
+        """Remove and return every queued task in queue order, clearing the load aggregates at once"""
+        entries = sorted(self.queue)  # Keys are unique (task id breaks ties), so this is pop order
+        self.queue = []
+        self.queued_size = 0
+        self.priority_load.clear()
+        for listener in self.load_listeners:
+            listener(self)
+        return [task for key, task_id, task in entries]
+
+    def _remove_from_load(self, task):
+        """Take a dequeued task out of the running aggregates"""
+        if self.queue:
+            work = self.remaining_work.get(task, task.size) if self.remaining_work else task.size
+            self.queued_size -= work
+            remaining = self.priority_load[task.priority] - work
+            if remaining:
+                self.priority_load[task.priority] = remaining
+            else:
+                del self.priority_load[task.priority]
+        else:
+            # Reset exactly once the queue drains so float error cannot accumulate
+            self.queued_size = 0
+            self.priority_load.clear()
     
     def estimate_finish_time(self, task, current_time=0):
         """
@@ -41,8 +145,8 @@ class Server:
         if not self.can_accept_task(task):
             return float('inf')
             
-        # Calculate queue delay (sum of execution times for all tasks in queue)
-        queue_delay = sum(t.size / self.compute_speed for p, tid, t in self.queue)
+        # Calculate queue delay (queue_delay() inlined: this runs once per server per decision)
+        queue_delay = (self.queued_size + self.backlog_size) / (self.compute_speed * self.num_cores)
         
         # Execution time for the new task
         execution_time = task.size / self.compute_speed
@@ -52,23 +156,52 @@ class Server:
         
         return total_time
     
+    def queue_delay(self):
+        """Time needed to drain the work already queued or committed, with every core working on it"""
+        return (self.queued_size + self.backlog_size) / (self.compute_speed * self.num_cores)
+
+    def add_backlog(self, work):
+        """Count work that is on its way to (or running on) this server in load estimates"""
+        self.backlog_size += work
+        for listener in self.load_listeners:
+            listener(self)
+
     def can_accept_task(self, task):
         """Check if this server can accept the given task"""
         return True  # Base implementation - override in subclasses
     
     def process_tasks(self):
-        """Process tasks and update completion times (simplified version)"""
-        # This will be enhanced later with proper discrete event simulation
+        """
+        Process tasks back-to-back and update completion times (simplified version)
+        Each task goes to the earliest-free core. Ignores arrival and upload
+        times; see simulation.engine for the event-driven path
+        """
         temp_queue = self.queue.copy()
         self.queue = []
-        current_time = self.current_time
-        
+        self.queued_size = 0
+        self.priority_load.clear()
+        for listener in self.load_listeners:
+            listener(self)
+
+        if self.num_cores == 1:
+            # One core runs the queue back to back, no availability heap needed
+            current_time = self.current_time
+            while temp_queue:
+                priority, task_id, task = heapq.heappop(temp_queue)
+                task.start_time = current_time
+                execution_time = task.size / self.compute_speed
+                task.completion_time = current_time + execution_time
+                current_time = task.completion_time
+                self.completed_tasks.append(task)
+            return
+
+        cores = [self.current_time] * self.num_cores  # Core-availability heap
         while temp_queue:
             priority, task_id, task = heapq.heappop(temp_queue)
-            task.start_time = current_time
+            task.start_time = heapq.heappop(cores)
             execution_time = task.size / self.compute_speed
-            task.completion_time = current_time + execution_time
-            current_time = task.completion_time
+            task.completion_time = task.start_time + execution_time
+            heapq.heappush(cores, task.completion_time)
             self.completed_tasks.append(task)
     
     def get_queue_length(self):
@@ -77,4 +210,12 @@ class Server:
     
     def get_queue_load(self):
         """Return the total computational load in the queue"""
-        return sum(task.size for p, tid, task in self.queue)
+        return self.queued_size
+
+    def get_priority_load(self, priority):
+        """Return the total computational load queued at the given priority"""
+        return self.priority_load.get(priority, 0)
+
+    def __str__(self):
+        return (f"Server(name={self.name}, tier={self.tier.value}, speed={self.compute_speed}, "
+                f"cores={self.num_cores}, queue={self.get_queue_length()})")
@@ -2,6 +2,10 @@ class Task:
     """
     Represents a computational task with properties relevant for scheduling decisions.
     """
+
+    # No per-instance __dict__: large workloads hold millions of these
+    __slots__ = ('id', 'size', 'priority', 'data_size', 'arrival_time',
+                 'start_time', 'completion_time', 'assigned_server')
     
     def __init__(self, task_id, size, priority=1, data_size=0, arrival_time=0):
         self.id = task_id
@@ -0,0 +1,234 @@
+import numpy as np
+
+
+class TaskTable:
+    """
+    Structure-of-arrays store for large task sets
+    One NumPy column per Task field instead of one Python object per task
+    """
+
+    COLUMNS = {
+        'id': np.int64,
+        'size': np.float64,
+        'priority': np.int32,
+        'data_size': np.float64,
+        'arrival_time': np.float64,
+        'start_time': np.float64,  # NaN until the task starts
+        'completion_time': np.float64,  # NaN until the task completes
+        'server': np.int32  # Index into server_names, -1 while unassigned
+    }
+
+    def __init__(self, capacity=0):
+        self._length = 0
+        self._capacity = max(int(capacity), 1)
+        self._columns = {}
+        for name, dtype in self.COLUMNS.items():
+            self._columns[name] = self._empty_column(name, self._capacity)
+
+        self.server_names = []  # server index -> name
+        self._server_lookup = {}  # name -> server index
+
+    def _empty_column(self, name, length):
+        if name in ('start_time', 'completion_time'):
+            return np.full(length, np.nan)
+        if name == 'server':
+            return np.full(length, -1, dtype=np.int32)
+        return np.zeros(length, dtype=self.COLUMNS[name])
+
+    @classmethod
+    def from_arrays(cls, size, data_size=None, priority=None, arrival_time=None, ids=None):
+        """Build a table directly from column arrays (no per-task objects)"""
+        size = np.asarray(size, dtype=np.float64)
+        count = len(size)
+        table = cls(count)
+        table._length = count
+
+        table._columns['size'][:count] = size
+        table._columns['id'][:count] = np.arange(count) if ids is None else ids
+        table._columns['priority'][:count] = 1 if priority is None else priority
+        table._columns['data_size'][:count] = 0 if data_size is None else data_size
+        table._columns['arrival_time'][:count] = 0 if arrival_time is None else arrival_time
+        return table
+
+    @classmethod
+    def from_columns(cls, columns, server_names=()):
+        """
+        Wrap existing column arrays without copying them
+        Memory-mapped columns stay memory-mapped, so slices read only what they touch
+        """
+        missing = set(cls.COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing task columns: {sorted(missing)}")
+        count = len(columns['id'])
+        table = cls.__new__(cls)
+        table._length = count
+        table._capacity = count
+        table._columns = {name: columns[name] for name in cls.COLUMNS}
+        table.server_names = list(server_names)
+        table._server_lookup = {name: index for index, name in enumerate(table.server_names)}
+        return table
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """Build a table from Task objects, keeping any timing and server data"""
+        tasks = list(tasks)
+        table = cls.from_arrays(
+            [t.size for t in tasks],
+            data_size=[t.data_size for t in tasks],
+            priority=[t.priority for t in tasks],
+            arrival_time=[t.arrival_time for t in tasks],
+            ids=[t.id for t in tasks]
+        )
+        for row, task in enumerate(tasks):
+            if task.start_time is not None:
+                table._columns['start_time'][row] = task.start_time
+            if task.completion_time is not None:
+                table._columns['completion_time'][row] = task.completion_time
+            if task.assigned_server is not None:
+                table._columns['server'][row] = table.server_index(task.assigned_server)
+        return table
+
+    def append(self, task_id, size, priority=1, data_size=0, arrival_time=0):
+        """Append one task and return its row number"""
+        if self._length == self._capacity:
+            self._grow(self._capacity * 2)
+
+        row = self._length
+        columns = self._columns
+        columns['id'][row] = task_id
+        columns['size'][row] = size
+        columns['priority'][row] = priority
+        columns['data_size'][row] = data_size
+        columns['arrival_time'][row] = arrival_time
+        self._length += 1
+        return row
+
+    def _grow(self, capacity):
+        """Reallocate every column with room for capacity rows"""
+        for name, column in self._columns.items():
+            grown = self._empty_column(name, capacity)
+            grown[:self._length] = column[:self._length]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def column(self, name):
+        """Return a view of one column trimmed to the table length"""
+        return self._columns[name][:self._length]
+
+    def server_index(self, server_name):
+        """Return the integer index for a server name, registering it if new"""
+        index = self._server_lookup.get(server_name)
+        if index is None:
+            index = len(self.server_names)
+            self.server_names.append(server_name)
+            self._server_lookup[server_name] = index
+        return index
+
+    def set_servers(self, assignment, server_names):
+        """Record an index assignment produced against the given server name list"""
+        mapping = np.array([self.server_index(name) for name in server_names], dtype=np.int32)
+        self.column('server')[:] = mapping[np.asarray(assignment)]
+
+    def makespan(self):
+        """Maximum completion time over completed tasks"""
+        completion = self.column('completion_time')
+        if not self._length or np.isnan(completion).all():
+            return 0
+        return float(np.nanmax(completion))
+
+    @property
+    def nbytes(self):
+        """Memory held by the column arrays"""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._length
+        if not 0 <= row < self._length:
+            raise IndexError(f"Task row {row} out of range")
+        return TaskView(self, row)
+
+    def __iter__(self):
+        for row in range(self._length):
+            yield TaskView(self, row)
+
+
+class TaskView:
+    """
+    Lightweight Task-compatible view onto one row of a TaskTable
+    Reads and writes go straight to the table's columns
+    """
+
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def _get(self, name):
+        return self.table._columns[name][self.row].item()
+
+    def _get_time(self, name):
+        value = self.table._columns[name][self.row]
+        return None if np.isnan(value) else float(value)
+
+    def _set_time(self, name, value):
+        self.table._columns[name][self.row] = np.nan if value is None else value
+
+    @property
+    def id(self):
+        return self._get('id')
+
+    @property
+    def size(self):
+        return self._get('size')
+
+    @property
+    def priority(self):
+        return self._get('priority')
+
+    @property
+    def data_size(self):
+        return self._get('data_size')
+
+    @property
+    def arrival_time(self):
+        return self._get('arrival_time')
+
+    @property
+    def start_time(self):
+        return self._get_time('start_time')
+
+    @start_time.setter
+    def start_time(self, value):
+        self._set_time('start_time', value)
+
+    @property
+    def completion_time(self):
+        return self._get_time('completion_time')
+
+    @completion_time.setter
+    def completion_time(self, value):
+        self._set_time('completion_time', value)
+
+    @property
+    def assigned_server(self):
+        index = self.table._columns['server'][self.row]
+        return None if index < 0 else self.table.server_names[index]
+
+    @assigned_server.setter
+    def assigned_server(self, server_name):
+        self.table._columns['server'][self.row] = -1 if server_name is None else self.table.server_index(server_name)
+
+    def __str__(self):
+        return f"Task {self.id} (size: {self.size}, priority: {self.priority}, data: {self.data_size}MB)"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __lt__(self, other):
+        """For priority queue comparison - lower priority number = higher priority"""
+        return self.priority < other.priority
@@ -11,7 +11,11 @@ from .offload_strategy import (
     heuristic_policy
 )
 
+from .lookahead_strategy import LookaheadOffloadStrategy
+from .learned_strategy import LearnedOffloadStrategy, PolicyNetwork
 from .list_scheduler import ListScheduler
+from .batch_scheduler import BatchScheduler
+from .server_index import ServerIndex
 
 __all__ = [
     'OffloadStrategy',
@@ -19,5 +23,10 @@ __all__ = [
     'IntelligentOffloadStrategy',
     'static_policy',
     'heuristic_policy',
-    'ListScheduler'
+    'LookaheadOffloadStrategy',
+    'LearnedOffloadStrategy',
+    'PolicyNetwork',
+    'ListScheduler',
+    'BatchScheduler',
+    'ServerIndex'
 ]
@@ -0,0 +1,212 @@
+import json
+import os
+
+import numpy as np
+
+from scheduling.offload_strategy import OffloadStrategy
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_POLICY = os.path.join(SRC_DIR, 'data', 'input', 'offload_policy.json')
+
+# Per (task, resource) inputs of the policy network, in column order
+FEATURES = ('finish_gap', 'makespan_growth', 'exec_time', 'local', 'energy_share', 'battery', 'remaining_work')
+
+
+def offload_features(finish, exec_time, load_horizon, energy_share, battery, remaining_work, feasible):
+    """
+    Policy inputs for a batch of decisions, shaped (batch, resources, features)
+
+    finish, exec_time and energy_share are (batch, resources) arrays with the
+    device in column 0; times are relative to the decision time. load_horizon
+    is when the busiest resource drains, battery the device's charge fraction
+    and remaining_work the time the rest of the workload needs on the whole
+    fleet, all (batch,). Times are divided by a per-decision scale so one
+    policy serves short and long workloads alike.
+    """
+    best = np.min(np.where(feasible, finish, np.inf), axis=1)
+    scale = (load_horizon + remaining_work + best)[:, None] + 1e-9
+
+    features = np.empty(finish.shape + (len(FEATURES),))
+    features[..., 0] = np.where(feasible, finish - best[:, None], 0) / scale
+    features[..., 1] = np.maximum(np.where(feasible, finish, 0) - load_horizon[:, None], 0) / scale
+    features[..., 2] = exec_time / scale
+    features[..., 3] = 0
+    features[:, 0, 3] = 1
+    features[..., 4] = energy_share
+    features[..., 5] = battery[:, None]
+    features[..., 6] = remaining_work[:, None] / scale
+    return features
+
+
+class PolicyNetwork:
+    """
+    Small MLP scoring every (task, resource) pair; the highest score wins
+
+    score = tanh(x W1 + b1) w2 + x skip. The linear skip term starts at the
+    earliest-finish-time rule (a large negative weight on finish_gap), so an
+    untrained network picks resources finishing within a small margin of the
+    earliest, as IntelligentOffloadStrategy does, and training learns a
+    correction on top of it.
+    """
+
+    def __init__(self, hidden=32, rng=None, temperature=20.0):
+        rng = rng if rng is not None else np.random.default_rng(0)
+        n = len(FEATURES)
+        self.params = {
+            'W1': rng.normal(0, 1 / np.sqrt(n), (n, hidden)),
+            'b1': np.zeros(hidden),
+            'w2': rng.normal(0, 0.01, hidden),
+            'skip': np.zeros(n),
+        }
+        self.params['skip'][FEATURES.index('finish_gap')] = -temperature
+
+    def scores(self, features):
+        """Scores for a (batch, resources, features) array, shaped (batch, resources)"""
+        p = self.params
+        hidden = np.tanh(features @ p['W1'] + p['b1'])
+        return hidden @ p['w2'] + features @ p['skip']
+
+    def gradients(self, features, score_grad):
+        """Parameter gradients for a (batch, resources) gradient on the scores"""
+        p = self.params
+        hidden = np.tanh(features @ p['W1'] + p['b1'])
+        flat_x = features.reshape(-1, features.shape[-1])
+        flat_h = hidden.reshape(-1, hidden.shape[-1])
+        flat_g = score_grad.reshape(-1)
+        hidden_grad = flat_g[:, None] * p['w2'] * (1 - flat_h ** 2)
+        return {
+            'W1': flat_x.T @ hidden_grad,
+            'b1': hidden_grad.sum(axis=0),
+            'w2': flat_h.T @ flat_g,
+            'skip': flat_x.T @ flat_g,
+        }
+
+    def choose(self, features, feasible):
+        """Greedy batched inference: resource index with the best feasible score for every row"""
+        return np.where(feasible, self.scores(features), -np.inf).argmax(axis=1)
+
+    def to_dict(self):
+        return {'features': list(FEATURES), **{name: value.tolist() for name, value in self.params.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        if list(data['features']) != list(FEATURES):
+            raise ValueError(f"Policy was trained on features {data['features']}, expected {list(FEATURES)}")
+        network = cls(hidden=len(data['b1']))
+        network.params = {name: np.array(data[name], dtype=float) for name in network.params}
+        return network
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path=DEFAULT_POLICY):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class LearnedOffloadStrategy(OffloadStrategy):
+    """
+    Offloading policy learned with reinforcement learning (see experiments.policy_training)
+
+    The network sees each resource's estimated finish time, how far it would
+    push the overall load horizon, the device's battery and how much work is
+    still to come, and picks the resource with the highest score. Unlike the
+    greedy rule it can leave a resource free or save battery for later tasks.
+
+    plan() scores a window of tasks per network call. Each decision changes the
+    state the next one sees, so the window is scored against the state a guess
+    of the earlier decisions leaves behind: every decision up to the first one
+    that differs from the guess is exact, and the rest of the window is scored
+    again from there with the new choices as the guess. Placements match
+    deciding one task at a time; a window typically takes a few calls.
+    """
+
+    def __init__(self, policy=None, wireless_speed=100, wired_speed=1000, window=64):
+        OffloadStrategy.__init__(self, wireless_speed, wired_speed)
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        self.policy = policy if policy is not None else PolicyNetwork.load()
+        self.window = window
+
+    def decide(self, task, device, servers, current_time=0):
+        """Place one task with nothing known about the work behind it"""
+        resources = [device] + list(servers)
+        return resources[self._choose_window([task], device, resources, np.zeros(1))[0]]
+
+    def plan(self, tasks, device, servers, current_time=0):
+        """Decide tasks in order, telling the policy how much work is still behind each one"""
+        tasks = list(tasks)
+        resources = [device] + list(servers)
+        capacity = sum(r.compute_speed * r.num_cores for r in resources)
+        remaining_work = np.empty(len(tasks))
+        remaining = sum(t.size for t in tasks)
+        for i, task in enumerate(tasks):
+            remaining -= task.size
+            remaining_work[i] = remaining / capacity
+
+        # A shared network's upload estimates change with the reservation behind every decision
+        size = self.window if self.network is None else 1
+        for start in range(0, len(tasks), size):
+            window = tasks[start:start + size]
+            choices = self._choose_window(window, device, resources, remaining_work[start:start + size])
+            for task, choice in zip(window, choices):
+                yield task, resources[choice]
+
+    def _choose_window(self, window, device, resources, remaining_work):
+        """
+        Resource index for each task of a window, from the same state OffloadEnv exposes in training
+        Between decisions the chosen resource's queue grows by the task and, when
+        it runs locally, the battery pays its energy, as schedule_tasks applies them
+        """
+        count = len(window)
+        if len(resources) == 1:
+            return [0] * count  # Only the device; choose() falls back to it even when infeasible
+
+        size = np.fromiter((t.size for t in window), dtype=float, count=count)
+        energy = np.fromiter((device.energy_cost(t) for t in window), dtype=float, count=count)
+        exec_time, upload = self.window_costs(window, resources)
+        delay = np.array([r.network_delay for r in resources], dtype=float)
+        drain = np.array([r.compute_speed * r.num_cores for r in resources], dtype=float)
+        backlog = np.array([r.backlog_size for r in resources], dtype=float)
+        queued = np.array([r.queued_size for r in resources], dtype=float)
+        battery = device.remaining_battery
+
+        choices = []
+        guess = np.full(count, -1)  # No placement guessed yet: every task sees the window's starting state
+        while len(choices) < count:
+            done = len(choices)
+            rows = np.arange(count - done)
+            pending = guess[done:]
+
+            # State before each remaining task, given the guessed placements ahead of it
+            added = np.zeros((count - done + 1, len(resources)))
+            placed = pending >= 0
+            added[1:][rows[placed], pending[placed]] = size[done:][placed]
+            added[0] = queued
+            queue_delay = (np.cumsum(added, axis=0)[:-1] + backlog) / drain
+            drained = np.concatenate(([battery], -np.where(pending == 0, energy[done:], 0)))
+            charge = np.cumsum(drained)[:-1]
+
+            finish = delay + queue_delay + exec_time[done:] + upload[done:]
+            feasible = np.ones(finish.shape, dtype=bool)
+            feasible[:, 0] = charge >= energy[done:]
+            energy_share = np.zeros(finish.shape)
+            energy_share[:, 0] = energy[done:] / np.maximum(charge, 1e-9)
+            features = offload_features(finish, exec_time[done:], np.maximum(queue_delay.max(axis=1), 0),
+                                        energy_share, charge / device.battery_capacity,
+                                        remaining_work[done:], feasible)
+            chosen = self.policy.choose(features, feasible)
+
+            # Decisions stay exact up to and including the first one the guess got wrong
+            wrong = np.flatnonzero(chosen != pending)
+            exact = wrong[0] + 1 if len(wrong) else len(chosen)
+            for i in range(exact):
+                choice = int(chosen[i])
+                queued[choice] += size[done + i]
+                if choice == 0:
+                    battery -= energy[done + i]
+                choices.append(choice)
+            guess[done + exact:] = chosen[exact:]
+        return choices
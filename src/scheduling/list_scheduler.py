@@ -1,23 +1,84 @@
+import math
+import time
+
+import numpy as np
+from typing import Iterable
+
 from models.task import Task
 from models.device import Device
-from models.server import Server
+from models.server import Server, ServerTier
 from scheduling.offload_strategy import StaticOffloadStrategy, IntelligentOffloadStrategy
+from scheduling.lookahead_strategy import LookaheadOffloadStrategy
+from scheduling.learned_strategy import LearnedOffloadStrategy, PolicyNetwork, DEFAULT_POLICY
+from scheduling.batch_scheduler import BatchScheduler
+from scheduling.server_index import ServerIndex
+from simulation.engine import SimulationEngine
+from simulation.metrics import QuantileSketch, RunMetrics
+from tracing.event_log import get_logger, event_log
+
+logger = get_logger(__name__)
+
+# Fleets at least this large get an indexed best-server lookup by default
+INDEX_THRESHOLD = 32
 
 class ListScheduler:
     """
     Main scheduler that assigns tasks to servers using list scheduling heuristic
     """
     
-    def __init__(self, device, servers, offload_strategy="intelligent"):
+    def __init__(self, device, servers, offload_strategy="intelligent", wireless_speed=100, wired_speed=1000,
+                 use_index=None, network=None, lookahead_window=16, policy_file=DEFAULT_POLICY,
+                 collect_metrics=False):
         self.device = device
         self.servers = servers
         self.assigned_tasks = []
+        self.engine = None
+        self.collect_metrics = collect_metrics  # Feed engine runs into RunMetrics (costs time per event)
+        self.metrics = None  # RunMetrics of the last engine run, when collect_metrics is set
+        self.decision_latency = QuantileSketch()  # perf_counter_ns of the online decide calls
+        self.decisions_over_budget = 0
+        self.latency_budget_ns = None
+
+        # Index every resource once so the per-task path does no string work
+        self.resources = [device] + list(servers)
+        next_id = max((r.server_id for r in self.resources if r.server_id is not None), default=-1) + 1
+        for resource in self.resources:
+            if resource.server_id is None:
+                resource.server_id = next_id
+                next_id += 1
+        self.server_index = {r.server_id: r for r in self.resources}
+        self._servers_by_name = {r.name.lower(): r for r in self.resources}
+        self._first_by_tier = {}
+        for server in self.servers:
+            self._first_by_tier.setdefault(server.tier, server)
+
+        # Large fleets are searched through a load-tracking index instead of a linear scan
+        if use_index is None:
+            use_index = len(self.servers) >= INDEX_THRESHOLD
+        self.fleet_index = ServerIndex(self.servers) if use_index else None
+        self.candidates = self.fleet_index if use_index else self.servers
         
         # Set up offloading strategy
         if offload_strategy == "static":
-            self.offload_strategy = StaticOffloadStrategy()
+            self.offload_strategy = StaticOffloadStrategy(wireless_speed=wireless_speed, wired_speed=wired_speed)
+        elif offload_strategy == "lookahead":
+            self.offload_strategy = LookaheadOffloadStrategy(lookahead_window, wireless_speed=wireless_speed,
+                                                             wired_speed=wired_speed)
+        elif offload_strategy == "learned":
+            self.offload_strategy = LearnedOffloadStrategy(PolicyNetwork.load(policy_file), wireless_speed,
+                                                           wired_speed)
         else:  # intelligent
-            self.offload_strategy = IntelligentOffloadStrategy()
+            self.offload_strategy = IntelligentOffloadStrategy(wireless_speed, wired_speed)
+
+        # Lookahead plans fill gaps in time; queues without an explicit discipline run them in plan order
+        if isinstance(self.offload_strategy, LookaheadOffloadStrategy):
+            for resource in self.resources:
+                if resource.discipline is None:
+                    resource.discipline = self.offload_strategy.order
+
+        # Optional shared-bandwidth network; decisions then see planned uploads competing for links
+        self.network = network
+        self.offload_strategy.network = network
 
     def schedule_tasks(self, tasks: list[Task], current_time=0):
         """
@@ -25,78 +86,199 @@ class ListScheduler:
         """
         scheduled_tasks = []
 
-        for task in tasks:
-            # Make offloading decision
-            target_server_name = self.offload_strategy.decide(
-                task, self.device, self.servers, current_time
-            )
-
-            # Find the target server object
-            target_server = self.find_server_by_name(target_server_name)
+        # Make offloading decisions
+        for task, decision in self.offload_strategy.plan(tasks, self.device, self.candidates, current_time):
+            target_server = self.resolve_server(decision)
 
             if target_server:
                 # Add task to the target server's queue
                 target_server.add_to_queue(task)
                 scheduled_tasks.append((task, target_server))
+                if event_log.enabled:
+                    event_log.record('decision', task.id, target_server.name, current_time, task.size)
+                if self.network is not None and target_server is not self.device:
+                    self.network.reserve(task, target_server)
 
                 # For local execution, consume energy immediately
                 if target_server == self.device:  # ← CHANGE: Compare objects, not names
                     energy_consumed = self.device.consume_energy(task)
                     if not energy_consumed:
-                        print(f"Warning: Task {task.id} scheduled locally but not enough energy!")
+                        logger.warning("Task %s scheduled locally but not enough energy!", task.id)
             else:
-                print(f"Warning: Could not find server {target_server_name} for task {task.id}")
+                logger.warning("Could not find server %s for task %s", decision, task.id)
+
+        self.assigned_tasks.extend(scheduled_tasks)
+        return scheduled_tasks
+
+    def schedule_batch(self, tasks: list[Task], current_time=0):
+        """
+        Schedule a list of tasks in one vectorized pass
+        Gives the same placement as schedule_tasks for the intelligent strategy;
+        other strategies and shared networks fall back to the per-task path
+        """
+        if not isinstance(self.offload_strategy, IntelligentOffloadStrategy) or self.network is not None:
+            return self.schedule_tasks(tasks, current_time)
+
+        batch = BatchScheduler(self.device, self.servers, self.offload_strategy)
+        assignment = batch.assign(
+            np.fromiter((t.size for t in tasks), dtype=float, count=len(tasks)),
+            np.fromiter((t.data_size for t in tasks), dtype=float, count=len(tasks)),
+            current_time=current_time
+        )
+
+        resources = batch.resources
+        scheduled_tasks = list(zip(tasks, [resources[index] for index in assignment.tolist()]))
+        if event_log.enabled:
+            # Traced runs keep the record order of schedule_tasks: each decision, then its energy use
+            for task, target_server in scheduled_tasks:
+                target_server.add_to_queue(task)
+                event_log.record('decision', task.id, target_server.name, current_time, task.size)
+                if target_server is self.device:
+                    self._consume_local(task)
+        else:
+            # Fill each server queue in one go, keeping workload order within it
+            for index, server in enumerate(self.servers, start=1):
+                server.add_tasks([tasks[i] for i in np.flatnonzero(assignment == index).tolist()])
+            for i in np.flatnonzero(assignment == 0).tolist():
+                self.device.add_to_queue(tasks[i])
+                self._consume_local(tasks[i])
 
         self.assigned_tasks.extend(scheduled_tasks)
         return scheduled_tasks
 
+    def _consume_local(self, task):
+        if not self.device.consume_energy(task):
+            logger.warning("Task %s scheduled locally but not enough energy!", task.id)
+
+    def resolve_server(self, decision):
+        """
+        Turn a strategy decision into a resource
+        Strategies return Server objects; integer ids and legacy names are also accepted
+        """
+        if isinstance(decision, Server):
+            return decision
+        if isinstance(decision, str):
+            return self.find_server_by_name(decision)
+        return self.server_index.get(decision)
+
     def find_server_by_name(self, server_name):
-        """Find a server by name (case-insensitive)"""
+        """Find a server by name (case-insensitive), falling back to the first server of a named tier"""
         server_name_lower = server_name.lower()
 
         # Handle different naming variations
         if server_name_lower == "local" or "local" in server_name_lower:
             return self.device
 
-        for server in self.servers:
-            if server_name_lower in server.name.lower() or server.name.lower() in server_name_lower:
-                return server
-
-        # If no exact match, try fuzzy matching
-        if "edge" in server_name_lower:
-            for server in self.servers:
-                if "edge" in server.name.lower():
-                    return server
-        elif "cloud" in server_name_lower:
-            for server in self.servers:
-                if "cloud" in server.name.lower():
-                    return server
-
-        print(
-            f"Debug: Could not find server '{server_name}'. Available: {[s.name for s in [self.device] + self.servers]}")
+        server = self._servers_by_name.get(server_name_lower)
+        if server is not None:
+            return server
+
+        # Generic tier names ("edge", "cloud") map to the first server of that tier
+        for tier in (ServerTier.EDGE, ServerTier.CLOUD):
+            if tier.value in server_name_lower and tier in self._first_by_tier:
+                return self._first_by_tier[tier]
+
+        logger.debug("Could not find server '%s'. Available: %s",
+                     server_name, [s.name for s in self.resources])
         return None
-    
+
     def process_all_queues(self):
-        """Process all task queues and calculate completion times"""
-        # Process device queue
-        self.device.process_tasks()
-        
-        # Process server queues
-        for server in self.servers:
-            server.process_tasks()
+        """
+        Execute all queued tasks with the discrete event engine
+        Tasks arrive at their arrival_time, upload to remote servers and then
+        run on a shared clock, so completion and wait times reflect real contention
+        """
+        self.engine = SimulationEngine(
+            self.device, self.servers, upload_time=self.offload_strategy.calculate_upload_time,
+            network=self.network
+        )
+        self.engine.metrics = self.metrics = RunMetrics(self.resources) if self.collect_metrics else None
+        self.engine.load_queues()
+        self.engine.run()
     
+    def run_online(self, tasks: Iterable[Task], latency_budget_ns=None, submit_window=4096):
+        """
+        Decide each task when it arrives, using live server state from the event engine
+        Queues, running work and uploads in flight all count toward the load a
+        decision sees. Every decide call is timed into a fixed-size sketch; see
+        decision_latency_stats.
+        tasks may be a lazy stream in arrival order (e.g. a replayed trace):
+        it is consumed submit_window tasks at a time, so the event heap never
+        holds the whole workload.
+        """
+        self.latency_budget_ns = latency_budget_ns
+        self.decision_latency = QuantileSketch()
+        self.decisions_over_budget = 0
+        self._positions = {id(r): i for i, r in enumerate(self.resources)}
+        self.engine = SimulationEngine(
+            self.device, self.servers, upload_time=self.offload_strategy.calculate_upload_time,
+            dispatcher=self._decide_online, network=self.network
+        )
+        self.engine.metrics = self.metrics = RunMetrics(self.resources) if self.collect_metrics else None
+        submitted = 0
+        for task in tasks:
+            if task.arrival_time < self.engine.clock:
+                raise ValueError(f"Task {task.id} arrives at {task.arrival_time}, before already simulated "
+                                 f"time {self.engine.clock}: streamed tasks must be in arrival order")
+            self.engine.submit(task, task.arrival_time)
+            submitted += 1
+            if submitted % submit_window == 0:
+                # Later tasks arrive no earlier, so every event strictly before this arrival is final
+                self.engine.run(until=math.nextafter(task.arrival_time, -math.inf))
+        self.engine.run()
+
+        stats = self.decision_latency_stats()
+        if stats['over_budget']:
+            logger.warning("%d of %d decisions exceeded the %d ns budget (p99 %.0f ns)",
+                           stats['over_budget'], stats['count'], latency_budget_ns, stats['p99_ns'])
+
+    def _decide_online(self, task, now):
+        """Engine dispatcher: place one arriving task and return its resource index"""
+        if self.network is not None:
+            self.network.clock = now  # Transfer estimates see contention as of now
+
+        started = time.perf_counter_ns()
+        decision = self.offload_strategy.decide(task, self.device, self.candidates, now)
+        elapsed = time.perf_counter_ns() - started
+        self.decision_latency.add(elapsed)
+        if self.latency_budget_ns is not None and elapsed > self.latency_budget_ns:
+            self.decisions_over_budget += 1
+
+        target_server = self.resolve_server(decision)
+        if target_server is None:
+            logger.warning("Could not find server %s for task %s, running it locally", decision, task.id)
+            target_server = self.device
+
+        self.assigned_tasks.append((task, target_server))
+        if event_log.enabled:
+            event_log.record('decision', task.id, target_server.name, now, task.size)
+        if target_server is self.device and not self.device.consume_energy(task):
+            logger.warning("Task %s scheduled locally but not enough energy!", task.id)
+        return self._positions[id(target_server)]
+
+    def decision_latency_stats(self):
+        """Percentiles (within the sketch's 1% accuracy) of the online decide-call latencies, in nanoseconds"""
+        latencies = self.decision_latency
+        if not latencies.count:
+            return {'count': 0, 'p50_ns': 0, 'p99_ns': 0, 'max_ns': 0, 'mean_ns': 0, 'over_budget': 0}
+
+        return {
+            'count': latencies.count,
+            'p50_ns': latencies.quantile(0.5),
+            'p99_ns': latencies.quantile(0.99),
+            'max_ns': int(latencies.max),
+            'mean_ns': latencies.mean,
+            'over_budget': self.decisions_over_budget
+        }
+
     def get_makespan(self):
         """Calculate the overall makespan (maximum completion time)"""
-        all_completed_tasks = self.device.completed_tasks.copy()
-        
-        for server in self.servers:
-            all_completed_tasks.extend(server.completed_tasks)
-        
-        if not all_completed_tasks:
-            return 0
-        
-        return max(task.completion_time for task in all_completed_tasks)
-    
+        makespan = 0
+        for resource in self.resources:
+            if resource.completed_tasks:
+                makespan = max(makespan, max(task.completion_time for task in resource.completed_tasks))
+        return makespan
+
     def get_offloading_stats(self):
         """Get statistics about offloading decisions"""
         local_tasks = len(self.device.completed_tasks)
@@ -0,0 +1,122 @@
+import bisect
+
+import numpy as np
+
+from scheduling.offload_strategy import OffloadStrategy
+from simulation.disciplines import PlannedOrder
+
+
+class CoreTimeline:
+    """
+    Busy intervals of one core, sorted by start time
+    Intervals never overlap, so the end times are sorted as well and the first
+    interval that can delay a task is found by bisection
+    """
+
+    def __init__(self, busy_from=0, busy_until=0):
+        self.starts = []
+        self.ends = []
+        if busy_until > busy_from:
+            self.starts.append(busy_from)
+            self.ends.append(busy_until)
+
+    def earliest_slot(self, ready, duration):
+        """Return (start, position) of the earliest gap of the given length at or after ready"""
+        starts, ends = self.starts, self.ends
+        position = bisect.bisect_right(ends, ready)
+        start = ready
+        while position < len(starts):
+            if start + duration <= starts[position]:
+                break
+            start = max(start, ends[position])
+            position += 1
+        return start, position
+
+    def insert(self, start, end, position):
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+
+
+class LookaheadOffloadStrategy(OffloadStrategy):
+    """
+    HEFT-style strategy that plans a window of pending tasks at a time
+
+    Each window is ordered by rank and every task is then placed with
+    insertion-based earliest finish time: it may fill an idle gap on a core
+    timeline (left by upload delays) instead of only appending to the end.
+    Ranks are computed for the whole window at once; gaps are found by
+    bisection, so a window costs about O(W * S * log n).
+
+    Every placement records its planned start in the order discipline, and a
+    queue keyed by it starts ready tasks in plan order, so a task slotted into
+    a gap runs there rather than behind whatever was queued first.
+
+    rank='upward' orders by mean cost over all resources (the HEFT upward
+    rank, since tasks have no successors); rank='priority' orders by priority
+    first and upward rank within a priority.
+    """
+
+    RANKS = ('upward', 'priority')
+
+    def __init__(self, window=16, rank='upward', wireless_speed=100, wired_speed=1000):
+        OffloadStrategy.__init__(self, wireless_speed, wired_speed)
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        if rank not in self.RANKS:
+            raise ValueError(f"Unknown rank '{rank}'. Available: {self.RANKS}")
+        self.window = window
+        self.rank = rank
+        self.order = PlannedOrder()  # Queue discipline that keeps the planned start order
+
+    def decide(self, task, device, servers, current_time=0):
+        """Insertion-based earliest finish time for a single task"""
+        return next(iter(self.plan([task], device, servers, current_time)))[1]
+
+    def plan(self, tasks, device, servers, current_time=0):
+        """Assign tasks window by window, yielding (task, resource) in placement order"""
+        tasks = list(tasks)
+        resources = [device] + list(servers)
+        timelines = [self._timelines(resource, current_time) for resource in resources]
+        battery = device.remaining_battery
+
+        for window_start in range(0, len(tasks), self.window):
+            window = tasks[window_start:window_start + self.window]
+            exec_times, upload_times = self.window_costs(window, resources)
+
+            for i in self.rank_order(window, exec_times, upload_times):
+                task = window[i]
+                energy = device.energy_cost(task)
+                released = max(current_time, task.arrival_time)
+
+                best = None
+                for r, resource in enumerate(resources):
+                    if r == 0 and battery < energy:
+                        continue  # Not enough battery to run locally
+                    ready = released + resource.network_delay + upload_times[i, r]
+                    duration = exec_times[i, r]
+                    for timeline in timelines[r]:
+                        start, position = timeline.earliest_slot(ready, duration)
+                        if best is None or start + duration < best[0]:
+                            best = (start + duration, r, timeline, start, position)
+
+                if best is None:
+                    continue  # No resource at all; nothing to assign
+                finish, r, timeline, start, position = best
+                timeline.insert(start, finish, position)
+                self.order.planned_start[task.id] = start
+                if r == 0:
+                    battery -= energy
+                yield task, resources[r]
+
+    def _timelines(self, resource, current_time):
+        """One timeline per core, each busy until the resource's current load drains"""
+        busy_until = current_time + resource.queue_delay()
+        return [CoreTimeline(current_time, busy_until) for _ in range(resource.num_cores)]
+
+    def rank_order(self, window, exec_times, upload_times):
+        """Window positions in scheduling order (highest rank first, ties by input order)"""
+        upward = (exec_times + upload_times).mean(axis=1)
+        if self.rank == 'priority':
+            priority = np.fromiter((t.priority for t in window), dtype=float, count=len(window))
+            return np.lexsort((-upward, priority)).tolist()
+        return np.argsort(-upward, kind='stable').tolist()
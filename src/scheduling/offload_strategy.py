@@ -1,6 +1,9 @@
+import numpy as np
+
 from models.task import Task
 from models.device import Device
-from models.server import Server
+from models.server import Server, ServerTier
+from scheduling.server_index import ServerIndex
 
 
 class OffloadStrategy:
@@ -11,29 +14,73 @@ class OffloadStrategy:
     def __init__(self, wireless_speed=100, wired_speed=1000):
         self.wireless_speed = wireless_speed
         self.wired_speed = wired_speed
+        self.network = None  # Optional NetworkModel whose contention replaces the fixed link speeds
 
-    def calculate_upload_time(self, task, server):
+    def link_speeds(self, server):
         """
-        Calculate data transfer time based on server type and network speeds
+        Speeds of the network links a task's data crosses to reach the server
+        Edge servers sit one wireless hop away; cloud adds the wired backhaul
         """
-        if server.name.lower() == "local":
-            return 0  # No transfer time for local execution
+        if server.tier is ServerTier.EDGE:
+            return (self.wireless_speed,)
 
-        # For edge servers: wireless transfer only
-        if "edge" in server.name.lower():
-            return task.data_size / self.wireless_speed
+        if server.tier is ServerTier.CLOUD:
+            return (self.wireless_speed, self.wired_speed)
 
-        # For cloud servers: wireless + wired transfer
-        if "cloud" in server.name.lower():
-            wireless_time = task.data_size / self.wireless_speed
-            wired_time = task.data_size / self.wired_speed
-            return wireless_time + wired_time
+        return ()  # No transfer for local execution
 
-        return 0  # Default case
+    def calculate_upload_time(self, task, server):
+        """
+        Calculate data transfer time based on server type and network speeds
+        With a shared network model this is the expected time given current contention
+        """
+        if self.network is not None:
+            return self.network.expected_transfer_time(task.data_size, server)
+
+        upload_time = 0
+        for speed in self.link_speeds(server):
+            upload_time += task.data_size / speed
+        return upload_time
+
+    def window_costs(self, window, resources):
+        """(execution times, upload times) for a window, both shaped (tasks, resources)"""
+        size = np.fromiter((t.size for t in window), dtype=float, count=len(window))
+        speeds = np.array([r.compute_speed for r in resources], dtype=float)
+        exec_times = size[:, None] / speeds
+
+        upload_times = np.zeros_like(exec_times)
+        if self.network is not None:
+            for i, task in enumerate(window):
+                for r, resource in enumerate(resources[1:], start=1):
+                    upload_times[i, r] = self.calculate_upload_time(task, resource)
+        else:
+            data_size = np.fromiter((t.data_size for t in window), dtype=float, count=len(window))
+            for r, resource in enumerate(resources[1:], start=1):
+                for speed in self.link_speeds(resource):
+                    upload_times[:, r] += data_size / speed
+        return exec_times, upload_times
 
     def decide(self, task, device, servers, current_time=0):
+        """Return the Server (or the device) that should run the task"""
         raise NotImplementedError("Subclasses must implement this method")
 
+    def plan(self, tasks, device, servers, current_time=0):
+        """
+        Yield (task, decision) pairs for a list of tasks
+        Decides lazily one task at a time, so each decision sees the queues the
+        previous ones filled; windowed strategies override this
+        """
+        for task in tasks:
+            yield task, self.decide(task, device, servers, current_time)
+
+    @staticmethod
+    def first_edge_server(servers):
+        """First edge-tier server, falling back to the first server of any tier"""
+        for server in servers:
+            if server.tier is ServerTier.EDGE:
+                return server
+        return servers[0] if servers else None
+
 
 class StaticOffloadStrategy(OffloadStrategy):
     """
@@ -52,17 +99,17 @@ class StaticOffloadStrategy(OffloadStrategy):
         """
         # Rule 1: Offload if compute size is large
         if task.size > self.size_threshold:
-            return "edge"  # Choose first edge server
+            return self.first_edge_server(servers)  # Choose first edge server
 
         # Rule 2: Offload if data size is large (to avoid local processing of data-heavy tasks)
         if task.data_size > self.data_threshold:
-            return "edge"
+            return self.first_edge_server(servers)
 
         # Default: Execute locally if possible
         if device.can_accept_task(task):
-            return "local"
+            return device
         else:
-            return "edge"
+            return self.first_edge_server(servers)
 
 
 class IntelligentOffloadStrategy(OffloadStrategy):
@@ -79,11 +126,15 @@ class IntelligentOffloadStrategy(OffloadStrategy):
         Intelligent policy: Choose server with minimum completion time
         Consider energy constraints for local execution
         """
+        if isinstance(servers, ServerIndex):
+            # Indexed fleets only evaluate the best candidate of each server group
+            return servers.best_server(task, device, current_time, self.calculate_upload_time)[0]
+
         best_server = device
         best_completion_time = device.estimate_finish_time(task, current_time)
 
         # Consider all servers (including device)
-        all_servers = [device] + servers
+        all_servers = [device] + list(servers)
 
         for server in all_servers:
             # Skip local device if it doesn't have enough energy
@@ -103,19 +154,20 @@ class IntelligentOffloadStrategy(OffloadStrategy):
                 best_completion_time = total_completion_time
                 best_server = server
 
-        # Return consistent server names
-        if best_server == device:
-            return "local"
-        else:
-            return best_server.name.lower()
+        return best_server
+
+
+def _decision_name(server, device):
+    """Legacy string form of a decision: "local" or the lowercase server name"""
+    return "local" if server is device else server.name.lower()
 
 
-# Convenience functions for backward compatibility
+# Convenience functions for backward compatibility (these still return names)
 def static_policy(task, device, servers):
     strategy = StaticOffloadStrategy()
-    return strategy.decide(task, device, servers)
+    return _decision_name(strategy.decide(task, device, servers), device)
 
 
 def heuristic_policy(task, device, servers, current_time=0):
     strategy = IntelligentOffloadStrategy()
-    return strategy.decide(task, device, servers, current_time)
\ No newline at end of file
+    return _decision_name(strategy.decide(task, device, servers, current_time), device)
\ No newline at end of file
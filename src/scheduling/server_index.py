@@ -0,0 +1,109 @@
+import heapq
+from collections.abc import Sequence
+
+
+class _ServerGroup:
+    """
+    Min-heap over servers that share a tier and compute speed
+    Such servers charge any task the same upload and execution time, so the one
+    with the earliest availability is also the one that finishes first
+    """
+
+    def __init__(self):
+        self.heap = []  # [available key, position, version, server]
+        self.members = 0
+
+    def push(self, server, position, version):
+        heapq.heappush(self.heap, (server.network_delay + server.queue_delay(), position, version, server))
+
+    def top(self, versions):
+        """Earliest-available server, discarding entries made stale by later load changes"""
+        heap = self.heap
+        while heap[0][2] != versions[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def compact(self, versions):
+        """Drop stale entries once they outnumber live ones"""
+        if len(self.heap) > 2 * self.members + 16:
+            self.heap = [entry for entry in self.heap if entry[2] == versions[entry[1]]]
+            heapq.heapify(self.heap)
+
+
+class ServerIndex(Sequence):
+    """
+    Indexed view of a server fleet for earliest-finish-time queries
+
+    Servers are grouped by (tier, compute speed), and each group keeps a lazy
+    min-heap keyed on network delay + queue drain time. A query only evaluates
+    the top of every group, and a load change re-keys one server, so each
+    decision costs O(groups + log S) instead of O(S). Behaves as a read-only
+    sequence of the servers, so strategies that iterate servers still work.
+    """
+
+    def __init__(self, servers):
+        self.servers = list(servers)
+        self.groups = {}
+        self._group_of = []
+        self._versions = [0] * len(self.servers)
+        self._positions = {}
+
+        for position, server in enumerate(self.servers):
+            group = self.groups.setdefault((server.tier, server.compute_speed), _ServerGroup())
+            group.members += 1
+            group.push(server, position, 0)
+            self._group_of.append(group)
+            self._positions[id(server)] = position
+            server.load_listeners.append(self._on_load_change)
+
+        # Evaluate groups in fleet order so ties go to the earliest-listed server
+        self._group_order = sorted(self.groups.values(), key=lambda g: g.heap[0][1])
+
+    def _on_load_change(self, server):
+        """Re-key a server after its queue grew or shrank"""
+        position = self._positions[id(server)]
+        self._versions[position] += 1
+        group = self._group_of[position]
+        group.push(server, position, self._versions[position])
+        group.compact(self._versions)
+
+    def detach(self):
+        """Stop tracking load changes (call before discarding the index)"""
+        for server in self.servers:
+            server.load_listeners.remove(self._on_load_change)
+
+    def best_server(self, task, device, current_time=0, upload_time=None):
+        """
+        Return (resource, total finish time) with the earliest finish for the task
+        The device wins ties, then the earliest-listed server, matching a linear scan
+        """
+        position, total = self.best_position(task, current_time, upload_time,
+                                             device.estimate_finish_time(task, current_time))
+        return (device if position is None else self.servers[position]), total
+
+    def best_position(self, task, current_time=0, upload_time=None, bound=float('inf')):
+        """
+        Return (position, total finish time) of the server finishing the task earliest
+        Only a finish strictly before bound counts; otherwise the position is None
+        """
+        best_key = (bound, -1)
+        versions = self._versions
+        for group in self._group_order:
+            key, position, version, server = group.top(versions)
+            total = server.estimate_finish_time(task, current_time)
+            if upload_time is not None:
+                total += upload_time(task, server)
+            if (total, position) < best_key:
+                best_key = (total, position)
+
+        position = best_key[1]
+        return (None if position < 0 else position), best_key[0]
+
+    def __len__(self):
+        return len(self.servers)
+
+    def __getitem__(self, index):
+        return self.servers[index]
+
+    def __iter__(self):
+        return iter(self.servers)
@@ -17,6 +17,7 @@ setup(
     extras_require={
         "dev": [
             "pytest>=6.0",
+            "pytest-benchmark>=4.0",
         ],
     },
     classifiers=[
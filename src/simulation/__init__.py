@@ -0,0 +1,22 @@
+"""
+Simulation package for OS Scheduling Simulator
+Contains the discrete event engine that executes scheduled tasks and the
+streaming metrics it can feed
+"""
+
+from .engine import SimulationEngine
+from .multi_device import MultiDeviceSimulation
+from .network import NetworkModel, Link
+from .metrics import QuantileSketch, RunMetrics
+from .disciplines import (
+    Discipline,
+    PreemptivePriority,
+    ShortestRemainingFirst,
+    RoundRobin,
+    PlannedOrder,
+    make_discipline
+)
+
+__all__ = ['SimulationEngine', 'MultiDeviceSimulation', 'NetworkModel', 'Link', 'QuantileSketch', 'RunMetrics',
+           'Discipline', 'PreemptivePriority', 'ShortestRemainingFirst', 'RoundRobin',
+           'PlannedOrder', 'make_discipline']
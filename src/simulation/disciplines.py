@@ -0,0 +1,94 @@
+import itertools
+import math
+
+
+class Discipline:
+    """
+    Queue discipline of a server in the event engine
+    A discipline orders the ready queue through queue_key and decides whether
+    a newly queued task interrupts the running one. The base class is the
+    Server default: non-preemptive priority.
+    """
+
+    name = "priority"
+    preemptive = False
+    quantum = None  # Time slice length; None runs each task until it finishes or is preempted
+
+    def queue_key(self, task, remaining):
+        """Primary heap key for a task with the given remaining work (ties go by task id)"""
+        return task.priority
+
+    def preempts(self, new_key, running_key):
+        """Whether a queued task with new_key should interrupt the running task"""
+        return self.preemptive and new_key < running_key
+
+
+class PreemptivePriority(Discipline):
+    """
+    A strictly more urgent task interrupts the running one immediately
+    """
+
+    name = "preemptive_priority"
+    preemptive = True
+
+
+class ShortestRemainingFirst(Discipline):
+    """
+    SRPT: run the task with the least remaining work, preempting on shorter arrivals
+    """
+
+    name = "srpt"
+    preemptive = True
+
+    def queue_key(self, task, remaining):
+        return remaining
+
+
+class RoundRobin(Discipline):
+    """
+    First-come first-served time slicing: a task that exhausts its quantum
+    goes to the back of the queue
+    """
+
+    name = "round_robin"
+
+    def __init__(self, quantum=5.0):
+        if quantum <= 0:
+            raise ValueError(f"quantum must be positive, got {quantum}")
+        self.quantum = quantum
+        self._arrival_order = itertools.count()
+
+    def queue_key(self, task, remaining):
+        return next(self._arrival_order)
+
+
+class PlannedOrder(Discipline):
+    """
+    Non-preemptive: ready tasks start in the order a planning strategy laid them out
+    The key is each task's planned start time; tasks without a plan go after every planned one
+    """
+
+    name = "planned"
+
+    def __init__(self):
+        self.planned_start = {}  # task id -> planned start time
+
+    def queue_key(self, task, remaining):
+        return self.planned_start.get(task.id, math.inf)
+
+
+DISCIPLINES = {
+    Discipline.name: Discipline,
+    PreemptivePriority.name: PreemptivePriority,
+    ShortestRemainingFirst.name: ShortestRemainingFirst,
+    RoundRobin.name: RoundRobin
+}
+
+
+def make_discipline(name, quantum=5.0):
+    """Build a discipline by name; the quantum only applies to round robin"""
+    if name not in DISCIPLINES:
+        raise ValueError(f"Unknown discipline '{name}'. Available: {sorted(DISCIPLINES)}")
+    if name == RoundRobin.name:
+        return RoundRobin(quantum)
+    return DISCIPLINES[name]()
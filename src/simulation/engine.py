@@ -0,0 +1,264 @@
+import heapq
+import itertools
+
+# Event kinds. The numeric order breaks ties between events at the same
+# instant: finishes free a server first, then arrivals and uploads queue
+# their tasks, and only then does an idle server pick its next task so
+# that priorities are respected among everything ready at that moment.
+FINISH = 0
+ARRIVAL = 1
+TRANSFER_COMPLETE = 2  # A shared link finished its earliest upload (versioned, may be stale)
+UPLOAD_COMPLETE = 3
+START = 4
+
+# Resource index of an arrival that has not been placed yet (see dispatcher)
+UNASSIGNED = -1
+
+
+class SimulationEngine:
+    """
+    Discrete event simulation of the device and all servers on a shared clock
+    Without a device (device=None) the resources are just the servers, which
+    lets callers model the devices themselves and only dispatch offloaded work.
+    """
+
+    def __init__(self, device, servers, upload_time=None, dispatcher=None, network=None):
+        self.device = device
+        self.servers = servers
+        self.resources = ([device] if device is not None else []) + list(servers)
+        self._first_remote = 0 if device is None else 1
+        self.upload_time = upload_time  # Callable (task, server) -> transfer time
+        # Callable (task, time) -> resource index for UNASSIGNED arrivals,
+        # or None when the caller ran the task itself
+        self.dispatcher = dispatcher
+        # Optional NetworkModel; when set, uploads share link bandwidth instead of using upload_time
+        self.network = network
+        self.transfer_source = None  # Callable task -> source device for network routes
+        # Work uploading or running counts toward each server's backlog_size only when
+        # decisions are made mid-run; offline runs place every task before they start
+        self.track_backlog = dispatcher is not None
+        self.metrics = None  # Optional RunMetrics fed with completions and queue length changes
+        self.clock = 0
+        self.events = []  # Global event heap of (time, kind, seq, resource index, task)
+        self.events_processed = 0
+        self._sequence = itertools.count()
+        self._idle_cores = [r.num_cores for r in self.resources]
+        self._start_pending = [False] * len(self.resources)
+
+        # Running tasks per resource, for preemption and time slicing:
+        # task -> (run start, remaining work at start, run end, completes at run end)
+        self._runs = [{} for _ in self.resources]
+        self.preemptions = 0
+
+    def schedule_event(self, time, kind, resource_index, task=None):
+        """Push an event onto the global heap"""
+        heapq.heappush(self.events, (time, kind, next(self._sequence), resource_index, task))
+
+    def submit(self, task, time):
+        """Add an arrival that the dispatcher places when it happens"""
+        self.schedule_event(time, ARRIVAL, UNASSIGNED, task)
+
+    def load_queues(self):
+        """
+        Move every task already queued on a resource into the event heap
+        Tasks re-enter their server's queue once they have arrived and uploaded
+        """
+        for index, resource in enumerate(self.resources):
+            for task in resource.drain_queue():
+                self.schedule_event(max(task.arrival_time, self.clock), ARRIVAL, index, task)
+
+    def run(self, until=None):
+        """
+        Process events in time order until the heap is empty (or the clock passes until)
+        Returns the time of the last processed event
+        """
+        events = self.events
+        resources = self.resources
+        upload_time = self.upload_time
+        network = self.network
+        first_remote = self._first_remote
+        metrics = self.metrics
+        track_backlog = self.track_backlog
+        idle_cores = self._idle_cores
+        pop = heapq.heappop
+
+        while events:
+            if until is not None and events[0][0] > until:
+                break
+
+            time, kind, seq, index, task = pop(events)
+            self.clock = time
+            self.events_processed += 1
+
+            if kind == ARRIVAL:
+                if index == UNASSIGNED:
+                    index = self.dispatcher(task, time)
+                    if index is None:
+                        continue
+                resource = resources[index]
+                if network is not None and index >= first_remote:
+                    if track_backlog:
+                        resource.add_backlog(task.size)
+                    source = self.transfer_source(task) if self.transfer_source is not None else 0
+                    flow = network.start_transfer(task, resource, index, time, source)
+                    if flow.pending:
+                        self._schedule_transfers(flow.links)
+                    else:
+                        self._uploaded(index, task, time)
+                    continue
+
+                ready_time = time + resource.network_delay
+                if index >= first_remote and upload_time is not None:
+                    ready_time += upload_time(task, resource)
+                if ready_time > time:
+                    if track_backlog:
+                        resource.add_backlog(task.size)
+                    self.schedule_event(ready_time, UPLOAD_COMPLETE, index, task)
+                else:
+                    self._enqueue(index, task, time)
+
+            elif kind == TRANSFER_COMPLETE:
+                link, version = task
+                if version != link.version:
+                    continue  # Superseded: the link's transfers changed since
+                flow = network.finish_on_link(link, time)
+                self._schedule_transfers((link,))
+                if flow is not None:
+                    self._uploaded(flow.resource_index, flow.task, time)
+
+            elif kind == UPLOAD_COMPLETE:
+                self._arrive(index, task, time)
+
+            elif kind == START:
+                self._start_pending[index] = False
+                resource = resources[index]
+                # Fill every idle core; whichever core freed first takes the next task
+                while idle_cores[index] and resource.queue:
+                    self._start_run(index, resource.pop_next_task(), time)
+                if metrics is not None:
+                    metrics.queue_changed(index, resource.get_queue_length(), time)
+
+            else:  # FINISH
+                runs = self._runs[index]
+                run = runs.get(task)
+                if run is None or run[2] != time:
+                    continue  # The run was preempted
+                del runs[task]
+                resource = resources[index]
+                if track_backlog:
+                    resource.add_backlog(-run[1])
+                idle_cores[index] += 1
+                if not run[3]:
+                    # Quantum used up: back of the queue with the work still left
+                    self._requeue(index, task, run, time)
+                    self._request_start(index, time)
+                    continue
+
+                task.completion_time = time
+                resource.completed_tasks.append(task)
+                resource.current_time = time
+                if metrics is not None:
+                    metrics.record_completion(index, task, time)
+                if resource.queue:
+                    self._request_start(index, time)
+
+        if metrics is not None:
+            metrics.finish(self.clock)
+        return self.clock
+
+    def _schedule_transfers(self, links):
+        """Push the next completion event of each link whose transfers changed"""
+        for link in links:
+            finish_time = link.next_finish()
+            if finish_time is not None:
+                self.schedule_event(finish_time, TRANSFER_COMPLETE, UNASSIGNED, (link, link.version))
+
+    def _uploaded(self, index, task, time):
+        """A shared-network upload is done; the task reaches the server after its network delay"""
+        ready_time = time + self.resources[index].network_delay
+        if ready_time > time:
+            self.schedule_event(ready_time, UPLOAD_COMPLETE, index, task)
+        else:
+            self._arrive(index, task, time)
+
+    def _start_run(self, index, task, time):
+        """Run a task on one idle core until it finishes or its quantum ends"""
+        resource = self.resources[index]
+        remaining = resource.remaining_work.pop(task, None) if resource.remaining_work else None
+        if remaining is None:  # First run (resumed tasks keep their start time)
+            remaining = task.size
+            task.start_time = time
+
+        run_time = remaining / resource.compute_speed
+        quantum = resource.discipline.quantum if resource.discipline is not None else None
+        completes = quantum is None or run_time <= quantum
+        finish_time = time + (run_time if completes else quantum)
+        runs = self._runs[index]
+        runs[task] = (time, remaining, finish_time, completes)
+        if self.track_backlog:
+            resource.add_backlog(remaining)
+
+        self._idle_cores[index] -= 1
+        self.schedule_event(finish_time, FINISH, index, task)
+
+    def _arrive(self, index, task, time):
+        """A task finished uploading: it stops counting as inbound and joins the queue"""
+        if self.track_backlog:
+            self.resources[index].add_backlog(-task.size)
+        self._enqueue(index, task, time)
+
+    def _enqueue(self, index, task, time):
+        """Place a ready task in its server queue and wake the server if a core is idle"""
+        resource = self.resources[index]
+        resource.add_to_queue(task)
+        if self.metrics is not None:
+            self.metrics.queue_changed(index, resource.get_queue_length(), time)
+        if self._idle_cores[index]:
+            self._request_start(index, time)
+        elif resource.discipline is not None and resource.discipline.preemptive:
+            self._maybe_preempt(index, task, time)
+
+    def _maybe_preempt(self, index, task, time):
+        """Interrupt the lowest-ranked running task if the discipline ranks the new arrival ahead of it"""
+        resource = self.resources[index]
+        discipline = resource.discipline
+        runs = self._runs[index]
+        if not runs:
+            return
+
+        # O(cores) scan for the victim; the queue side of a preemption stays O(log n)
+        victim_key, victim = None, None
+        for running, run in runs.items():
+            key = (discipline.queue_key(running, self._remaining(resource, run, time)), running.id)
+            if victim_key is None or key > victim_key:
+                victim_key, victim = key, running
+
+        new_key = discipline.queue_key(task, resource.remaining_work.get(task, task.size))
+        if discipline.preempts(new_key, victim_key[0]):
+            self.preemptions += 1
+            run = runs.pop(victim)
+            if self.track_backlog:
+                resource.add_backlog(-run[1])
+            self._idle_cores[index] += 1
+            self._requeue(index, victim, run, time)
+            self._request_start(index, time)
+
+    @staticmethod
+    def _remaining(resource, run, time):
+        """Work a run still has left at the given time"""
+        run_start, remaining, finish_time, completes = run
+        return remaining - (time - run_start) * resource.compute_speed
+
+    def _requeue(self, index, task, run, time):
+        """Return a partly run task to its queue"""
+        resource = self.resources[index]
+        resource.remaining_work[task] = self._remaining(resource, run, time)
+        resource.add_to_queue(task)
+        if self.metrics is not None:
+            self.metrics.queue_changed(index, resource.get_queue_length(), time)
+
+    def _request_start(self, index, time):
+        """Schedule a single START for an idle server"""
+        if not self._start_pending[index]:
+            self._start_pending[index] = True
+            self.schedule_event(time, START, index)
@@ -0,0 +1,407 @@
+import math
+
+import numpy as np
+
+# Quantiles reported for every latency metric, as summary key -> quantile
+TAIL_QUANTILES = {'p50': 0.5, 'p95': 0.95, 'p99': 0.99, 'p999': 0.999}
+
+# Values at or below this count as zero (a task that never waited)
+MIN_VALUE = 1e-9
+
+# add_many adds fewer values than this one by one: NumPy's fixed cost per call outweighs the loop
+SMALL_BATCH = 64
+
+
+class QuantileSketch:
+    """
+    Mergeable log-bucket quantile sketch for non-negative values
+    Bucket bounds grow geometrically by gamma = (1 + a) / (1 - a), so every
+    quantile comes back within relative accuracy a of the exact one. Memory is
+    at most max_buckets buckets whatever the number of values: past that the
+    lowest buckets collapse together, which only blurs the bottom quantiles.
+    Weights may be fractional (e.g. durations for time-weighted statistics).
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self.buckets = {}  # bucket index -> weight of values in (gamma^(i-1), gamma^i]
+        self.zero_count = 0  # Weight of values at or below MIN_VALUE
+        self.count = 0  # Total weight
+        self.sum = 0.0  # Weighted sum of values
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, weight=1):
+        """Add one value with the given weight"""
+        if value < 0:
+            raise ValueError(f"QuantileSketch only holds non-negative values, got {value}")
+        self.count += weight
+        self.sum += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value <= MIN_VALUE:
+            self.zero_count += weight
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + weight
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def add_many(self, values, weights=None):
+        """Add an array of values in one vectorized pass"""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        if len(values) < SMALL_BATCH:
+            if weights is None:
+                for value in values.tolist():
+                    self.add(value)
+            else:
+                for value, weight in zip(values.tolist(), np.asarray(weights, dtype=np.float64).tolist()):
+                    self.add(value, weight)
+            return
+        if values.min() < 0:
+            raise ValueError("QuantileSketch only holds non-negative values")
+        zero = values <= MIN_VALUE
+        indices = np.ceil(np.log(values[~zero]) / self._log_gamma).astype(np.int64)
+        keys, inverse = np.unique(indices, return_inverse=True)
+        if weights is None:
+            # Unit weights keep the counts integral
+            self.count += len(values)
+            self.sum += float(values.sum())
+            self.zero_count += int(zero.sum())
+            bucket_weights = np.bincount(inverse.reshape(-1)).tolist()
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            self.count += float(weights.sum())
+            self.sum += float(values @ weights)
+            self.zero_count += float(weights[zero].sum())
+            bucket_weights = np.bincount(inverse.reshape(-1), weights=weights[~zero]).tolist()
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        for key, weight in zip(keys.tolist(), bucket_weights):
+            self.buckets[key] = self.buckets.get(key, 0) + weight
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(f"Cannot merge sketches with relative accuracy {other.relative_accuracy} "
+                             f"and {self.relative_accuracy}")
+        for index, weight in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        return self
+
+    def _collapse(self):
+        """Fold the lowest buckets into the lowest one kept until under max_buckets"""
+        indices = sorted(self.buckets)
+        excess = len(indices) - self.max_buckets
+        folded = sum(self.buckets.pop(index) for index in indices[:excess])
+        self.buckets[indices[excess]] += folded
+
+    def quantile(self, q):
+        """Value at quantile q (0..1); 0 for an empty sketch"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        if rank <= self.zero_count:
+            return max(self.min, 0.0)
+
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                break
+        # Midpoint (in relative terms) of the bucket, clamped to the values actually seen
+        value = 2 * self._gamma ** index / (self._gamma + 1)
+        return min(max(value, self.min), self.max)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def summary(self):
+        """Count, mean, max and the TAIL_QUANTILES, all read in one pass over the sorted buckets"""
+        result = {'count': self.count, 'mean': self.mean, 'max': self.max if self.count else 0.0}
+        if not self.count:
+            result.update((name, 0.0) for name in TAIL_QUANTILES)
+            return result
+
+        # Same walk as quantile(), resumed from one ascending quantile to the next
+        buckets = iter(sorted(self.buckets.items()))
+        seen = self.zero_count
+        for name, q in TAIL_QUANTILES.items():
+            rank = q * self.count
+            if rank <= self.zero_count:
+                result[name] = max(self.min, 0.0)
+                continue
+            while seen < rank:
+                entry = next(buckets, None)
+                if entry is None:
+                    break
+                index, weight = entry
+                seen += weight
+            value = 2 * self._gamma ** index / (self._gamma + 1)
+            result[name] = min(max(value, self.min), self.max)
+        return result
+
+    def to_dict(self):
+        """JSON-friendly form, so sketches from separate runs can be merged later"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'buckets': [[index, weight] for index, weight in sorted(self.buckets.items())],
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'], data['max_buckets'])
+        sketch.buckets = {int(index): weight for index, weight in data['buckets']}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.sum = data['sum']
+        if data['count']:
+            sketch.min, sketch.max = data['min'], data['max']
+        return sketch
+
+    def __len__(self):
+        return len(self.buckets) + (1 if self.zero_count else 0)
+
+
+def add_grouped(sketches, values, group):
+    """
+    Add values[i] to sketches[group[i]] (unit weights) in one vectorized pass
+    Every sketch must share one relative accuracy. Costs a few NumPy calls
+    plus a loop over the distinct (group, bucket) pairs, instead of an
+    add_many per group.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return
+    if values.min() < 0:
+        raise ValueError("QuantileSketch only holds non-negative values")
+    groups = len(sketches)
+    counts = np.bincount(group, minlength=groups).tolist()
+    sums = np.bincount(group, weights=values, minlength=groups).tolist()
+    lows = np.full(groups, np.inf)
+    np.minimum.at(lows, group, values)
+    highs = np.full(groups, -np.inf)
+    np.maximum.at(highs, group, values)
+    zero = values <= MIN_VALUE
+    zeros = np.bincount(group[zero], minlength=groups).tolist()
+
+    positive = ~zero
+    if positive.any():
+        indices = np.ceil(np.log(values[positive]) / sketches[0]._log_gamma).astype(np.int64)
+        lowest = int(indices.min())
+        span = int(indices.max()) - lowest + 1
+        pairs, pair_counts = np.unique(group[positive] * span + (indices - lowest), return_counts=True)
+        # Pairs come sorted by group, so each sketch takes one slice; an empty sketch
+        # takes it with a single dict.update, only the others need a Python loop
+        bounds = np.searchsorted(pairs // span, np.arange(groups + 1)).tolist()
+        bucket_indices = (pairs % span + lowest).tolist()
+        pair_counts = pair_counts.tolist()
+        for sketch, first, last in zip(sketches, bounds, bounds[1:]):
+            if first == last:
+                continue
+            buckets = sketch.buckets
+            if buckets:
+                for index, weight in zip(bucket_indices[first:last], pair_counts[first:last]):
+                    buckets[index] = buckets.get(index, 0) + weight
+            else:
+                buckets.update(zip(bucket_indices[first:last], pair_counts[first:last]))
+
+    for sketch, count, total, low, high, zero_count in zip(sketches, counts, sums, lows.tolist(),
+                                                          highs.tolist(), zeros):
+        if not count:
+            continue
+        sketch.count += count
+        sketch.sum += total
+        sketch.zero_count += zero_count
+        sketch.min = min(sketch.min, low)
+        sketch.max = max(sketch.max, high)
+        if len(sketch.buckets) > sketch.max_buckets:
+            sketch._collapse()
+
+
+class RunMetrics:
+    """
+    Streaming latency and queue-occupancy metrics of one simulation run
+    SimulationEngine reports every completion and every queue length change.
+    Wait (start - arrival), response (completion - arrival) and slowdown
+    (response over the task's run time on its resource) go straight into the
+    per-resource, per-priority and overall sketches, so summaries need no
+    merging. Queue occupancy is time-weighted: each queue length is weighted
+    by how long it lasted; lengths are integers, so the time spent at each
+    length is summed as it happens and the sketch gets one weighted value per
+    distinct length. Observations are buffered and folded into the sketches
+    flush_every at a time, so memory does not grow with the task count.
+    """
+
+    LATENCIES = ('wait', 'response', 'slowdown')
+
+    def __init__(self, resources, relative_accuracy=0.01, flush_every=4096):
+        self.resources = list(resources)
+        self.relative_accuracy = relative_accuracy
+        self.flush_every = flush_every
+        # {metric: QuantileSketch} per resource, per priority and over every task
+        self.by_resource = [self._new_latency() for _ in self.resources]
+        self.by_priority = {}
+        self.overall = self._new_latency()
+
+        count = len(self.resources)
+        self.occupancy = [QuantileSketch(relative_accuracy) for _ in range(count)]
+        self.max_queue_length = [0] * count
+        self._queue_length = [0] * count
+        self._queue_since = [0.0] * count  # When each resource's queue last changed length
+        self._speeds = [resource.compute_speed for resource in self.resources]
+
+        # Buffered observations, folded into the sketches by flush(). Parallel
+        # columns rather than tuples: appending to them allocates nothing the
+        # garbage collector has to track. Task fields are read at flush time
+        self._completions = ([], [], [])  # resource index, task, completion time
+        self._durations = [{} for _ in range(count)]  # Per resource: queue length -> time spent at it
+
+    def record_completion(self, index, task, time):
+        """A task finished on resources[index] at time"""
+        indices, tasks, times = self._completions
+        indices.append(index)
+        tasks.append(task)
+        times.append(time)
+        if len(indices) >= self.flush_every:
+            self._flush_completions()
+
+    def queue_changed(self, index, length, time):
+        """resources[index] has length tasks waiting from time on"""
+        previous = self._queue_length[index]
+        if length == previous:
+            return
+        # Same as close(index, time), inlined: this runs on every queue change
+        duration = time - self._queue_since[index]
+        if duration > 0:
+            durations = self._durations[index]
+            durations[previous] = durations.get(previous, 0) + duration
+            self._queue_since[index] = time
+            if len(durations) >= self.flush_every:
+                self._flush_durations(index)
+        self._queue_length[index] = length
+        if length > self.max_queue_length[index]:
+            self.max_queue_length[index] = length
+
+    def close(self, index, time):
+        """Account the current queue length of resources[index] up to time"""
+        duration = time - self._queue_since[index]
+        if duration > 0:
+            durations = self._durations[index]
+            length = self._queue_length[index]
+            durations[length] = durations.get(length, 0) + duration
+            self._queue_since[index] = time
+            if len(durations) >= self.flush_every:
+                self._flush_durations(index)
+
+    def finish(self, time):
+        """Close every occupancy interval at the end of the run and flush the buffers"""
+        for index in range(len(self.resources)):
+            self.close(index, time)
+        self.flush()
+
+    def flush(self):
+        """Fold every buffered observation into the sketches"""
+        self._flush_completions()
+        for index in range(len(self.resources)):
+            self._flush_durations(index)
+
+    def _flush_completions(self):
+        if not self._completions[0]:
+            return
+        indices, tasks, times = self._completions
+        self._completions = ([], [], [])
+        count = len(tasks)
+        index = np.array(indices, dtype=np.int64)
+        priority = np.fromiter((task.priority for task in tasks), dtype=np.int64, count=count)
+        size = np.fromiter((task.size for task in tasks), dtype=np.float64, count=count)
+        arrival = np.fromiter((task.arrival_time for task in tasks), dtype=np.float64, count=count)
+        start = np.fromiter((task.start_time for task in tasks), dtype=np.float64, count=count)
+        completion = np.array(times, dtype=np.float64)
+
+        wait = np.maximum(start - arrival, 0)
+        response = np.maximum(completion - arrival, 0)
+        run_time = size / np.array(self._speeds, dtype=np.float64)[index]
+        # Each task counts toward its resource, its priority and the overall figures. Groups:
+        # one per resource, then one per priority from the lowest seen up, then the overall one
+        lowest = int(priority.min())
+        span = int(priority.max()) - lowest + 1
+        resources = len(self.resources)
+        sketches = list(self.by_resource)
+        for offset, tasks_at in enumerate(np.bincount(priority - lowest, minlength=span).tolist()):
+            if tasks_at and offset + lowest not in self.by_priority:
+                self.by_priority[offset + lowest] = self._new_latency()
+            # Priorities in between that no task has get a throwaway group that stays empty
+            sketches.append(self.by_priority[offset + lowest] if tasks_at else self._new_latency())
+        sketches.append(self.overall)
+        group = np.concatenate([index, resources + priority - lowest, np.full(count, resources + span)])
+
+        # All three metrics in one pass: metric m of group g goes to sketch m * width + g
+        timed = np.tile(run_time > 0, 3)
+        wait, response, run_time = np.tile(wait, 3), np.tile(response, 3), np.tile(run_time, 3)
+        width = len(sketches)
+        add_grouped([latency[name] for name in self.LATENCIES for latency in sketches],
+                    np.concatenate([wait, response, response[timed] / run_time[timed]]),
+                    np.concatenate([group, group + width, group[timed] + 2 * width]))
+
+    def _new_latency(self):
+        return {name: QuantileSketch(self.relative_accuracy) for name in self.LATENCIES}
+
+    def _flush_durations(self, index):
+        durations = self._durations[index]
+        if durations:
+            self.occupancy[index].add_many(list(durations), weights=list(durations.values()))
+            durations.clear()
+
+    def resource_summary(self, index):
+        """Latency percentiles and time-weighted queue occupancy of one resource"""
+        self.flush()
+        sketches = self.by_resource[index]
+        occupancy = self.occupancy[index]
+        result = {name: sketch.summary() for name, sketch in sketches.items()}
+        result['queue_length'] = {
+            'mean': occupancy.mean,
+            'p95': occupancy.quantile(0.95),
+            'max': self.max_queue_length[index]
+        }
+        return result
+
+    def priority_summary(self):
+        """Latency percentiles per task priority (string keys, as they come back from JSON)"""
+        self.flush()
+        return {str(priority): {name: sketch.summary() for name, sketch in self.by_priority[priority].items()}
+                for priority in sorted(self.by_priority)}
+
+    def overall_summary(self):
+        """Latency percentiles over every completed task"""
+        self.flush()
+        return {name: sketch.summary() for name, sketch in self.overall.items()}
@@ -0,0 +1,112 @@
+import numpy as np
+
+from scheduling.server_index import ServerIndex
+from simulation.engine import SimulationEngine
+
+
+class MultiDeviceSimulation:
+    """
+    Many devices, each with its own battery and task stream, sharing one server pool
+
+    Device state lives in a DeviceFleet (one array per attribute). Every task
+    is placed online when it arrives, by earliest finish time against the live
+    state of the shared servers (running task, queued work and uploads still in
+    flight), so devices contend for the servers through the event loop. The
+    servers sit in a ServerIndex, so a placement looks at one server per
+    (tier, compute speed) group instead of the whole pool. Local execution is
+    resolved directly on the fleet's arrays.
+    """
+
+    def __init__(self, fleet, servers, upload_time=None, network=None):
+        if not servers:
+            raise ValueError("MultiDeviceSimulation needs at least one shared server")
+        self.fleet = fleet
+        self.servers = list(servers)
+        self.index = ServerIndex(self.servers)
+        self.upload_time = upload_time  # Callable (task, server) -> transfer time
+        self.network = network  # Optional NetworkModel; devices are its transfer sources
+        self.engine = SimulationEngine(None, self.servers, upload_time=upload_time,
+                                       dispatcher=self._dispatch, network=network)
+        self.engine.transfer_source = lambda task: self.owners[task.row]
+        self.tasks = None
+        self.owners = None
+        self.local = None  # Per-task flag: ran on its own device
+
+    def run(self, tasks, owners):
+        """
+        Simulate a TaskTable whose row i is issued by device owners[i]
+        Returns the time of the last event
+        """
+        self.tasks = tasks
+        self.owners = np.asarray(owners)
+        self.local = np.zeros(len(tasks), dtype=bool)
+
+        arrival_times = tasks.column('arrival_time').tolist()
+        for task, arrival_time in zip(tasks, arrival_times):
+            self.engine.submit(task, arrival_time)
+        self.engine.run()
+        return self.engine.clock
+
+    def _dispatch(self, task, time):
+        """Place an arriving task: returns a server index, or None after running it locally"""
+        device = self.owners[task.row]
+        size = task.size
+
+        if self.network is not None:
+            def transfer(task, server):
+                return self.network.expected_transfer_time(task.data_size, server, time, device)
+        else:
+            transfer = self.upload_time
+        best_index, _ = self.index.best_position(task, time, transfer,
+                                                 self.fleet.estimate_finish_time(device, size, time))
+
+        if best_index is None:
+            start, finish = self.fleet.run_local(device, size, time)
+            task.start_time = start
+            task.completion_time = finish
+            task.assigned_server = "local"
+            self.local[task.row] = True
+        return best_index
+
+    def device_metrics(self):
+        """Per-device arrays aggregated in bulk from the task columns"""
+        owners = self.owners
+        devices = len(self.fleet)
+        arrival = self.tasks.column('arrival_time')
+        completion = self.tasks.column('completion_time')
+
+        tasks = np.bincount(owners, minlength=devices)
+        local = np.bincount(owners, weights=self.local, minlength=devices).astype(np.int64)
+        response = np.bincount(owners, weights=completion - arrival, minlength=devices)
+        makespan = np.zeros(devices)
+        np.maximum.at(makespan, owners, completion)
+
+        return {
+            'tasks': tasks,
+            'local': local,
+            'offloaded': tasks - local,
+            'mean_response_time': response / np.maximum(tasks, 1),
+            'makespan': makespan,
+            'energy_consumed': self.fleet.energy_consumed,
+            'battery_remaining': self.fleet.remaining_battery
+        }
+
+    def summary(self):
+        """Fleet-wide scalar metrics"""
+        metrics = self.device_metrics()
+        response = self.tasks.column('completion_time') - self.tasks.column('arrival_time')
+        total_tasks = len(self.tasks)
+        offloaded = int(metrics['offloaded'].sum())
+
+        return {
+            'devices': len(self.fleet),
+            'tasks_processed': total_tasks,
+            'makespan': self.tasks.makespan(),
+            'percentage_offloaded': offloaded / total_tasks * 100 if total_tasks else 0,
+            'mean_response_time': float(response.mean()) if total_tasks else 0,
+            'p95_response_time': float(np.percentile(response, 95)) if total_tasks else 0,
+            'total_energy_consumed': float(self.fleet.energy_consumed.sum()),
+            'devices_depleted': int((self.fleet.remaining_battery < self.fleet.BASE_ENERGY_COST).sum()),
+            'server_tasks': {server.name: len(server.completed_tasks) for server in self.servers},
+            'events_processed': self.engine.events_processed
+        }
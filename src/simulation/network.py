@@ -0,0 +1,279 @@
+import heapq
+import itertools
+from bisect import bisect_left, insort
+
+from models.server import ServerTier
+
+
+class SizeLedger:
+    """
+    Multiset of sizes answering capped_sum(cap) = sum(min(size, cap))
+    Sizes sit in sorted blocks with per-block sums and counts, so adds,
+    removals and queries cost O(sqrt n) list operations (mostly in C)
+    instead of a scan over every entry
+    """
+
+    BLOCK_SIZE = 64
+
+    def __init__(self):
+        self._blocks = []  # Sorted lists; every value in a block is <= those in the next
+        self._maxes = []
+        self._sums = []
+        self._counts = []
+        self.count = 0
+
+    def _refresh(self, i):
+        block = self._blocks[i]
+        self._maxes[i] = block[-1]
+        self._sums[i] = sum(block)
+        self._counts[i] = len(block)
+
+    def add(self, size):
+        blocks = self._blocks
+        self.count += 1
+        if not blocks:
+            blocks.append([size])
+            self._maxes.append(size)
+            self._sums.append(size)
+            self._counts.append(1)
+            return
+
+        i = min(bisect_left(self._maxes, size), len(blocks) - 1)
+        block = blocks[i]
+        insort(block, size)
+        if len(block) > 2 * self.BLOCK_SIZE:
+            blocks[i:i + 1] = [block[:self.BLOCK_SIZE], block[self.BLOCK_SIZE:]]
+            for column in (self._maxes, self._sums, self._counts):
+                column.insert(i + 1, 0)
+            self._refresh(i)
+            self._refresh(i + 1)
+        else:
+            # Running totals; a block is only re-summed when it splits
+            self._maxes[i] = block[-1]
+            self._sums[i] += size
+            self._counts[i] += 1
+
+    def remove(self, size):
+        i = bisect_left(self._maxes, size)
+        block = self._blocks[i] if i < len(self._blocks) else []
+        j = bisect_left(block, size)
+        if j == len(block) or block[j] != size:
+            raise ValueError(f"Size {size} is not in the ledger")
+        del block[j]
+        self.count -= 1
+        if block:
+            self._maxes[i] = block[-1]
+            self._sums[i] -= size
+            self._counts[i] -= 1
+        else:
+            for column in (self._blocks, self._maxes, self._sums, self._counts):
+                del column[i]
+
+    def capped_sum(self, cap):
+        """Sum of min(size, cap) over every size"""
+        i = bisect_left(self._maxes, cap)  # Blocks before i hold only sizes below cap
+        total = sum(self._sums[:i])
+        counted = sum(self._counts[:i])
+        if i < len(self._blocks):
+            block = self._blocks[i]
+            j = bisect_left(block, cap)
+            total += sum(block[:j])
+            counted += j
+        return total + cap * (self.count - counted)
+
+    def __len__(self):
+        return self.count
+
+
+class Link:
+    """
+    A network link with a fixed capacity shared by the transfers crossing it
+
+    Active transfers share the capacity equally (processor sharing). The link
+    keeps a virtual time, the data each active transfer has received so far,
+    and every transfer a virtual finish tag (virtual time at its start plus
+    its data), so the next transfer to finish is the smallest tag and a start
+    or finish costs O(log n) however many transfers are active. The share
+    ignores the transfer's other links: one held back elsewhere on its route
+    still takes a full share here.
+    """
+
+    def __init__(self, name, capacity):
+        self.name = name
+        self.capacity = capacity  # MB per time unit
+        self.flows = {}  # Active transfer -> virtual finish tag
+        self.reserved = {}  # task id -> data size of transfers planned but not started
+        self.virtual_time = 0.0
+        self.updated = 0.0  # Time virtual_time was last brought up to date
+        self.version = 0  # Bumped whenever the set of active transfers changes
+        self._finish_order = []  # Heap of (tag, sequence, flow)
+        self._sequence = itertools.count()
+        self._tags = SizeLedger()
+        self._reserved_sizes = SizeLedger()
+        self._changes = 0  # Bumped by every flow or reservation change
+        self._last_backlog = (None, 0)  # ((data_size, time, changes), backlog) of the latest query
+
+    def _virtual_time_at(self, time):
+        if not self.flows:
+            return self.virtual_time
+        return self.virtual_time + (time - self.updated) * self.capacity / len(self.flows)
+
+    def _advance(self, time):
+        self.virtual_time = self._virtual_time_at(time)
+        self.updated = time
+
+    def add_flow(self, flow, size, time):
+        self._advance(time)
+        tag = self.virtual_time + size
+        self.flows[flow] = tag
+        heapq.heappush(self._finish_order, (tag, next(self._sequence), flow))
+        self._tags.add(tag)
+        self.version += 1
+        self._changes += 1
+
+    def next_finish(self):
+        """Time the earliest active transfer finishes at the current share, or None when idle"""
+        if not self.flows:
+            return None
+        tag = self._finish_order[0][0]
+        return self.updated + max(tag - self.virtual_time, 0) * len(self.flows) / self.capacity
+
+    def pop_finished(self, time):
+        """Remove and return the transfer with the smallest finish tag"""
+        self._advance(time)
+        tag, sequence, flow = heapq.heappop(self._finish_order)
+        del self.flows[flow]
+        self._tags.remove(tag)
+        self.version += 1
+        self._changes += 1
+        return flow
+
+    def reserve(self, task_id, size):
+        self.unreserve(task_id)
+        self.reserved[task_id] = size
+        self._reserved_sizes.add(size)
+        self._changes += 1
+
+    def unreserve(self, task_id):
+        size = self.reserved.pop(task_id, None)
+        if size is not None:
+            self._reserved_sizes.remove(size)
+            self._changes += 1
+
+    def backlog(self, data_size, time):
+        """
+        Data the link sends before a new transfer of data_size completes, excluding it:
+        each active or planned transfer contributes up to data_size of what it has left
+        Servers sharing this link ask the same question in one decision, so the latest answer is kept
+        """
+        key = (data_size, time, self._changes)
+        if self._last_backlog[0] == key:
+            return self._last_backlog[1]
+        virtual_time = self._virtual_time_at(time)
+        active = self._tags.capped_sum(virtual_time + data_size) - len(self.flows) * virtual_time
+        backlog = max(active, 0) + self._reserved_sizes.capped_sum(data_size)
+        self._last_backlog = (key, backlog)
+        return backlog
+
+    def __str__(self):
+        return f"Link(name={self.name}, capacity={self.capacity}, flows={len(self.flows)})"
+
+
+class Flow:
+    """
+    One task's upload in progress
+    It crosses every link on its route at that link's share and is done once the last one has carried it
+    """
+
+    __slots__ = ('task', 'resource_index', 'links', 'pending')
+
+    def __init__(self, task, resource_index, links):
+        self.task = task
+        self.resource_index = resource_index
+        self.links = links
+        self.pending = 0  # Links still carrying the data
+
+
+class NetworkModel:
+    """
+    Shared-bandwidth network of wireless access links and a wired backhaul
+
+    Each link shares its capacity equally among the transfers crossing it
+    (processor sharing), tracked with a per-link virtual time so a transfer
+    starting or finishing costs O(log n) per link and puts one event on the
+    heap per link whose next completion moved. A transfer is done once every
+    link on its route has carried its data, so the slowest link decides, the
+    same rule expected_transfer_time uses for its estimates.
+
+    Links share independently of each other, so this is per-link processor
+    sharing rather than max-min fairness: a cloud upload bottlenecked on its
+    wireless link still takes a full backhaul share, and capacity it leaves
+    unused there is not handed to the other backhaul transfers.
+    """
+
+    def __init__(self, wireless_speed=100, wired_speed=1000, access_links=1):
+        self.access = [Link(f"wireless{i}", wireless_speed) for i in range(access_links)]
+        self.backhaul = Link("backhaul", wired_speed)
+        self.clock = 0
+
+    def route(self, server, source=0):
+        """
+        Links a transfer from the given source device to the server crosses
+        Edge servers sit behind the source's access link; cloud adds the backhaul
+        """
+        if server.tier is ServerTier.EDGE:
+            return (self.access[source % len(self.access)],)
+
+        if server.tier is ServerTier.CLOUD:
+            return (self.access[source % len(self.access)], self.backhaul)
+
+        return ()  # No transfer for local execution
+
+    def reserve(self, task, server, source=0):
+        """Record a planned transfer so estimates made before it starts account for it"""
+        for link in self.route(server, source):
+            link.reserve(task.id, task.data_size)
+
+    def expected_transfer_time(self, data_size, server, time=None, source=0):
+        """
+        Expected duration of a new transfer under processor sharing
+        On each link the new transfer finishes once it has sent data_size while
+        every other transfer got an equal share (up to its own remaining data);
+        the slowest link on the route decides. Running ledgers of the active
+        finish tags and planned sizes answer this without scanning them.
+        """
+        time = self.clock if time is None else time
+        if data_size <= 0:
+            return 0
+
+        duration = 0
+        for link in self.route(server, source):
+            duration = max(duration, (data_size + link.backlog(data_size, time)) / link.capacity)
+        return duration
+
+    def start_transfer(self, task, server, resource_index, time, source=0):
+        """
+        Begin uploading a task's data
+        Returns the new Flow; one with no data or no links to cross (pending == 0) is already done
+        """
+        self.clock = time
+        links = self.route(server, source)
+        for link in links:
+            link.unreserve(task.id)
+
+        flow = Flow(task, resource_index, links)
+        if task.data_size > 0:
+            for link in links:
+                link.add_flow(flow, task.data_size, time)
+            flow.pending = len(links)
+        return flow
+
+    def finish_on_link(self, link, time):
+        """
+        The earliest transfer on the link has sent its data there
+        Returns its Flow once every link on its route is done, else None
+        """
+        self.clock = time
+        flow = link.pop_finished(time)
+        flow.pending -= 1
+        return flow if not flow.pending else None
@@ -0,0 +1,24 @@
+"""
+Tracing package for OS Scheduling Simulator
+Contains level-gated logging helpers and the structured event log
+"""
+
+from .event_log import (
+    get_logger,
+    configure_logging,
+    event_log,
+    EventLog,
+    JsonlEventSink,
+    BinaryEventSink,
+    read_binary_events
+)
+
+__all__ = [
+    'get_logger',
+    'configure_logging',
+    'event_log',
+    'EventLog',
+    'JsonlEventSink',
+    'BinaryEventSink',
+    'read_binary_events'
+]
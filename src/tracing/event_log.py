@@ -0,0 +1,113 @@
+import json
+import logging
+import struct
+
+import numpy as np
+
+LOGGER_NAME = "os_scheduling_simulator"
+
+# Event kinds and the meaning of their two numeric fields
+EVENT_KINDS = {
+    'decision': (1, ('time', 'size')),  # Scheduling decision: decision time, task size
+    'energy': (2, ('cost', 'remaining'))  # Battery debit: energy cost, battery left
+}
+KIND_NAMES = {code: name for name, (code, fields) in EVENT_KINDS.items()}
+
+# Binary record: kind, task id, server code, two float fields
+RECORD_FORMAT = '<BqIdd'
+RECORD_DTYPE = np.dtype([('kind', '<u1'), ('task_id', '<i8'), ('server', '<u4'),
+                         ('a', '<f8'), ('b', '<f8')])
+
+
+def get_logger(name):
+    """Logger under the simulator's namespace (debug output is off unless configured)"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def configure_logging(level="WARNING"):
+    """Send simulator log records to stderr at the given level"""
+    logging.basicConfig(format="%(levelname)s %(name)s: %(message)s")
+    logging.getLogger(LOGGER_NAME).setLevel(level)
+
+
+class JsonlEventSink:
+    """
+    Writes one JSON object per event, readable with pandas.read_json(lines=True)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w')
+
+    def write(self, kind, task_id, server, a, b):
+        first, second = EVENT_KINDS[kind][1]
+        self.file.write(json.dumps({'kind': kind, 'task_id': task_id, 'server': server,
+                                    first: a, second: b}) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class BinaryEventSink:
+    """
+    Writes fixed-size packed records; server names are stored once in a sidecar JSON
+    Load the result with read_binary_events
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.server_codes = {}
+        self._pack = struct.Struct(RECORD_FORMAT).pack
+
+    def write(self, kind, task_id, server, a, b):
+        code = self.server_codes.get(server)
+        if code is None:
+            code = self.server_codes[server] = len(self.server_codes)
+        self.file.write(self._pack(EVENT_KINDS[kind][0], task_id, code, a, b))
+
+    def close(self):
+        self.file.close()
+        with open(f"{self.path}.servers.json", 'w') as f:
+            json.dump(sorted(self.server_codes, key=self.server_codes.get), f)
+
+
+def read_binary_events(path):
+    """Load a binary event log as (structured array, server names)"""
+    with open(f"{path}.servers.json") as f:
+        server_names = json.load(f)
+    return np.fromfile(path, dtype=RECORD_DTYPE), server_names
+
+
+class EventLog:
+    """
+    Process-wide structured event log
+    Hot paths check `event_log.enabled` before building an event, so the log
+    costs a single attribute read when no sink is attached
+    """
+
+    def __init__(self):
+        self.sink = None
+        self.enabled = False
+
+    def open(self, path):
+        """Attach a sink chosen by file extension (.jsonl for text, anything else binary)"""
+        self.close()
+        self.sink = JsonlEventSink(path) if path.endswith('.jsonl') else BinaryEventSink(path)
+        self.enabled = True
+        return self.sink
+
+    def close(self):
+        """Flush and detach the current sink"""
+        if self.sink is not None:
+            self.sink.close()
+        self.sink = None
+        self.enabled = False
+
+    def record(self, kind, task_id, server, a=0.0, b=0.0):
+        """Record one event with its two numeric fields"""
+        if self.enabled:
+            self.sink.write(kind, task_id, server, a, b)
+
+
+event_log = EventLog()
@@ -51,3 +51,354 @@ except Exception as e:
     import traceback
 
     traceback.print_exc()
+
+
+def test_parallel_runs_match_serial():
+    import tempfile
+    from experiments.scenario_runner import ScenarioRunner
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = ScenarioRunner(output_dir)
+        serial = runner.run_all_scenarios(jobs=1, repetitions=2, base_seed=11)
+        parallel = runner.run_all_scenarios(jobs=2, repetitions=2, base_seed=11)
+
+    assert [(r['scenario_id'], r['replication']) for r in parallel] == \
+        [(sid, rep) for sid in range(1, 7) for rep in range(2)]
+    assert [r['seed'] for r in serial] == [r['seed'] for r in parallel]
+    assert [r['makespan'] for r in serial] == [r['makespan'] for r in parallel]
+
+
+def test_parameter_sweep_skips_finished_runs():
+    import json
+    import tempfile
+    from experiments.parameter_sweep import ParameterSweep
+
+    space = {'battery': ['low'], 'wireless_speed': ['fast', 'slow'], 'workload': ['mixed'],
+             'strategy': ['intelligent']}
+    with tempfile.TemporaryDirectory() as output_dir:
+        sweep = ParameterSweep(space, replications=2, base_seed=3, output_dir=output_dir)
+        first = sweep.run()
+
+        rerun = ParameterSweep(space, replications=3, base_seed=3, output_dir=output_dir)
+        assert len(rerun.load_completed()) == 4
+        second = rerun.run()
+
+        assert len(rerun.load_completed()) == 6
+        assert [p['point'] for p in second] == sweep.grid_points()
+        assert second[0]['replications'] == 3
+        assert first[0]['makespan']['ci95'] >= 0
+        assert len(sweep.latin_hypercube_points(4)) <= 4
+
+        # Runs logged under another base seed or older code are not reused
+        with open(rerun.runs_file) as f:
+            records = [json.loads(line) for line in f]
+        records[0]['code'] = 'stale'
+        with open(rerun.runs_file, 'w') as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        reseeded = ParameterSweep(space, replications=3, base_seed=4, output_dir=output_dir)
+        assert reseeded.run()[0]['replications'] == 3
+        assert len(reseeded.load_completed()) == 12
+        assert rerun.run()[0]['replications'] == 3
+        assert len(rerun.load_completed()) == 13
+
+
+def test_result_cache_reuses_seeded_runs():
+    import json
+    import tempfile
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+    from experiments.result_cache import ResultCache
+    from experiments.result_store import read_task_results
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        cache = ResultCache(os.path.join(output_dir, "cache"), max_entries=2)
+        runner = ScenarioRunner(output_dir, cache=cache)
+
+        first = runner.run_scenario(1, SCENARIOS[1], seed=5)
+        tasks_path = os.path.join(output_dir, "scenario_1_tasks.npz")
+        written = read_task_results(tasks_path)
+        os.remove(tasks_path)
+        os.remove(os.path.join(output_dir, "results_scenario_1.csv"))
+        again = runner.run_scenario(1, SCENARIOS[1], seed=5)
+        assert cache.hits == 1
+        assert again['makespan'] == first['makespan']
+        # A hit still writes the per-task files, from the columns cached with the entry
+        assert os.path.exists(os.path.join(output_dir, "results_scenario_1.csv"))
+        assert np.array_equal(read_task_results(tasks_path).column('completion_time'),
+                              written.column('completion_time'))
+
+        # Overwriting an entry replaces its bytes in the running total
+        key = cache.key(SCENARIOS[1], 5, 'servers')
+        cache.put(key, first, written)
+        cache.put(key, first)
+        assert cache._usage == cache._scan_usage()
+        cache.evict()
+
+        runner.run_scenario(2, SCENARIOS[2], seed=5)
+        runner.run_scenario(3, SCENARIOS[3], seed=5)
+        assert len(cache._entries()) == 2
+
+        # A trace rewritten in place is a different run, though its path is the same
+        trace = os.path.join(output_dir, "trace.jsonl")
+        config = dict(SCENARIOS[1], trace=trace)
+        for count in (10, 10, 12):
+            with open(trace, 'w') as f:
+                f.writelines(json.dumps({'task_id': i, 'size': 10 + i, 'data_size': 5}) + "\n" for i in range(count))
+            os.utime(trace, ns=(count, count))
+            result = runner.run_scenario(1, config, seed=5)
+            assert result['tasks_processed'] == count
+        assert cache.hits == 2
+
+
+def test_streaming_workload_is_lazy_and_ordered():
+    import itertools
+    from experiments.workload_generator import (stream_workload, stream_task_chunks,
+                                                MMPPArrivals, DiurnalArrivals)
+
+    # An unbounded stream only materializes what is consumed
+    tasks = list(itertools.islice(stream_workload("mixed", chunk_size=64, rng=np.random.default_rng(1)), 100))
+    assert [t.id for t in tasks] == list(range(100))
+    assert all(10 <= t.size < 50 for t in tasks[::2])
+    assert all(80 <= t.size < 150 for t in tasks[1::2])
+
+    for arrivals in (MMPPArrivals(), DiurnalArrivals(period=50.0)):
+        chunks = list(stream_task_chunks("many_small", arrivals, chunk_size=500,
+                                         rng=np.random.default_rng(2), limit=1200))
+        assert [len(c) for c in chunks] == [500, 500, 200]
+        times = np.concatenate([c.column('arrival_time') for c in chunks])
+        assert np.all(np.diff(times) >= 0)
+
+
+def test_threshold_tuner_matches_static_runs():
+    import tempfile
+    from experiments.scenario_runner import ScenarioRunner
+    from experiments.threshold_tuner import ThresholdTuner
+    from scheduling.list_scheduler import ListScheduler
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = ScenarioRunner(output_dir)
+        device, servers, wireless_speed = runner.setup_servers("slow")
+        device.remaining_battery = 100  # Low enough that the battery decides some placements
+        tasks = runner.create_workload("mixed", 120, rng=np.random.RandomState(4))
+        tuner = ThresholdTuner(device, servers, wireless_speed)
+        results = tuner.evaluate(tasks, [0, 40, 100, 200], [0, 30, 300])
+
+        for k in range(len(results['makespan'])):
+            device, servers, wireless_speed = runner.setup_servers("slow")
+            device.remaining_battery = 100
+            scheduler = ListScheduler(device, servers, "static", wireless_speed=wireless_speed)
+            scheduler.offload_strategy.size_threshold = results['size_threshold'][k]
+            scheduler.offload_strategy.data_threshold = results['data_threshold'][k]
+            scheduler.schedule_tasks(runner.create_workload("mixed", 120, rng=np.random.RandomState(4)))
+            scheduler.process_all_queues()
+            assert abs(scheduler.get_makespan() - results['makespan'][k]) < 1e-6
+            assert abs(device.energy_consumed - results['energy'][k]) < 1e-6
+
+    front = tuner.pareto_front(results)
+    for point in front:
+        assert not np.any((results['makespan'] <= point['makespan']) & (results['energy'] < point['energy']))
+
+
+def test_trace_replay_streams_chunks():
+    import json
+    import tempfile
+    import pandas as pd
+    from experiments import trace_loader
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+    from scheduling.list_scheduler import ListScheduler
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = ScenarioRunner(output_dir)
+        tasks = runner.create_workload("mixed", 500, rng=np.random.RandomState(8))
+        for i, task in enumerate(tasks):
+            task.arrival_time = i * 0.5
+        records = [{'task_id': t.id, 'size': t.size, 'priority': t.priority, 'data_size': t.data_size,
+                    'arrival_time': t.arrival_time} for t in tasks]
+
+        paths = {fmt: os.path.join(output_dir, f"trace.{fmt}") for fmt in ('json', 'jsonl', 'csv')}
+        with open(paths['json'], 'w') as f:
+            json.dump(records, f)
+        with open(paths['jsonl'], 'w') as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        pd.DataFrame(records).rename(columns={'size': 'work'}).to_csv(paths['csv'], index=False)
+
+        # Small blocks make JSONL lines straddle block boundaries
+        block_bytes = trace_loader.JSONL_BLOCK_BYTES
+        trace_loader.JSONL_BLOCK_BYTES = 1000
+        try:
+            for fmt, path in paths.items():
+                columns = {'size': 'work'} if fmt == 'csv' else None
+                chunks = list(trace_loader.stream_trace_chunks(path, columns, chunk_size=64))
+                assert all(len(chunk) <= 64 for chunk in chunks)
+                assert np.concatenate([c.column('size') for c in chunks]).tolist() == [t.size for t in tasks]
+                assert np.concatenate([c.column('id') for c in chunks]).tolist() == [t.id for t in tasks]
+        finally:
+            trace_loader.JSONL_BLOCK_BYTES = block_bytes
+
+        # Streaming a trace into an online run gives the same schedule as passing the list
+        makespans = []
+        for workload in (tasks, trace_loader.stream_trace(paths['jsonl'], chunk_size=50)):
+            device, servers, wireless_speed = runner.setup_servers("fast")
+            scheduler = ListScheduler(device, servers, wireless_speed=wireless_speed)
+            scheduler.run_online(workload, submit_window=32)
+            assert len(scheduler.assigned_tasks) == 500
+            makespans.append(scheduler.get_makespan())
+        assert makespans[0] == makespans[1]
+
+        config = dict(SCENARIOS[1], trace=paths['csv'], trace_columns={'size': 'work'}, mode='online',
+                      network='ideal')
+        result = runner.run_scenario(1, config, save_files=False)
+        assert result['tasks_processed'] == 500
+        assert result['makespan'] == makespans[0]
+
+        # Offline replays hold the trace in memory, so one past the limit is refused
+        offline = dict(config, mode='offline', max_offline_tasks=499)
+        try:
+            runner.run_scenario(1, offline, save_files=False)
+            assert False, "an offline replay past max_offline_tasks should be rejected"
+        except ValueError as error:
+            assert "mode='online'" in str(error)
+        assert runner.run_scenario(1, dict(offline, max_offline_tasks=500), save_files=False)['tasks_processed'] == 500
+
+        # Fields a record leaves out take Task defaults, even when the first record lacks them
+        sparse = os.path.join(output_dir, "sparse.jsonl")
+        with open(sparse, 'w') as f:
+            f.write('{"task_id": 0, "size": 5}\n{"task_id": 1, "size": 6, "priority": 3, "data_size": 7.5}\n')
+        chunk = next(trace_loader.stream_trace_chunks(sparse))
+        assert chunk.column('priority').tolist() == [1, 3]
+        assert chunk.column('data_size').tolist() == [0, 7.5]
+        with open(sparse, 'a') as f:
+            f.write('{"task_id": 2, "priority": 2}\n')
+        try:
+            list(trace_loader.stream_trace_chunks(sparse))
+            assert False, "a record without a size should be rejected"
+        except ValueError as error:
+            assert "'size'" in str(error)
+
+
+def test_task_results_round_trip_in_columnar_layouts():
+    import tempfile
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+    from experiments.results_plotter import ResultsPlotter
+    from experiments.result_store import write_task_results, read_task_results
+    from experiments.trace_loader import stream_trace_chunks
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = ScenarioRunner(output_dir, result_format="npy")
+        runner.run_scenario(3, dict(SCENARIOS[3], num_tasks=40), seed=2)
+
+        # The npy layout is memory-mapped and carries every task's lifecycle
+        table = ResultsPlotter(output_dir, os.path.join(output_dir, "plots")).load_task_results(3)
+        assert isinstance(table.column('completion_time'), np.memmap)
+        assert len(table) == 40 and not np.isnan(table.column('completion_time')).any()
+        assert np.all(table.column('start_time') >= table.column('arrival_time'))
+        rerun = runner.run_scenario(3, dict(SCENARIOS[3], num_tasks=40), seed=2, save_files=False)
+        assert table.makespan() == rerun['makespan']
+        assert set(table.server_names) <= {"LocalDevice", "EdgeServer1", "EdgeServer2", "CloudServer"}
+
+        npz_path = write_task_results(table, os.path.join(output_dir, "copy.npz"))
+        copy = read_task_results(npz_path)
+        assert isinstance(copy.column('completion_time'), np.memmap)
+        for name in ('id', 'size', 'start_time', 'completion_time', 'server'):
+            assert np.array_equal(copy.column(name), table.column(name), equal_nan=True)
+        assert copy.server_names == table.server_names
+
+        # Result files replay as traces
+        replayed = list(stream_trace_chunks(npz_path, chunk_size=16))
+        assert [len(chunk) for chunk in replayed] == [16, 16, 8]
+        assert np.concatenate([c.column('size') for c in replayed]).tolist() == table.column('size').tolist()
+        # trace_columns applies to result files too: replay the completions as arrivals
+        followup = next(stream_trace_chunks(npz_path, {'arrival_time': 'completion_time'}))
+        assert followup.column('arrival_time').tolist() == table.column('completion_time').tolist()
+
+
+def test_plotter_renders_headless_and_skips_unchanged_inputs():
+    import tempfile
+    import matplotlib
+    from experiments.results_plotter import ResultsPlotter, PREVIEW_DPI
+    from experiments.result_store import write_task_results
+    from models.task_table import TaskTable
+
+    results = [{'scenario_id': i, 'makespan': 10.0 * i, 'total_energy_consumed': 5.0 * i,
+                'battery_level': 'low' if i % 2 else 'high',
+                'queue_stats': {'device': {'tasks_processed': i, 'tier': 'local'},
+                                'EdgeServer1': {'tasks_processed': 2 * i, 'tier': 'edge'},
+                                'CloudServer': {'tasks_processed': 3, 'tier': 'cloud'}}}
+               for i in range(1, 4)]
+
+    with tempfile.TemporaryDirectory() as plots_dir:
+        plotter = ResultsPlotter(plots_dir, plots_dir, preview=True)
+        assert matplotlib.get_backend().lower() == 'agg' and plotter.dpi == PREVIEW_DPI
+
+        assert len(plotter.render(results, jobs=2)) == len(ResultsPlotter.CHARTS)
+        assert all(os.path.exists(os.path.join(plots_dir, name)) for name in ResultsPlotter.CHARTS)
+        assert plotter.render(results) == []
+
+        # A changed input or resolution redraws; a deleted chart is redrawn on its own
+        results[0]['makespan'] = 11.0
+        assert len(plotter.render(results)) == len(ResultsPlotter.CHARTS)
+        os.remove(os.path.join(plots_dir, "energy_impact_chart.png"))
+        assert plotter.stale_charts(results) == ["energy_impact_chart.png"]
+        rescaled = ResultsPlotter(plots_dir, plots_dir, dpi=PREVIEW_DPI + 1)
+        assert len(rescaled.stale_charts(results)) == len(ResultsPlotter.CHARTS)
+
+        # The per-task files behind the distribution charts are inputs too
+        assert len(plotter.render(results)) == 1 and plotter.stale_charts(results) == []
+        write_task_results(TaskTable.from_arrays([4.0, 8.0]), os.path.join(plots_dir, "scenario_1_tasks.npz"))
+        assert len(plotter.stale_charts(results)) == len(ResultsPlotter.CHARTS)
+
+
+def test_plotter_aggregates_replications_and_per_task_results():
+    import tempfile
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+    from experiments.results_plotter import ResultsPlotter, percentile_table, results_frame, tier_table
+
+    # 2000 runs of 4 scenarios collapse to 4 rows before anything is drawn
+    rng = np.random.default_rng(0)
+    results = [{'scenario_id': run % 4, 'replication': run // 4, 'makespan': float(value),
+                'total_energy_consumed': 1.0, 'battery_level': 'high',
+                'queue_stats': {'device': {'tasks_processed': 1},
+                                'EdgeServer1': {'tasks_processed': 2, 'tier': 'edge'},
+                                'EdgeServer2': {'tasks_processed': 3, 'tier': 'edge'}}}
+               for run, value in enumerate(rng.normal(100, 10, 2000))]
+    stats = percentile_table(results_frame(results), 'makespan')
+    assert stats.index.tolist() == [0, 1, 2, 3] and stats['runs'].tolist() == [500] * 4
+    assert (stats['p5'] < stats['p50']).all() and (stats['p50'] < stats['p95']).all()
+    assert tier_table(results).loc[0].tolist() == [1, 5, 0]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = ScenarioRunner(output_dir)
+        runs = [runner.run_scenario(1, dict(SCENARIOS[1], num_tasks=30), seed=seed, replication=seed)
+                for seed in range(2)]
+
+        # The CDF pools the per-task results of both replications
+        levels = np.linspace(0, 1, 5)
+        quantiles = ResultsPlotter(output_dir, output_dir).response_time_quantiles(runs, levels)
+        tables = [ResultsPlotter(output_dir, output_dir).load_task_results(file_id) for file_id in ("1", "1_rep1")]
+        pooled = np.concatenate([t.column('completion_time') - t.column('arrival_time') for t in tables])
+        assert np.allclose(quantiles[1], np.quantile(pooled, levels))
+
+        # Sweeps too large for bars still render every chart
+        sweep = [dict(result, scenario_id=run) for run, result in enumerate(results)]
+        assert len(ResultsPlotter(output_dir, output_dir, preview=True).render(sweep)) == len(ResultsPlotter.CHARTS)
+
+
+def test_queue_stats_report_tail_latency_and_true_queue_lengths():
+    import tempfile
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        result = ScenarioRunner(output_dir).run_scenario(2, dict(SCENARIOS[2], num_tasks=80), seed=4)
+
+    # Queues are measured while the run is live, not after they have drained
+    stats = result['queue_stats']
+    assert max(server['max_queue_length'] for server in stats.values()) > 1
+    for server in stats.values():
+        assert server['avg_queue_length'] <= server['max_queue_length']
+        wait = server['wait']
+        assert wait['p50'] <= wait['p99'] * 1.01 and wait['p99'] <= wait['max']
+        assert wait['count'] == server['tasks_processed']
+
+    # Per-priority and overall percentiles cover every task
+    assert sum(p['response']['count'] for p in result['priority_stats'].values()) == 80
+    assert result['latency_percentiles']['response']['count'] == 80
+    assert result['latency_percentiles']['slowdown']['p50'] >= 0.99  # Within the sketch's 1% of >= 1
@@ -17,6 +17,7 @@ print(f"Looking for modules in: {src_path}")
 from models.task import Task
 from models.device import Device
 from models.server import Server
+from models.task_table import TaskTable
 from scheduling.offload_strategy import StaticOffloadStrategy, IntelligentOffloadStrategy
 from scheduling.list_scheduler import ListScheduler
 
@@ -74,5 +75,53 @@ def test_basic_models():
     print(f"Cloud: {cloud_server.get_queue_length()}")
 
 
+def test_server_queue_aggregates():
+    print("=== Testing Server Queue Aggregates ===")
+
+    server = Server("EdgeServer1", compute_speed=4.0, network_delay=1)
+    tasks = [Task(1, size=30, priority=2), Task(2, size=10, priority=1), Task(3, size=20, priority=2)]
+    for task in tasks:
+        server.add_to_queue(task)
+
+    assert server.get_queue_length() == 3
+    assert server.get_queue_load() == 60
+    assert server.get_priority_load(2) == 50
+    assert server.estimate_finish_time(Task(4, size=40)) == 1 + 60 / 4.0 + 40 / 4.0
+
+    popped = server.pop_next_task()
+    assert popped.id == 2
+    assert server.get_queue_load() == 50
+    assert server.get_priority_load(1) == 0
+
+    server.process_tasks()
+    assert server.get_queue_length() == 0
+    assert server.get_queue_load() == 0
+    assert server.estimate_finish_time(Task(5, size=8)) == 1 + 8 / 4.0
+
+
+def test_task_table_views():
+    print("=== Testing TaskTable ===")
+
+    table = TaskTable.from_arrays([30, 80], data_size=[10, 50], priority=[2, 1])
+    row = table.append(7, size=5, priority=3)
+    assert len(table) == 3 and row == 2
+
+    server = Server("EdgeServer1", compute_speed=5.0)
+    for view in table:
+        server.add_to_queue(view)
+    server.process_tasks()
+
+    assert table.column('server').tolist() == [0, 0, 0]
+    assert table[0].assigned_server == "EdgeServer1"
+    assert table[1].start_time == 0 and table[1].completion_time == 16
+    assert table.makespan() == 23
+
+    round_trip = TaskTable.from_tasks([Task(1, size=30, priority=1, data_size=10)])
+    assert round_trip[0].start_time is None
+    assert round_trip[0].size == 30 and round_trip[0].data_size == 10
+
+
 if __name__ == "__main__":
-    test_basic_models()
\ No newline at end of file
+    test_basic_models()
+    test_server_queue_aggregates()
+    test_task_table_views()
\ No newline at end of file
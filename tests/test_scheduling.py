@@ -1 +1,348 @@
+#!/usr/bin/env python3
+"""
+Tests for offloading strategies and schedulers
+"""
 
+import sys
+import os
+
+import numpy as np
+
+# Add the src directory to Python path
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+from models.task import Task
+from models.device import Device
+from models.server import Server, ServerTier
+from scheduling.list_scheduler import ListScheduler
+from scheduling.offload_strategy import StaticOffloadStrategy, IntelligentOffloadStrategy
+from scheduling.batch_scheduler import BatchScheduler
+from scheduling.server_index import ServerIndex
+from scheduling.lookahead_strategy import LookaheadOffloadStrategy, CoreTimeline
+from scheduling.learned_strategy import FEATURES, LearnedOffloadStrategy, PolicyNetwork
+from tracing.event_log import event_log, read_binary_events
+
+
+def make_system(battery=300):
+    device = Device(battery_capacity=battery)
+    servers = [
+        Server("EdgeServer1", compute_speed=3.0, network_delay=1),
+        Server("EdgeServer2", compute_speed=4.0, network_delay=1),
+        Server("CloudServer", compute_speed=10.0, network_delay=5)
+    ]
+    return device, servers
+
+
+def test_batch_matches_intelligent_strategy():
+    print("=== Testing Batch Scheduler ===")
+
+    rng = np.random.default_rng(7)
+    sizes = rng.integers(10, 150, 500)
+    data_sizes = rng.integers(1, 100, 500)
+    tasks = [Task(i, int(s), 1, int(d)) for i, (s, d) in enumerate(zip(sizes, data_sizes))]
+
+    device, servers = make_system()
+    scheduler = ListScheduler(device, servers, offload_strategy="intelligent")
+    scheduled = scheduler.schedule_tasks(tasks)
+    resources = [device] + servers
+    expected = [resources.index(server) for task, server in scheduled]
+
+    batch_device, batch_servers = make_system()
+    assignment = BatchScheduler(batch_device, batch_servers).assign(sizes, data_sizes)
+
+    assert assignment.tolist() == expected
+    # assign() is side-effect free
+    assert batch_device.remaining_battery == 300
+
+    loads = BatchScheduler(batch_device, batch_servers).queue_loads(sizes, assignment)
+    assert loads.tolist() == [r.get_queue_load() for r in resources]
+
+    # Work already queued, uploading or running delays a resource for both paths alike
+    def in_flight():
+        device, servers = make_system()
+        device.add_to_queue(Task(500, 40, 1))
+        servers[0].add_backlog(600)
+        servers[2].add_to_queue(Task(501, 900, 1))
+        servers[2].add_backlog(1500)
+        return device, servers
+
+    device, servers = in_flight()
+    scheduler = ListScheduler(device, servers, offload_strategy="intelligent")
+    resources = [device] + servers
+    busy = [resources.index(server) for task, server in scheduler.schedule_tasks(tasks[:50])]
+    assert busy != expected[:50]
+    assert BatchScheduler(*in_flight()).assign(sizes[:50], data_sizes[:50]).tolist() == busy
+
+
+def test_schedule_batch_matches_schedule_tasks():
+    print("=== Testing Batch Scheduling Path ===")
+    import tempfile
+    from experiments.scenario_runner import ScenarioRunner, SCENARIOS
+
+    rng = np.random.default_rng(11)
+    sizes = rng.integers(10, 150, 400)
+    data_sizes = rng.integers(1, 100, 400)
+    priorities = rng.integers(1, 4, 400)
+
+    def run(batch):
+        tasks = [Task(i, int(s), int(p), int(d)) for i, (s, d, p) in enumerate(zip(sizes, data_sizes, priorities))]
+        device, servers = make_system()
+        scheduler = ListScheduler(device, servers)
+        scheduled = scheduler.schedule_batch(tasks) if batch else scheduler.schedule_tasks(tasks)
+        queues = [(r.get_queue_length(), r.get_queue_load(), dict(r.priority_load)) for r in [device] + servers]
+        placement = [(task.id, server.name) for task, server in scheduled]
+        battery = device.remaining_battery
+        scheduler.process_all_queues()
+        return placement, queues, battery, [task.completion_time for task in tasks]
+
+    assert run(batch=True) == run(batch=False)
+
+    # The runner's batch flag gives the same results as the per-task path
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = ScenarioRunner(output_dir)
+        config = dict(SCENARIOS[1], num_tasks=200, network='ideal')
+        per_task = runner.run_scenario(1, config, seed=3, save_files=False)
+        batched = runner.run_scenario(1, dict(config, batch=True), seed=3, save_files=False)
+    for key in ('makespan', 'total_energy_consumed', 'offload_stats'):
+        assert batched[key] == per_task[key]
+
+
+def test_event_log_records_decisions_and_energy():
+    print("=== Testing Event Log ===")
+    import json
+    import tempfile
+
+    tasks = [Task(i, size=20, priority=1, data_size=200) for i in range(4)]
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name in ("events.jsonl", "events.bin"):
+            path = os.path.join(log_dir, name)
+            device, servers = make_system()
+            event_log.open(path)
+            try:
+                ListScheduler(device, servers, wireless_speed=10).schedule_tasks(
+                    [Task(t.id, t.size, t.priority, t.data_size) for t in tasks])
+            finally:
+                event_log.close()
+
+            if name.endswith('.jsonl'):
+                with open(path) as f:
+                    records = [json.loads(line) for line in f]
+                kinds = [r['kind'] for r in records]
+            else:
+                records, server_names = read_binary_events(path)
+                kinds = ['decision' if k == 1 else 'energy' for k in records['kind']]
+
+            assert kinds.count('decision') == 4
+            # Slow wireless keeps some data-heavy work local; each local task debits energy once
+            assert kinds.count('energy') == device.get_queue_length() > 0
+
+    assert not event_log.enabled
+
+
+def test_tiers_replace_name_matching():
+    print("=== Testing Server Tiers ===")
+
+    device = Device()
+    metro = Server("metro-a", compute_speed=3.0, tier=ServerTier.EDGE)
+    region = Server("region-1", compute_speed=10.0, tier="cloud")
+    scheduler = ListScheduler(device, [region, metro], offload_strategy="static")
+
+    assert [r.server_id for r in scheduler.resources] == [0, 1, 2]
+    assert scheduler.server_index[2] is metro
+    assert Server("EdgeServer1", 1.0).tier is ServerTier.EDGE
+
+    task = Task(1, size=100, data_size=50)
+    strategy = IntelligentOffloadStrategy(wireless_speed=10, wired_speed=100)
+    assert strategy.calculate_upload_time(task, metro) == 5
+    assert strategy.calculate_upload_time(task, region) == 5 + 0.5
+    assert strategy.calculate_upload_time(task, device) == 0
+
+    # The static rule's "edge" target is the first edge-tier server, whatever its name
+    assert StaticOffloadStrategy().decide(task, device, [region, metro]) is metro
+    scheduled = scheduler.schedule_tasks([task])
+    assert scheduled[0][1] is metro
+    assert scheduler.find_server_by_name("edge") is metro
+
+
+def test_indexed_fleet_matches_linear_scan():
+    print("=== Testing Server Index ===")
+
+    def make_fleet():
+        speeds = [3.0, 4.0, 3.0, 4.0, 3.0, 6.0]
+        fleet = [Server(f"Edge{i}", compute_speed=speeds[i % 6], network_delay=1, tier="edge")
+                 for i in range(60)]
+        fleet += [Server(f"Cloud{i}", compute_speed=10.0, network_delay=5, tier="cloud") for i in range(3)]
+        return Device(battery_capacity=400), fleet
+
+    rng = np.random.default_rng(3)
+    tasks = [Task(i, int(s), int(p), int(d)) for i, (s, p, d) in
+             enumerate(zip(rng.integers(10, 300, 400), rng.integers(1, 4, 400), rng.integers(1, 200, 400)))]
+
+    linear_device, linear_servers = make_fleet()
+    indexed_device, indexed_servers = make_fleet()
+    linear = ListScheduler(linear_device, linear_servers, use_index=False)
+    indexed = ListScheduler(indexed_device, indexed_servers)
+    assert isinstance(indexed.fleet_index, ServerIndex)
+    assert len(indexed.fleet_index.groups) == 4
+
+    linear_names = [server.name for task, server in linear.schedule_tasks(tasks)]
+    indexed_names = [server.name for task, server in indexed.schedule_tasks(tasks)]
+    assert indexed_names == linear_names
+    assert len(set(indexed_names)) > 10
+
+    # Draining queues re-keys servers, and later decisions still agree
+    for device, servers in ((linear_device, linear_servers), (indexed_device, indexed_servers)):
+        for server in servers[::2]:
+            server.pop_next_task()
+    more = [Task(1000 + i, 120, 1, 40) for i in range(50)]
+    assert [s.name for t, s in indexed.schedule_tasks(more)] == [s.name for t, s in linear.schedule_tasks(more)]
+
+
+def test_online_mode_sees_running_work():
+    print("=== Testing Online Scheduling ===")
+
+    device = Device(battery_capacity=0)
+    servers = [Server("EdgeServer1", compute_speed=1.0, tier="edge"),
+               Server("EdgeServer2", compute_speed=1.0, tier="edge")]
+    tasks = [Task(i, size=10, arrival_time=i) for i in range(3)]
+
+    scheduler = ListScheduler(device, servers)
+    scheduler.run_online(tasks, latency_budget_ns=0)
+
+    # The second task sees the first still running on EdgeServer1 and goes to EdgeServer2
+    assert [server.name for task, server in scheduler.assigned_tasks] == ["EdgeServer1", "EdgeServer2", "EdgeServer1"]
+    assert [task.completion_time for task in tasks] == [10, 11, 20]
+    assert all(server.backlog_size == 0 and server.get_queue_load() == 0 for server in servers)
+
+    stats = scheduler.decision_latency_stats()
+    assert stats['count'] == 3 and stats['over_budget'] == 3
+    assert 0 < stats['p50_ns'] <= stats['p99_ns'] <= stats['max_ns']
+
+
+def test_lookahead_strategy_fills_gaps_and_ranks_window():
+    print("=== Testing Lookahead Strategy ===")
+
+    timeline = CoreTimeline()
+    timeline.insert(5, 8, 0)
+    assert timeline.earliest_slot(0, 4) == (0, 0)  # Fits in the gap before the busy interval
+    assert timeline.earliest_slot(0, 6) == (8, 1)
+    assert timeline.earliest_slot(9, 1) == (9, 1)
+
+    # The small task fills the fast server's idle time before the large upload lands
+    fast = Server("EdgeServer1", compute_speed=10.0)
+    slow = Server("EdgeServer2", compute_speed=5.0)
+    large, small = Task(0, 100, 1, 500), Task(1, 20, 1, 0)
+    planned = LookaheadOffloadStrategy(window=2).plan([large, small], Device(battery_capacity=0), [fast, slow])
+    assert [(task.id, server.name) for task, server in planned] == [(0, "EdgeServer1"), (1, "EdgeServer1")]
+
+    # The engine starts ready tasks in plan order, not by priority
+    server = Server("EdgeServer1", compute_speed=1.0)
+    urgent, long_task = Task(0, 10, 1), Task(1, 50, 2)
+    scheduler = ListScheduler(Device(battery_capacity=0), [server], offload_strategy="lookahead", lookahead_window=2)
+    scheduler.schedule_tasks([urgent, long_task])
+    scheduler.process_all_queues()
+    assert (long_task.completion_time, urgent.completion_time) == (50, 60)
+
+    device, servers = make_system(battery=0)
+    tasks = [Task(0, 20, 1, 5), Task(1, 150, 2, 50), Task(2, 40, 3, 10), Task(3, 120, 1, 80)]
+    strategy = LookaheadOffloadStrategy(window=4)
+    planned = list(strategy.plan(tasks, device, servers))
+
+    # Largest mean cost first, and nothing runs locally without battery
+    assert [task.id for task, server in planned] == [1, 3, 2, 0]
+    assert all(server is not device for task, server in planned)
+
+    by_priority = LookaheadOffloadStrategy(window=4, rank='priority')
+    assert [task.id for task, server in by_priority.plan(tasks, device, servers)] == [3, 0, 1, 2]
+
+    scheduler = ListScheduler(device, servers, offload_strategy="lookahead")
+    scheduler.schedule_tasks(tasks)
+    assert sorted(task.id for task, server in scheduler.assigned_tasks) == [0, 1, 2, 3]
+    assert sum(server.get_queue_length() for server in servers) == 4
+
+
+def test_learned_strategy_starts_at_eft_and_trained_policy_beats_it():
+    from experiments.policy_training import OffloadEnv, earliest_finish
+    from simulation.network import NetworkModel
+
+    # A fresh network starts at the earliest-finish-time rule: its hidden layer moves a score by at
+    # most sum(|w2|), so no pick finishes later than the earliest by more than that over the skip weight
+    network = PolicyNetwork(rng=np.random.default_rng(2))
+    slack = 2 * np.abs(network.params['w2']).sum() / -network.params['skip'][FEATURES.index('finish_gap')]
+    device, servers = make_system(battery=100)
+    env = OffloadEnv(device, servers, 100, num_envs=64, rng=np.random.default_rng(7))
+    size, data_size = env.sample_workloads(64)
+
+    def near_earliest(features, feasible, finish):
+        chosen = network.choose(features, feasible)
+        assert features[np.arange(len(chosen)), chosen, FEATURES.index('finish_gap')].max() <= slack
+        return chosen
+    env.rollout(near_earliest, size, data_size)
+
+    # Without the hidden layer's output it is the rule exactly, ties going to the first resource
+    network.params['w2'][:] = 0
+    rng = np.random.RandomState(2)
+    tasks = [Task(i, int(rng.randint(10, 150)), 1, int(rng.randint(1, 100))) for i in range(30)]
+    placements = []
+    for strategy in ("intelligent", "learned"):
+        device, servers = make_system(battery=100)
+        scheduler = ListScheduler(device, servers, offload_strategy=strategy)
+        if strategy == "learned":
+            scheduler.offload_strategy = LearnedOffloadStrategy(network)
+        scheduler.schedule_tasks(tasks)
+        placements.append([server.name for task, server in scheduler.assigned_tasks])
+    assert placements[0] == placements[1]
+
+    # Scoring a window per network call places tasks as deciding them one at a time does
+    class CountingNetwork(PolicyNetwork):
+        def choose(self, features, feasible):
+            self.calls += 1
+            return PolicyNetwork.choose(self, features, feasible)
+
+    workload = [Task(i, int(rng.randint(10, 150)), 1, int(rng.randint(1, 100))) for i in range(200)]
+    placements, calls = [], []
+    for window in (1, 64):
+        network = CountingNetwork.load()
+        network.calls = 0
+        device, servers = make_system(battery=1000)
+        device.remaining_battery = 300
+        scheduler = ListScheduler(device, servers)
+        scheduler.offload_strategy = LearnedOffloadStrategy(network, window=window)
+        scheduler.schedule_tasks(workload)
+        placements.append(([server.name for task, server in scheduler.assigned_tasks], device.remaining_battery))
+        calls.append(network.calls)
+    assert placements[0] == placements[1]
+    assert calls[0] == len(workload) and calls[1] < len(workload) / 2
+
+    # The vectorized environment scores a placement exactly as the event engine runs it
+    device, servers = make_system(battery=100)
+    env = OffloadEnv(device, servers, 10, num_tasks=30, num_envs=1)
+    size = np.array([[t.size for t in tasks]], dtype=float)
+    data_size = np.array([[t.data_size for t in tasks]], dtype=float)
+    reward = env.rollout(earliest_finish, size, data_size)
+    scheduler = ListScheduler(device, servers, wireless_speed=10, network=NetworkModel(10))
+    scheduler.schedule_tasks(tasks)
+    scheduler.process_all_queues()
+    assert abs(-reward[0] - scheduler.get_makespan()) < 1e-9
+
+    # The shipped policy beats the heuristic on low-battery workloads it was not trained on
+    policy = PolicyNetwork.load()
+    for wireless_speed in (100, 10):
+        device, servers = make_system(battery=1000)
+        device.remaining_battery = 100
+        env = OffloadEnv(device, servers, wireless_speed, num_envs=512, rng=np.random.default_rng(123))
+        size, data_size = env.sample_workloads(512)
+        learned = env.rollout(lambda features, feasible, finish: policy.choose(features, feasible), size, data_size)
+        assert learned.mean() > env.rollout(earliest_finish, size, data_size).mean()
+
+
+if __name__ == "__main__":
+    test_batch_matches_intelligent_strategy()
+    test_schedule_batch_matches_schedule_tasks()
+    test_event_log_records_decisions_and_energy()
+    test_tiers_replace_name_matching()
+    test_indexed_fleet_matches_linear_scan()
+    test_online_mode_sees_running_work()
+    test_lookahead_strategy_fills_gaps_and_ranks_window()
+    test_learned_strategy_starts_at_eft_and_trained_policy_beats_it()
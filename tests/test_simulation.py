@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Tests for the discrete event simulation engine
+"""
+
+import sys
+import os
+import numpy as np
+
+# Add the src directory to Python path
+src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_path)
+
+from models.task import Task
+from models.device import Device
+from models.server import Server
+from models.device_fleet import DeviceFleet
+from models.task_table import TaskTable
+from simulation.engine import SimulationEngine
+from simulation.multi_device import MultiDeviceSimulation
+from simulation.network import NetworkModel
+from simulation.metrics import QuantileSketch, RunMetrics
+from simulation.disciplines import make_discipline
+
+
+def test_engine_respects_arrival_and_upload():
+    print("=== Testing Event Engine ===")
+
+    device = Device(battery_capacity=1000)
+    edge = Server("EdgeServer1", compute_speed=2.0, network_delay=1)
+
+    late = Task(1, size=10, priority=1, arrival_time=5)
+    early = Task(2, size=10, priority=3, arrival_time=0)
+    device.add_to_queue(late)
+    device.add_to_queue(early)
+
+    remote = Task(3, size=10, priority=1, data_size=20, arrival_time=0)
+    edge.add_to_queue(remote)
+
+    engine = SimulationEngine(device, [edge], upload_time=lambda task, server: task.data_size / 10)
+    engine.load_queues()
+    makespan = engine.run()
+
+    # The low-priority task runs first because the urgent one has not arrived yet
+    assert early.start_time == 0 and early.completion_time == 10
+    assert late.start_time == 10 and late.completion_time == 20
+
+    # Remote work starts only after network delay + upload
+    assert remote.start_time == 1 + 2
+    assert remote.completion_time == 3 + 5
+
+    assert makespan == 20
+    assert device.completed_tasks == [early, late]
+    assert engine.events_processed > 0
+
+
+def test_engine_orders_ready_tasks_by_priority():
+    print("=== Testing Priority Among Ready Tasks ===")
+
+    server = Server("EdgeServer1", compute_speed=1.0)
+    tasks = [Task(i, size=1, priority=3 - i) for i in range(3)]
+    for task in tasks:
+        server.add_to_queue(task)
+
+    engine = SimulationEngine(Device(), [server])
+    engine.load_queues()
+    engine.run()
+
+    assert [t.id for t in server.completed_tasks] == [2, 1, 0]
+
+
+def test_devices_contend_for_shared_servers():
+    print("=== Testing Multi-Device Simulation ===")
+
+    fleet = DeviceFleet(3, compute_speed=1.0, battery_capacity=[1000, 1000, 0])
+    edge = Server("EdgeServer1", compute_speed=10.0, tier="edge")
+
+    # Three devices offload at once, then device 0 sends a task cheaper to run locally
+    tasks = TaskTable.from_arrays([100, 100, 100, 5], arrival_time=[0, 0, 0, 1])
+    owners = [0, 1, 2, 0]
+    simulation = MultiDeviceSimulation(fleet, [edge])
+    simulation.run(tasks, owners)
+
+    # Each offloaded task sees the work the earlier devices already queued
+    assert tasks.column('completion_time').tolist() == [10, 20, 30, 6]
+    assert simulation.local.tolist() == [False, False, False, True]
+    assert fleet.remaining_battery.tolist() == [1000 - fleet.energy_cost(5), 1000, 0]
+
+    metrics = simulation.device_metrics()
+    assert metrics['tasks'].tolist() == [2, 1, 1]
+    assert metrics['offloaded'].tolist() == [1, 1, 1]
+    assert metrics['makespan'].tolist() == [10, 20, 30]
+
+    summary = simulation.summary()
+    assert summary['makespan'] == 30
+    assert summary['percentage_offloaded'] == 75
+    assert summary['devices_depleted'] == 1
+
+    # With a second identical server the index spreads the offloads; ties go to the first-listed one
+    fleet = DeviceFleet(3, compute_speed=1.0, battery_capacity=[1000, 1000, 0])
+    servers = [Server(f"EdgeServer{i}", compute_speed=10.0, tier="edge") for i in (1, 2)]
+    tasks = TaskTable.from_arrays([100, 100, 100, 5], arrival_time=[0, 0, 0, 1])
+    simulation = MultiDeviceSimulation(fleet, servers)
+    simulation.run(tasks, owners)
+    assert tasks.column('completion_time').tolist() == [10, 10, 20, 6]
+    assert simulation.summary()['server_tasks'] == {'EdgeServer1': 2, 'EdgeServer2': 1}
+
+
+def test_uploads_share_link_bandwidth():
+    print("=== Testing Network Model ===")
+
+    device = Device(battery_capacity=1000)
+    edge = Server("EdgeServer1", compute_speed=10.0, tier="edge")
+    cloud = Server("CloudServer", compute_speed=10.0, tier="cloud")
+    network = NetworkModel(wireless_speed=100, wired_speed=10)
+
+    to_edge = Task(1, size=10, data_size=80)
+    to_cloud = Task(2, size=10, data_size=20)
+    assert network.expected_transfer_time(50, edge) == 0.5
+    network.reserve(to_edge, edge)
+    assert network.expected_transfer_time(50, edge) == 1.0
+
+    edge.add_to_queue(to_edge)
+    cloud.add_to_queue(to_cloud)
+    engine = SimulationEngine(device, [edge, cloud], network=network)
+    engine.load_queues()
+    engine.run()
+
+    # Both uploads share the access link at 50 until the cloud's 20 has crossed it at 0.4; the edge
+    # upload then has it alone and is done at 1. The cloud upload still needs 2 on the 10-wide backhaul
+    assert to_edge.start_time == 1 and to_edge.completion_time == 2
+    assert to_cloud.start_time == 2 and to_cloud.completion_time == 3
+    assert not network.access[0].flows and not network.access[0].reserved
+
+
+def test_preemptive_disciplines():
+    print("=== Testing Queue Disciplines ===")
+
+    def run(discipline):
+        server = Server("EdgeServer1", compute_speed=1.0)
+        if discipline is not None:
+            server.discipline = make_discipline(discipline, quantum=4)
+        long_task = Task(1, size=10, priority=3, arrival_time=0)
+        urgent = Task(2, size=2, priority=1, arrival_time=3)
+        server.add_to_queue(long_task)
+        server.add_to_queue(urgent)
+        engine = SimulationEngine(None, [server])
+        engine.load_queues()
+        engine.run()
+        assert server.get_queue_load() == 0 and not server.remaining_work
+        return long_task.start_time, long_task.completion_time, urgent.completion_time, engine.preemptions
+
+    assert run(None) == (0, 10, 12, 0)
+    # The urgent task interrupts the long one, which resumes with its remaining 7 units
+    assert run("preemptive_priority") == (0, 12, 5, 1)
+    assert run("srpt") == (0, 12, 5, 1)
+    # Round robin: the long task yields at its 4-unit quantum
+    assert run("round_robin") == (0, 12, 6, 0)
+
+
+def test_multi_core_servers_run_tasks_in_parallel():
+    print("=== Testing Multi-Core Servers ===")
+
+    def make_server():
+        server = Server("EdgeServer1", compute_speed=1.0, num_cores=2)
+        tasks = [Task(i, size=size, priority=1) for i, size in enumerate([10, 4, 6])]
+        for task in tasks:
+            server.add_to_queue(task)
+        return server, tasks
+
+    server, tasks = make_server()
+    assert server.queue_delay() == 10
+    server.process_tasks()
+    assert [t.completion_time for t in tasks] == [10, 4, 10]
+
+    # The engine hands each task to the earliest-free core as well
+    server, tasks = make_server()
+    engine = SimulationEngine(None, [server])
+    engine.load_queues()
+    engine.run()
+    assert [t.start_time for t in tasks] == [0, 0, 4]
+    assert [t.completion_time for t in tasks] == [10, 4, 10]
+
+    # With every core busy, an urgent arrival preempts the lowest-priority running task
+    server = Server("EdgeServer1", compute_speed=1.0, num_cores=2)
+    server.discipline = make_discipline("preemptive_priority")
+    low, mid, urgent = Task(1, 10, 3), Task(2, 10, 2), Task(3, 2, 1, arrival_time=1)
+    for task in (low, mid, urgent):
+        server.add_to_queue(task)
+    engine = SimulationEngine(None, [server])
+    engine.load_queues()
+    engine.run()
+    assert (urgent.completion_time, mid.completion_time, low.completion_time) == (3, 10, 12)
+    assert engine.preemptions == 1
+
+
+def test_quantile_sketch_is_accurate_and_mergeable():
+    print("=== Testing Quantile Sketch ===")
+
+    rng = np.random.default_rng(0)
+    values = np.concatenate([np.zeros(1000), rng.lognormal(2, 2, 20000)])
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    sketch.add_many(values)
+    for q in (0.01, 0.5, 0.95, 0.99, 0.999):
+        exact = np.quantile(values, q, method='inverted_cdf')
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+    assert np.isclose(sketch.mean, values.mean()) and sketch.max == values.max()
+
+    # Merging sketches of two halves gives the sketch of the whole
+    left, right = QuantileSketch(), QuantileSketch()
+    for value in values[:7000]:
+        left.add(value)
+    right.add_many(values[7000:])
+    merged = QuantileSketch.from_dict(left.to_dict()).merge(right)
+    assert merged.buckets == sketch.buckets and merged.count == sketch.count
+
+    # Memory stays bounded; collapsing only blurs the lowest buckets
+    small = QuantileSketch(max_buckets=256)
+    small.add_many(values)
+    assert len(small.buckets) <= 256
+    assert small.quantile(0.99) == sketch.quantile(0.99)
+
+
+def test_run_metrics_track_latency_and_time_weighted_queue():
+    print("=== Testing Run Metrics ===")
+
+    server = Server("EdgeServer1", compute_speed=1.0)
+    tasks = [Task(i, size=2, priority=1 + i % 2) for i in range(3)]
+    for task in tasks:
+        server.add_to_queue(task)
+    engine = SimulationEngine(None, [server])
+    engine.metrics = metrics = RunMetrics([server], flush_every=2)
+    engine.load_queues()
+    engine.run()
+
+    # Priority 1 tasks run first, so waits are 0, 2, 4; the queue holds 2 tasks for 2 units, then 1 for 2, then 0 for 2
+    summary = metrics.resource_summary(0)
+    assert summary['wait']['mean'] == 2 and summary['wait']['max'] == 4
+    assert abs(summary['slowdown']['p50'] - 2) <= 0.02
+    occupancy = summary['queue_length']
+    assert occupancy['mean'] == 1 and occupancy['max'] == 3 and abs(occupancy['p95'] - 2) <= 0.02
+
+    by_priority = metrics.priority_summary()
+    assert sorted(by_priority) == ['1', '2']
+    assert by_priority['1']['response']['count'] == 2 and by_priority['2']['response']['max'] == 6
+
+
+if __name__ == "__main__":
+    test_engine_respects_arrival_and_upload()
+    test_engine_orders_ready_tasks_by_priority()
+    test_devices_contend_for_shared_servers()
+    test_uploads_share_link_bandwidth()
+    test_preemptive_disciplines()
+    test_multi_core_servers_run_tasks_in_parallel()
+    test_quantile_sketch_is_accurate_and_mergeable()
+    test_run_metrics_track_latency_and_time_weighted_queue()